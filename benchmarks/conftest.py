@@ -0,0 +1,71 @@
+"""
+Headless pytest-benchmark suite for the engine, file I/O and timeline paint.
+
+Nothing here opens a sound device: engines are created with
+`open_stream=False` and the audio callback is driven directly, so the
+suite runs on CI machines without a sound card. Qt renders offscreen.
+
+Run from the repository root:
+
+    python -m pytest benchmarks
+
+Compare against the stored baseline and fail on a >25% slowdown of the
+mean:
+
+    python -m pytest benchmarks --benchmark-storage=benchmarks/baselines \\
+        --benchmark-compare=0001 --benchmark-compare-fail=mean:25%
+
+Record a new baseline after an intended change (or on a new CI machine;
+baselines are kept per platform and Python version):
+
+    python -m pytest benchmarks --benchmark-storage=benchmarks/baselines \\
+        --benchmark-save=baseline
+"""
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# Without the plugin the `benchmark` fixture is missing; skip collection
+# so a plain `pytest` from the root still works
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+SAMPLE_RATE = 44100
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    """Keep decoded and resampled audio out of the user's cache"""
+    path = tmp_path_factory.mktemp("cache")
+    patch = pytest.MonkeyPatch()
+    patch.setenv("SOUNDBYTE_CACHE_DIR", str(path))
+    yield path
+    patch.undo()
+
+
+@pytest.fixture(scope="session")
+def audio_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("audio")
+
+
+@pytest.fixture(scope="session")
+def write_audio(audio_dir):
+    """Factory writing `seconds` of low-level noise into `audio_dir`"""
+    def write(name: str, seconds: float, channels: int = 2, subtype: str = "FLOAT") -> str:
+        path = audio_dir / name
+        if not path.exists():
+            rng = np.random.default_rng(0)
+            data = rng.uniform(-0.25, 0.25, (int(seconds * SAMPLE_RATE), channels))
+            sf.write(path, data.astype(np.float32), SAMPLE_RATE, subtype=subtype)
+        return str(path)
+    return write
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,57 @@
+"""
+Per-block cost of the master bus limiter.
+
+Run from the repository root:
+
+    python -m benchmarks.limiter [--seconds 1]
+
+For each block size, prints the mean time to limit one stereo block, with
+and without soft clipping, and the share of the real-time budget it uses.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from soundbyte.audio.dynamics import Limiter
+
+BLOCK_SIZES = (64, 128, 256, 512, 1024, 2048, 4096)
+SAMPLE_RATE = 44100
+
+
+def time_block(limiter, signal, block, min_seconds):
+    out = np.empty((block, 2), dtype=np.float32)
+    pos = 0
+    blocks = 0
+    started = time.perf_counter()
+    while True:
+        limiter.process(signal[pos:pos + block], out)
+        pos = (pos + block) % (len(signal) - block)
+        blocks += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds and blocks >= 3:
+            return elapsed / blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="Minimum measuring time per configuration")
+    args = parser.parse_args()
+
+    # Loud enough that the limiter is working most of the time
+    signal = np.random.default_rng(0).uniform(-1.5, 1.5, (SAMPLE_RATE * 4, 2))
+    signal = signal.astype(np.float32)
+
+    print(f"{'block':>8}{'limit':>14}{'+ soft clip':>14}{'budget':>10}")
+    for block in BLOCK_SIZES:
+        plain = time_block(Limiter(2, SAMPLE_RATE), signal, block, args.seconds)
+        soft = time_block(Limiter(2, SAMPLE_RATE, soft_clip=True), signal, block,
+                          args.seconds)
+        budget = block / SAMPLE_RATE
+        print(f"{block:>8}{plain * 1e6:>12.1f}us{soft * 1e6:>12.1f}us"
+              f"{100 * soft / budget:>9.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Scaling of ParallelMixer from 1 to N threads.
+
+Run from the repository root:
+
+    python -m benchmarks.parallel_mix [--seconds 2] [--max-threads 8]
+
+For each track count and block size, prints the mean time to mix one block
+and the speedup over the serial mixer. The 1024-frame column is what the
+real-time callback sees; the 65536-frame column is the offline renderer.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from soundbyte.audio.session import ClipTable
+from soundbyte.audio.mixer import Mixer, TrackState
+from soundbyte.audio.parallel import ParallelMixer
+
+TRACK_COUNTS = (64, 256, 1024)
+BLOCK_SIZES = (1024, 65536)
+SAMPLE_RATE = 44100
+
+
+def make_tracks(count, frames):
+    # A handful of distinct buffers keeps memory flat at 1024 tracks while
+    # still giving every track its own gain multiply and accumulate
+    rng = np.random.default_rng(0)
+    sources = [rng.uniform(-0.1, 0.1, (frames, 2)).astype(np.float32) for _ in range(8)]
+    return tuple(TrackState(sources[i % len(sources)], 0.5, ClipTable())
+                 for i in range(count))
+
+
+def time_block(mixer, tracks, block, total_frames, min_seconds):
+    out = np.zeros((block, 2), dtype=np.float32)
+    pos = 0
+    blocks = 0
+    started = time.perf_counter()
+    while True:
+        mixer.render(out, tracks, pos, block)
+        pos = (pos + block) % (total_frames - block)
+        blocks += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds and blocks >= 3:
+            return elapsed / blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="Minimum measuring time per configuration")
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    thread_counts = sorted({1, 2, 4, 8, 16, args.max_threads} - {0})
+    thread_counts = [n for n in thread_counts if n <= args.max_threads]
+    total_frames = SAMPLE_RATE * 4
+
+    for block in BLOCK_SIZES:
+        budget = block / SAMPLE_RATE
+        print(f"\nblock={block} frames (real-time budget {budget * 1000:.1f} ms)")
+        print(f"{'tracks':>8}" + "".join(f"{f'{n} thr':>18}" for n in thread_counts))
+        for count in TRACK_COUNTS:
+            tracks = make_tracks(count, total_frames)
+            row = f"{count:>8}"
+            serial = None
+            for n in thread_counts:
+                mixer = Mixer(2, block) if n == 1 else ParallelMixer(2, block, n, 1)
+                seconds = time_block(mixer, tracks, block, total_frames, args.seconds)
+                if n > 1:
+                    mixer.shutdown()
+                serial = serial or seconds
+                row += f"{seconds * 1000:>9.2f}ms {serial / seconds:>5.2f}x"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
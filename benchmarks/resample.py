@@ -0,0 +1,56 @@
+"""
+Throughput of the sample-rate converter per quality tier.
+
+Run from the repository root:
+
+    python -m benchmarks.resample [--seconds 30]
+
+For each common conversion, prints how many times faster than real time
+each tier converts a stereo signal, whole and in 1024-frame blocks as the
+streaming reader does.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from soundbyte.audio.resample import QUALITY_TIERS, StreamResampler, resample
+
+CONVERSIONS = ((48000, 44100), (44100, 48000), (96000, 44100), (22050, 44100))
+BLOCK = 1024
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def stream(data, src, dst, quality):
+    resampler = StreamResampler(src, dst, data.shape[1], quality)
+    for start in range(0, len(data), BLOCK):
+        resampler.process(data[start:start + BLOCK])
+    resampler.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="Length of the test signal in seconds")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'conversion':>14}" + "".join(f"{q:>22}" for q in QUALITY_TIERS))
+    print(f"{'':>14}" + f"{'whole    block':>22}" * len(QUALITY_TIERS))
+    for src, dst in CONVERSIONS:
+        data = rng.uniform(-1, 1, (int(src * args.seconds), 2)).astype(np.float32)
+        row = f"{src:>6}->{dst:<6} "
+        for quality in QUALITY_TIERS:
+            whole = timed(lambda: resample(data, src, dst, quality))
+            blocks = timed(lambda: stream(data, src, dst, quality))
+            row += f"{args.seconds / whole:>10.0f}x{args.seconds / blocks:>10.0f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Cost of one audio callback, called directly with a synthetic output buffer"""
+import numpy as np
+import pytest
+
+from soundbyte.audio.engine import AudioEngine
+
+TRACK_COUNTS = (1, 16, 64)
+BLOCK_SIZES = (64, 256, 1024)
+TRACK_SECONDS = 2
+SAMPLE_RATE = 44100
+
+
+@pytest.fixture(scope="module")
+def track_file(write_audio):
+    return write_audio("callback.wav", TRACK_SECONDS)
+
+
+@pytest.mark.parametrize("block", BLOCK_SIZES)
+@pytest.mark.parametrize("tracks", TRACK_COUNTS)
+def test_audio_callback(benchmark, track_file, tracks, block):
+    engine = AudioEngine(buffer_size=block, open_stream=False)
+    for _ in range(tracks):
+        # Every track maps the same file, so memory stays flat
+        engine.add_track(track_file)
+    engine.play()
+    outdata = np.zeros((block, engine.channels), dtype=np.float32)
+    end = TRACK_SECONDS * SAMPLE_RATE - block
+
+    def callback():
+        engine._audio_callback(outdata, block, None, None)
+        # Loop the tracks so every block mixes audio rather than silence
+        if engine.current_frame > end:
+            engine.current_frame = 0
+
+    benchmark(callback)
+    if benchmark.stats:  # None under --benchmark-disable
+        budget = block / SAMPLE_RATE
+        benchmark.extra_info["budget_percent"] = 100 * benchmark.stats.stats.mean / budget
@@ -0,0 +1,58 @@
+"""Non-destructive clip edits on a long clip"""
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from soundbyte.audio.session import ClipTable
+
+MINUTES = 10
+PIECES = 200
+
+
+@pytest.fixture(scope="module")
+def long_file(write_audio):
+    return write_audio("long_take.wav", MINUTES * 60, channels=1, subtype="PCM_16")
+
+
+def make_clip(long_file):
+    table = ClipTable()
+    source, length = table.sources.acquire(long_file)
+    return table, table.add(0, length, source), length
+
+
+def split_one_at_a_time(table, clip_id, length):
+    for i in range(1, PIECES):
+        clip_id = int(table.split(clip_id, i * length // PIECES)[0])
+
+
+def test_split_into_pieces(benchmark, long_file):
+    benchmark.pedantic(split_one_at_a_time, setup=lambda: (make_clip(long_file), {}),
+                       rounds=10)
+
+    table, clip_id, length = make_clip(long_file)
+    tracemalloc.start()
+    try:
+        split_one_at_a_time(table, clip_id, length)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_bytes"] = peak
+    # Column snapshots only: far below one copy of the samples
+    assert len(table) == PIECES and peak < length // 100
+
+
+def test_split_in_one_edit(benchmark, long_file):
+    def split(table, clip_id, length):
+        table.split(clip_id, np.arange(1, PIECES) * length // PIECES)
+
+    benchmark.pedantic(split, setup=lambda: (make_clip(long_file), {}), rounds=20)
+
+
+def test_add_clips_one_at_a_time(benchmark):
+    # Clips placed end to end, one edit each, as an import places them
+    def add(table):
+        for i in range(5000):
+            table.add(i * 100, 100, 0)
+
+    benchmark.pedantic(add, setup=lambda: ((ClipTable(),), {}), rounds=5)
@@ -0,0 +1,42 @@
+"""Time a bulk drop of clips spends on the calling (GUI) thread, against decoding it there"""
+import numpy as np
+import pytest
+
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.importer import ClipImporter
+
+FILES = 200
+
+
+@pytest.fixture(scope="module")
+def drop(write_audio):
+    return [write_audio(f"drop_{i}.flac", 2, subtype="PCM_16") for i in range(FILES)]
+
+
+def new_track():
+    engine = AudioEngine(open_stream=False)
+    return engine, engine.add_data_track(np.zeros((1, 2), np.float32), 44100, "Drop")
+
+
+def test_place_dropped_files(benchmark, drop):
+    importers = []
+
+    def setup():
+        # The previous round's decodes would compete for the CPU
+        if importers:
+            assert importers[-1].wait(timeout=60) == []
+        engine, track_id = new_track()
+        importers.append(ClipImporter(engine))
+        return (importers[-1], track_id, drop), {}
+
+    benchmark.pedantic(lambda importer, track_id, paths: importer.submit(track_id, paths),
+                       setup=setup, rounds=5)
+    assert importers[-1].wait(timeout=60) == []
+
+
+def test_decode_dropped_files_inline(benchmark, drop):
+    def add_clips(engine, track_id):
+        for path in drop:
+            engine.add_clip(track_id, path)
+
+    benchmark.pedantic(add_clips, setup=lambda: (new_track(), {}), rounds=3)
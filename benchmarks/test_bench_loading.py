@@ -0,0 +1,57 @@
+"""Time and Python-heap memory to load a track or a clip, by file size and format"""
+import tracemalloc
+
+import pytest
+
+from soundbyte.audio.engine import AudioEngine
+
+SECONDS = (1, 10, 60)
+# (extension, soundfile subtype): mapped WAVs and a decoded format
+FORMATS = (("wav", "FLOAT"), ("wav", "PCM_16"), ("flac", "PCM_16"))
+
+
+def audio_file(write_audio, seconds, extension, subtype):
+    return write_audio(f"load_{seconds}s_{subtype}.{extension}", seconds, subtype=subtype)
+
+
+def measure_peak(benchmark, load):
+    # Traced outside the timed rounds, tracemalloc slows allocation down
+    tracemalloc.start()
+    try:
+        load()
+        benchmark.extra_info["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("extension,subtype", FORMATS)
+@pytest.mark.parametrize("seconds", SECONDS)
+def test_add_track(benchmark, write_audio, seconds, extension, subtype):
+    path = audio_file(write_audio, seconds, extension, subtype)
+
+    def load():
+        engine = AudioEngine(open_stream=False)
+        engine.add_track(path)
+
+    # FLAC is decoded into the on-disk cache once; rounds after the first
+    # measure the warm path a reopened project takes
+    benchmark.pedantic(load, rounds=5, warmup_rounds=1)
+    measure_peak(benchmark, load)
+
+
+@pytest.mark.parametrize("extension,subtype", FORMATS)
+@pytest.mark.parametrize("seconds", SECONDS)
+def test_add_clip(benchmark, write_audio, seconds, extension, subtype):
+    path = audio_file(write_audio, seconds, extension, subtype)
+    track_file = write_audio("clip_track.wav", 1)
+
+    def setup():
+        # A fresh engine each round, so the sample pool is cold
+        engine = AudioEngine(open_stream=False)
+        return (engine, engine.add_track(track_file)), {}
+
+    def load(engine, track_id):
+        assert engine.add_clip(track_id, path, 0) is not None
+
+    benchmark.pedantic(load, setup=setup, rounds=5)
+    measure_peak(benchmark, lambda: load(*setup()[0]))
@@ -0,0 +1,45 @@
+"""Project save and open round-trips"""
+import pytest
+
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.project import ProjectLoader, read_project, save_project
+
+TRACK_COUNTS = (4, 32)
+CLIPS_PER_TRACK = 16
+
+
+@pytest.fixture
+def engine_factory(write_audio):
+    track_file = write_audio("project_track.wav", 10)
+    clip_file = write_audio("project_clip.wav", 0.5)
+
+    def build(tracks):
+        engine = AudioEngine(open_stream=False)
+        for _ in range(tracks):
+            track_id = engine.add_track(track_file)
+            for i in range(CLIPS_PER_TRACK):
+                engine.add_clip(track_id, clip_file, i * engine.sample_rate)
+        return engine
+    return build
+
+
+@pytest.mark.parametrize("tracks", TRACK_COUNTS)
+def test_save_project(benchmark, tmp_path, engine_factory, tracks):
+    engine = engine_factory(tracks)
+    benchmark(save_project, engine, str(tmp_path / "song.sbp"))
+
+
+@pytest.mark.parametrize("tracks", TRACK_COUNTS)
+def test_open_project(benchmark, tmp_path, engine_factory, tracks):
+    project_path = str(tmp_path / "song.sbp")
+    save_project(engine_factory(tracks), project_path)
+
+    def open_project():
+        engine = AudioEngine(open_stream=False)
+        loader = ProjectLoader(engine, read_project(project_path), str(tmp_path))
+        loader.open()
+        assert loader.wait(timeout=60) == []
+        return engine
+
+    engine = benchmark(open_project)
+    assert len(engine.tracks) == tracks
@@ -0,0 +1,44 @@
+"""Offscreen timeline repaint with N clips on screen"""
+import os
+import sys
+
+import pytest
+
+from soundbyte.audio.engine import AudioEngine
+
+CLIP_COUNTS = (16, 128, 512)
+TRACKS = 8
+
+
+@pytest.fixture(scope="module")
+def timeline_class(qapp):
+    # The GUI imports its siblings as top-level packages, as main.py runs it
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "soundbyte"))
+    from gui.timeline_widget import TimelineWidget
+    return TimelineWidget
+
+
+@pytest.mark.parametrize("clips", CLIP_COUNTS)
+def test_timeline_paint(benchmark, timeline_class, write_audio, clips):
+    clip_file = write_audio("timeline_clip.wav", 1)
+    engine = AudioEngine(open_stream=False)
+    track_file = write_audio("timeline_track.wav", 1)
+    track_ids = [engine.add_track(track_file) for _ in range(TRACKS)]
+    for i in range(clips):
+        # Spread each track's clips over the 32s a 1600px view shows at zoom 50
+        engine.add_clip(track_ids[i % TRACKS], clip_file,
+                        (i // TRACKS) * engine.sample_rate * 32 // (clips // TRACKS))
+
+    widget = timeline_class()
+    widget.set_engine(engine)
+    widget.tracks = track_ids
+    widget.resize(1600, TRACKS * widget.track_height)
+    # Build the waveform overview up front instead of on the worker
+    widget.peak_cache._build(clip_file)
+
+    def paint():
+        widget.invalidate()
+        # Renders through paintEvent into a pixmap, no window needed
+        widget.grab()
+
+    benchmark(paint)
@@ -0,0 +1,119 @@
+import numpy as np
+from typing import NamedTuple, Union
+
+# Length of the ramp a fader move is spread over, in seconds
+FADER_RAMP_SECONDS = 0.02
+
+
+class Breakpoints(NamedTuple):
+    """Immutable automation points, sorted by frame"""
+    frames: np.ndarray
+    values: np.ndarray
+
+
+class EnvelopeState(NamedTuple):
+    """Points and the value held without any, published together"""
+    points: Breakpoints
+    default: float
+
+
+_NO_POINTS = Breakpoints(np.zeros(0, np.int64), np.zeros(0, np.float32))
+
+
+class Envelope:
+    """
+    Breakpoint automation for one parameter, linear between points.
+
+    Before the first point the envelope holds the first value, after the
+    last it holds the last one, and with no points it is `default`. Edits
+    swap in a new `EnvelopeState` with a single assignment, so the audio
+    thread can evaluate it while the GUI thread writes and never sees new
+    points with an old default or the reverse.
+    """
+
+    def __init__(self, default: float = 1.0):
+        self.state = EnvelopeState(_NO_POINTS, default)
+
+    @property
+    def points(self) -> Breakpoints:
+        return self.state.points
+
+    @property
+    def default(self) -> float:
+        return self.state.default
+
+    def __len__(self) -> int:
+        return len(self.points.frames)
+
+    def set(self, value: float):
+        """Drop every point and hold `value`"""
+        self.state = EnvelopeState(_NO_POINTS, value)
+
+    def set_points(self, frames, values):
+        frames = np.asarray(frames, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float32)
+        order = np.argsort(frames, kind='stable')
+        self.state = EnvelopeState(Breakpoints(frames[order], values[order]),
+                                   self.state.default)
+
+    def ramp_to(self, frame: int, value: float, ramp_frames: int):
+        """Replace the envelope with a linear move to `value` starting at `frame`"""
+        current = self.value_at(frame)
+        self.state = EnvelopeState(
+            Breakpoints(np.array([frame, frame + max(1, ramp_frames)], np.int64),
+                        np.array([current, value], np.float32)),
+            value)
+
+    def value_at(self, frame: int) -> float:
+        (frames, values), default = self.state
+        if not len(frames):
+            return default
+        return float(np.interp(frame, frames, values))
+
+    def evaluate(self, start: int, frames: int, out: np.ndarray,
+                 offsets: np.ndarray) -> Union[float, np.ndarray]:
+        """
+        Values for the frames [start, start+frames)
+
+        Args:
+            out: Preallocated buffer with at least `frames` rows
+            offsets: 0, 1, 2, ... with at least `frames` rows, same shape as `out`
+
+        Returns:
+            A float if the envelope is constant over the block, otherwise
+            `out[:frames]` filled with one value per frame
+        """
+        # Read once: the GUI thread may publish a new state meanwhile
+        (points, values), default = self.state
+        end = start + frames
+        if not len(points):
+            return default
+        if start >= points[-1]:
+            return float(values[-1])
+        if end - 1 <= points[0]:
+            return float(values[0])
+
+        out = out[:frames]
+        # One vectorised fill per segment in the block; cost is O(frames)
+        # plus the number of points inside it
+        i = int(np.searchsorted(points, start, 'right'))
+        cursor = start
+        while cursor < end:
+            if i == 0:
+                stop = min(int(points[0]), end)
+                out[cursor - start:stop - start] = values[0]
+            elif i == len(points):
+                stop = end
+                out[cursor - start:] = values[-1]
+            else:
+                f0, f1 = int(points[i - 1]), int(points[i])
+                v0, v1 = float(values[i - 1]), float(values[i])
+                stop = min(f1, end)
+                a, b = cursor - start, stop - start
+                if b > a:
+                    slope = (v1 - v0) / (f1 - f0)
+                    np.multiply(offsets[a:b], slope, out=out[a:b])
+                    out[a:b] += v0 + (start - f0) * slope
+            cursor = stop
+            i += 1
+        return out
@@ -0,0 +1,191 @@
+from abc import ABC, abstractmethod
+from threading import Event, Thread
+from time import perf_counter
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+import soundfile as sf
+
+# Same signature as a sounddevice output callback
+Callback = Callable[[np.ndarray, int, object, object], None]
+
+# The timer thread sleeps until this close to a deadline, then spins
+_SPIN_SECONDS = 0.001
+
+
+class BlockTime(NamedTuple):
+    """Stand-in for sounddevice's callback time info"""
+    currentTime: float
+    outputBufferDacTime: float
+
+
+class BlockStatus(NamedTuple):
+    """Stand-in for sounddevice's CallbackFlags, true when a flag is set"""
+    output_underflow: bool = False
+
+    def __bool__(self):
+        return self.output_underflow
+
+    def __str__(self):
+        return "output underflow" if self.output_underflow else ""
+
+
+_UNDERFLOW = BlockStatus(output_underflow=True)
+
+
+class AudioBackend(ABC):
+    """
+    Where the engine's audio callback output goes.
+
+    `open` hands the backend the callback and stream format once; after
+    that `start` and `stop` are called for play and pause/stop, and
+    `close` when the engine is done with it.
+    """
+
+    @abstractmethod
+    def open(self, callback: Callback, sample_rate: int, channels: int, block_size: int):
+        """Prepare to call `callback` with `block_size`-frame float32 blocks"""
+        pass
+
+    @abstractmethod
+    def start(self):
+        pass
+
+    @abstractmethod
+    def stop(self):
+        pass
+
+    def close(self):
+        self.stop()
+
+
+class SoundDeviceBackend(AudioBackend):
+    """Plays through a PortAudio output stream"""
+
+    def __init__(self, device=None, latency=None):
+        self.device = device
+        self.latency = latency
+        self.stream = None
+
+    def open(self, callback, sample_rate, channels, block_size):
+        # Imported here so headless use works without PortAudio installed
+        import sounddevice as sd
+        self.stream = sd.OutputStream(
+            device=self.device,
+            channels=channels,
+            samplerate=sample_rate,
+            blocksize=block_size,
+            latency=self.latency,
+            callback=callback
+        )
+
+    def start(self):
+        self.stream.start()
+
+    def stop(self):
+        self.stream.stop()
+
+    def close(self):
+        self.stream.close()
+
+
+class NullBackend(AudioBackend):
+    """
+    Drives the callback from a timer thread and discards the output.
+
+    With `realtime` each block is due one block period after the previous
+    one, as on a sound card: the thread sleeps until just before the
+    deadline and spins the rest, so jitter stays in the microseconds. A
+    block that finishes after the next deadline is reported to the
+    callback as an output underflow, and the schedule restarts from now.
+    Without `realtime` blocks run back to back, which measures throughput.
+
+    `process` runs blocks synchronously on the calling thread, for tests
+    that need an exact number of callbacks.
+    """
+
+    def __init__(self, realtime: bool = True):
+        self.realtime = realtime
+        # Blocks delivered since open
+        self.blocks = 0
+        self._callback = None
+        self._outdata = None
+        self._stop = Event()
+        self._thread = None
+
+    def open(self, callback, sample_rate, channels, block_size):
+        self._callback = callback
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self._outdata = np.zeros((block_size, channels), dtype=np.float32)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="soundbyte-null-audio", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def process(self, blocks: int, status=None):
+        """Run `blocks` callbacks now, with no timing"""
+        for _ in range(blocks):
+            self._block(perf_counter(), status)
+
+    def _block(self, now: float, status):
+        self._callback(self._outdata, self.block_size, BlockTime(now, now), status)
+        self.blocks += 1
+        self.write(self._outdata)
+
+    def write(self, outdata: np.ndarray):
+        """Consume one block of output; discarded here"""
+        pass
+
+    def _run(self):
+        period = self.block_size / self.sample_rate
+        deadline = perf_counter()
+        status = None
+        while not self._stop.is_set():
+            if self.realtime:
+                remaining = deadline - perf_counter()
+                if remaining > _SPIN_SECONDS and self._stop.wait(remaining - _SPIN_SECONDS):
+                    break
+                while perf_counter() < deadline:
+                    pass
+            self._block(deadline, status)
+            deadline += period
+            status = None
+            if self.realtime and perf_counter() > deadline:
+                status = _UNDERFLOW
+                deadline = perf_counter()
+
+
+class FileSinkBackend(NullBackend):
+    """
+    Like `NullBackend`, but writes every block to an audio file, by default
+    as fast as the engine renders. The file is created on `open` and
+    finalised on `close`.
+    """
+
+    def __init__(self, path: str, realtime: bool = False, subtype: str = "FLOAT"):
+        super().__init__(realtime)
+        self.path = path
+        self.subtype = subtype
+        self._file: Optional[sf.SoundFile] = None
+
+    def open(self, callback, sample_rate, channels, block_size):
+        super().open(callback, sample_rate, channels, block_size)
+        self._file = sf.SoundFile(self.path, 'w', sample_rate, channels, subtype=self.subtype)
+
+    def write(self, outdata):
+        self._file.write(outdata)
+
+    def close(self):
+        super().close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
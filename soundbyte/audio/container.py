@@ -0,0 +1,358 @@
+import soundfile as sf
+import numpy as np
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import json
+import os
+import struct
+
+from .loader import LoadedAudio
+from .project import (ProjectLoader, _apply_track_settings, _atomic_write, _bus_entries,
+                      _load_buses, _load_clips, _relative_path)
+from .stream import StreamingSource
+from .trace import traced
+
+# Single-file project, the binary counterpart of .sbp:
+#
+#   header | chunk | chunk | ... | directory
+#
+# The header points at the directory, written last, which lists every
+# chunk's type, ID, offset and size, so a reader seeks straight to the
+# chunk it wants. Chunks belonging to a track use its index as their ID.
+CONTAINER_MAGIC = b'SBPX'
+CONTAINER_VERSION = 1
+CONTAINER_EXTENSION = '.sbpx'
+
+# magic, format version, flags (reserved), directory offset, chunk count
+_HEADER = struct.Struct('<4sHHQI')
+# type, ID, offset, size
+_ENTRY = struct.Struct('<4sIQQ')
+# Raw float32 audio starts on a page boundary so it maps directly
+_PAGE = 4096
+_BLOCK_FRAMES = 1 << 16
+
+SESSION = b'SESS'      # Compact JSON: buses, tracks, clip source files
+CLIPS = b'CLIP'        # CLIP_DTYPE records
+AUTOMATION = b'AUTO'   # AUTOMATION_DTYPE breakpoints
+AUDIO_F32 = b'AF32'    # Interleaved little-endian float32 frames
+AUDIO_FLAC = b'FLAC'   # FLAC stream, for 16-bit tracks
+
+CLIP_DTYPE = np.dtype([
+    ('start', '<i8'), ('length', '<i8'), ('offset', '<i8'), ('file', '<i4'),
+    ('gain', '<f4'), ('fade_in', '<i8'), ('fade_out', '<i8'), ('curve', 'i1'),
+])
+AUTOMATION_DTYPE = np.dtype([('frame', '<i8'), ('value', '<f4')])
+
+
+class Chunk(NamedTuple):
+    kind: bytes
+    chunk_id: int
+    offset: int
+    size: int
+
+
+def is_container(file_path: str) -> bool:
+    """Whether `file_path` is a binary project rather than a .sbp"""
+    with open(file_path, 'rb') as f:
+        return f.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+
+
+class _Window:
+    """
+    File-like view of a chunk of `f` starting at `base`, so soundfile can
+    read or write a FLAC stream in place. Without `size` the chunk runs to
+    the end of the file, as while it is being written.
+    """
+
+    def __init__(self, f, base: int, size: Optional[int] = None):
+        self.f = f
+        self.base = base
+        self.size = size
+        # libsndfile takes the position it is handed as the stream start
+        f.seek(base)
+
+    def _end(self) -> int:
+        if self.size is not None:
+            return self.base + self.size
+        return self.f.seek(0, os.SEEK_END)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = self.base + offset
+        elif whence == os.SEEK_CUR:
+            position = self.f.tell() + offset
+        else:
+            position = self._end() + offset
+        return self.f.seek(position) - self.base
+
+    def tell(self) -> int:
+        return self.f.tell() - self.base
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = max(0, self._end() - self.f.tell())
+        return self.f.read(remaining if size < 0 else min(size, remaining))
+
+    def write(self, data) -> int:
+        return self.f.write(data)
+
+
+class ContainerReader:
+    """
+    Index and metadata of a binary project.
+
+    Opening reads the header, the directory, the session and the clip and
+    automation chunks; track audio stays on disk until `track_audio` seeks
+    to it through the directory.
+    """
+
+    def __init__(self, file_path: str):
+        self.path = file_path
+        self.chunks: Dict[Tuple[bytes, int], Chunk] = {}
+        with open(file_path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"Truncated project: {file_path}")
+            magic, version, _, directory, count = _HEADER.unpack(header)
+            if magic != CONTAINER_MAGIC:
+                raise ValueError(f"Not a SoundByte project: {file_path}")
+            if version > CONTAINER_VERSION:
+                raise ValueError(f"Unsupported project version {version}: {file_path}")
+
+            f.seek(directory)
+            for entry in _ENTRY.iter_unpack(f.read(count * _ENTRY.size)):
+                chunk = Chunk(*entry)
+                self.chunks[chunk.kind, chunk.chunk_id] = chunk
+
+            self.session = json.loads(self._read(f, SESSION, 0))
+            self.project_data = self._expand(f)
+
+    @property
+    def sample_rate(self) -> int:
+        return self.session.get('sample_rate', 44100)
+
+    def track_audio(self, index: int) -> LoadedAudio:
+        """
+        Samples of the track at `index`: a read-only map of raw float32
+        audio, or 16-bit PCM decoded from FLAC
+        """
+        audio = self.session['tracks'][index]['audio']
+        shape = (audio['frames'], audio['channels'])
+        chunk = self.chunks.get((AUDIO_F32, index))
+        if chunk is not None:
+            if not audio['frames']:
+                data = np.zeros(shape, dtype='<f4')
+            else:
+                data = np.memmap(self.path, dtype='<f4', mode='r',
+                                 offset=chunk.offset, shape=shape)
+            return LoadedAudio(data, audio['sample_rate'], 1.0)
+
+        chunk = self.chunks[AUDIO_FLAC, index]
+        with open(self.path, 'rb') as f:
+            with sf.SoundFile(_Window(f, chunk.offset, chunk.size)) as src:
+                data = src.read(dtype='int16', always_2d=True)
+        return LoadedAudio(data, audio['sample_rate'], 1.0 / 2 ** 15)
+
+    def is_mapped(self, index: int) -> bool:
+        """Whether `track_audio(index)` maps rather than decodes"""
+        return (AUDIO_F32, index) in self.chunks
+
+    def _read(self, f, kind: bytes, chunk_id: int) -> bytes:
+        chunk = self.chunks.get((kind, chunk_id))
+        if chunk is None:
+            return b''
+        f.seek(chunk.offset)
+        return f.read(chunk.size)
+
+    def _expand(self, f) -> dict:
+        """The session in the dict form of a .sbp, see project.read_project"""
+        files = self.session.get('files', [])
+        tracks = []
+        for index, track in enumerate(self.session['tracks']):
+            track = dict(track)
+            clips = np.frombuffer(self._read(f, CLIPS, index), dtype=CLIP_DTYPE)
+            track['clips'] = [
+                {'file': files[file], 'start_frame': start, 'gain': gain,
+                 'offset': offset, 'length': length, 'fade_in': fade_in,
+                 'fade_out': fade_out, 'curve': curve}
+                for start, length, offset, file, gain, fade_in, fade_out, curve
+                in clips.tolist()
+            ]
+            points = np.frombuffer(self._read(f, AUTOMATION, index), dtype=AUTOMATION_DTYPE)
+            if len(points):
+                track['volume_automation'] = {
+                    'frames': points['frame'].tolist(),
+                    'values': points['value'].tolist(),
+                }
+            tracks.append(track)
+        return {**self.session, 'tracks': tracks}
+
+
+class ContainerLoader(ProjectLoader):
+    """
+    `ProjectLoader` for binary projects.
+
+    Raw float32 tracks are mapped straight out of the container, so they
+    are fully loaded as soon as `open` returns. FLAC tracks start silent
+    and are decoded on the pool, alongside every track's clips.
+    """
+
+    def __init__(self, engine, reader: ContainerReader, max_workers: Optional[int] = None):
+        super().__init__(engine, reader.project_data, os.path.dirname(reader.path),
+                         max_workers)
+        self.reader = reader
+
+    def open(self, on_loaded: Optional[Callable[[int], None]] = None) -> List[int]:
+        buses = _load_buses(self.engine, self.project_data)
+        track_ids = []
+        for index, track in enumerate(self.project_data['tracks']):
+            mapped = self.reader.is_mapped(index)
+            try:
+                if mapped:
+                    data, sr, scale = self.reader.track_audio(index)
+                else:
+                    audio = track['audio']
+                    data = np.zeros((0, audio['channels']), dtype=np.float32)
+                    sr, scale = audio['sample_rate'], 1.0
+                track_id = self.engine.add_data_track(data, sr, track['name'], scale)
+            except Exception as e:
+                self._error(f"Failed to load track {track['name']}: {str(e)}")
+                continue
+
+            _apply_track_settings(self.engine, track_id, track, buses)
+            self._pending.append(self._pool.submit(
+                self._load_embedded, track_id, index, not mapped, on_loaded))
+            track_ids.append(track_id)
+
+        self._pool.shutdown(wait=False)
+        return track_ids
+
+    @traced("load")
+    def _load_embedded(self, track_id: int, index: int, decode: bool, on_loaded):
+        track = self.project_data['tracks'][index]
+        if decode:
+            try:
+                data, _, scale = self.reader.track_audio(index)
+                self.engine.set_track_data(track_id, data, scale)
+            except Exception as e:
+                self._error(f"Failed to decode track {track['name']}: {str(e)}")
+
+        for error in _load_clips(self.engine, track_id, track, self.project_dir):
+            self._error(error)
+
+        if on_loaded:
+            on_loaded(track_id)
+
+
+def load_container(file_path: str, engine_factory) -> Tuple[object, List[str]]:
+    """Build an engine for a binary project, see project.load_project"""
+    reader = ContainerReader(file_path)
+    engine = engine_factory(sample_rate=reader.sample_rate)
+    loader = ContainerLoader(engine, reader)
+    loader.open()
+    return engine, loader.wait()
+
+
+@traced("save")
+def save_container(engine, file_path: str, compress: bool = True):
+    """
+    Save the project as a single binary file
+
+    Every track's audio is embedded: 16-bit tracks as FLAC when `compress`
+    is set, anything else as raw float32 that `ContainerReader` maps
+    without decoding. Clip sources are stored as paths relative to the
+    project, like .sbp. The file is written to a temporary name and
+    renamed into place.
+    """
+    project_dir = os.path.dirname(file_path)
+    buses, bus_index = _bus_entries(engine)
+    # Clip source paths, referenced by index from CLIP records
+    files: List[str] = []
+    file_index: Dict[int, int] = {}
+    session = {
+        'sample_rate': engine.sample_rate,
+        'buses': buses,
+        'files': files,
+        'tracks': [],
+    }
+
+    # The old file may be mapped as track data; the rename leaves it intact
+    with _atomic_write(file_path) as tmp_path, open(tmp_path, 'w+b') as f:
+        chunks: List[Chunk] = []
+        f.write(b'\0' * _HEADER.size)
+
+        def add_chunk(kind: bytes, chunk_id: int, payload: bytes):
+            f.write(b'\0' * (-f.seek(0, os.SEEK_END) % 8))
+            start = f.tell()
+            f.write(payload)
+            chunks.append(Chunk(kind, chunk_id, start, f.tell() - start))
+
+        for index, track in enumerate(engine.tracks.values()):
+            data, scale = track.data, track.scale
+            if isinstance(data, StreamingSource):
+                # Mapped (or decoded into the cache) at the session rate
+                data, _, scale = engine.load_track_audio(data.path)
+            chunks.append(_write_audio(f, index, data, scale, track.sample_rate, compress))
+            frames, channels = data.shape
+            session['tracks'].append({
+                'name': track.name,
+                'volume': track.volume,
+                'muted': track.muted,
+                'solo': track.solo,
+                'output': bus_index.get(track.output),
+                'audio': {'frames': frames, 'channels': channels,
+                          'sample_rate': track.sample_rate},
+            })
+
+            columns = track.clips.columns
+            if len(columns.start):
+                for source in set(columns.source.tolist()):
+                    if source not in file_index:
+                        file_index[source] = len(files)
+                        files.append(_relative_path(engine.sources[source].key[0],
+                                                    project_dir))
+                clips = np.empty(len(columns.start), dtype=CLIP_DTYPE)
+                clips['start'] = columns.start
+                clips['length'] = columns.length
+                clips['offset'] = columns.offset
+                clips['file'] = [file_index[source] for source in columns.source.tolist()]
+                clips['gain'] = columns.gain
+                clips['fade_in'] = columns.fade_in
+                clips['fade_out'] = columns.fade_out
+                clips['curve'] = columns.curve
+                add_chunk(CLIPS, index, clips.tobytes())
+
+            if len(track.volume_automation):
+                points_frames, values = track.volume_automation.points
+                points = np.empty(len(points_frames), dtype=AUTOMATION_DTYPE)
+                points['frame'] = points_frames
+                points['value'] = values
+                add_chunk(AUTOMATION, index, points.tobytes())
+
+        add_chunk(SESSION, 0, json.dumps(session, separators=(',', ':')).encode())
+
+        directory = f.seek(0, os.SEEK_END)
+        for chunk in chunks:
+            f.write(_ENTRY.pack(*chunk))
+        f.seek(0)
+        f.write(_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, 0, directory, len(chunks)))
+
+
+def _write_audio(f, index: int, data: np.ndarray, scale: float, sample_rate: int,
+                 compress: bool) -> Chunk:
+    """Append a track's samples to `f` as an audio chunk"""
+    if compress and data.dtype == np.int16:
+        start = f.seek(0, os.SEEK_END)
+        with sf.SoundFile(_Window(f, start), 'w', sample_rate, data.shape[1],
+                          subtype='PCM_16', format='FLAC') as dst:
+            for pos in range(0, len(data), _BLOCK_FRAMES):
+                dst.write(np.ascontiguousarray(data[pos:pos + _BLOCK_FRAMES]))
+        return Chunk(AUDIO_FLAC, index, start, f.seek(0, os.SEEK_END) - start)
+
+    f.write(b'\0' * (-f.seek(0, os.SEEK_END) % _PAGE))
+    start = f.tell()
+    # Block by block, so long integer tracks are never converted whole
+    for pos in range(0, len(data), _BLOCK_FRAMES):
+        block = data[pos:pos + _BLOCK_FRAMES]
+        if scale != 1.0:
+            block = block * np.float32(scale)
+        f.write(np.ascontiguousarray(block, dtype='<f4').tobytes())
+    return Chunk(AUDIO_F32, index, start, f.tell() - start)
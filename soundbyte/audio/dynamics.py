@@ -0,0 +1,189 @@
+import numpy as np
+
+# Gains are computed in dB; silence maps to this level instead of -inf
+_FLOOR = 1e-9
+
+
+def sliding_min(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Minimum of every `window`-long run of `x`, i.e. min(x[i:i+window]) for
+    each i, in O(len(x)) with the van Herk/Gil-Werman block method
+    """
+    n = len(x)
+    padded = np.concatenate((x, np.full(-n % window, np.inf)))
+    out = np.empty(n - window + 1)
+    _sliding_min_into(padded, n, window, out, np.empty_like(padded), np.empty_like(padded))
+    return out
+
+
+def _sliding_min_into(padded: np.ndarray, n: int, window: int, out: np.ndarray,
+                      prefix: np.ndarray, suffix: np.ndarray):
+    # `padded` holds x in its first n entries and +inf up to a multiple of
+    # `window`; `prefix` and `suffix` are scratch of the same length
+    blocks = padded.reshape(-1, window)
+    np.minimum.accumulate(blocks, axis=1, out=prefix.reshape(-1, window))
+    np.minimum.accumulate(blocks[:, ::-1], axis=1, out=suffix.reshape(-1, window)[:, ::-1])
+    count = n - window + 1
+    np.minimum(suffix[:count], prefix[window - 1:window - 1 + count], out=out)
+
+
+class Limiter:
+    """
+    Look-ahead brickwall limiter for the master bus.
+
+    The output is delayed by `latency` frames so the gain can start coming
+    down before a peak arrives, which keeps every output sample within
+    `ceiling` without a gain step. Per block, entirely vectorised:
+
+    1. The gain each frame needs is the dB distance of its channel peak
+       from the ceiling (0 dB when below it).
+    2. A sliding minimum over the look-ahead window holds that gain for
+       the frames leading up to each peak.
+    3. Release back towards unity is limited to `release_db_per_second`,
+       which for a dB-linear release is a running minimum.
+    4. A moving average over the look-ahead window turns the held steps
+       into ramps; every frame it averages is already at or below the
+       gain the peak needs, so the ceiling still holds.
+
+    All state (the delay line, pending gains, release and smoothing
+    history) carries across blocks, so output does not depend on block size.
+
+    Like `Mixer`, it runs in the audio callback, so it works in place in
+    buffers preallocated for blocks of up to `max_frames`.
+    """
+
+    def __init__(self, channels: int, sample_rate: int, ceiling: float = 1.0,
+                 lookahead_seconds: float = 0.005,
+                 release_db_per_second: float = 60.0, soft_clip: bool = False,
+                 max_frames: int = 4096):
+        self.channels = channels
+        self.ceiling = ceiling
+        self.soft_clip = soft_clip
+        self.latency = max(1, int(lookahead_seconds * sample_rate))
+        self._release = release_db_per_second / sample_rate
+        self.max_frames = 0
+        self.reserve(max_frames)
+        self.reset()
+
+    def reserve(self, frames: int):
+        """Grow the work buffers so blocks of `frames` fit without allocating"""
+        if frames <= self.max_frames:
+            return
+        latency, channels = self.latency, self.channels
+        # Room for the history, the block and padding to whole windows
+        needed = np.zeros((2, 2 * latency + frames))
+        gains = np.ones((2, latency - 1 + frames))
+        delays = np.zeros((2, latency + frames, channels), dtype=np.float32)
+        if self.max_frames:
+            needed[0, :latency] = self._needed[0][:latency]
+            gains[0, :latency - 1] = self._gains[0][:latency - 1]
+            delays[0, :latency] = self._delays[0][:latency]
+        # Pairs: each block's history moves to the other buffer's head, as
+        # shifting within one would copy the overlap through a temporary
+        self._needed = (needed[0], needed[1])
+        self._gains = (gains[0], gains[1])
+        self._delays = (delays[0], delays[1])
+        self._prefix = np.empty(2 * latency + frames)
+        self._suffix = np.empty(2 * latency + frames)
+        self._totals = np.empty(latency + frames)
+        self._work = np.empty(frames)
+        self._ramp = self._release * np.arange(frames)
+        self._peak = np.empty(frames, dtype=np.float32)
+        self._gain = np.empty(frames, dtype=np.float32)
+        self._magnitude = np.empty((frames, channels), dtype=np.float32)
+        self._bent = np.empty((frames, channels), dtype=np.float32)
+        self.max_frames = frames
+
+    def reset(self):
+        """Forget the signal history, e.g. after a seek"""
+        latency = self.latency
+        self._needed[0][:latency] = 0.0
+        self._gains[0][:latency - 1] = 1.0
+        self._delays[0][:latency] = 0.0
+        self._gain_db = 0.0
+
+    def process(self, block: np.ndarray, out: np.ndarray):
+        """Limit a (frames, channels) block into `out`, delayed by `latency`"""
+        n = len(block)
+        if n == 0:
+            return
+        self.reserve(n)
+        latency = self.latency
+        ceiling_db = 20 * np.log10(self.ceiling)
+
+        needed, next_needed = self._needed
+        magnitude, peak = self._magnitude[:n], self._peak[:n]
+        np.abs(block, out=magnitude)
+        np.max(magnitude, axis=1, out=peak)
+        np.maximum(peak, _FLOOR, out=peak)
+        new = needed[latency:latency + n]
+        new[:] = peak
+        np.log10(new, out=new)
+        np.multiply(new, -20.0, out=new)
+        np.add(new, ceiling_db, out=new)
+        np.minimum(new, 0.0, out=new)
+        next_needed[:latency] = needed[n:n + latency]
+        self._needed = (next_needed, needed)
+
+        window = latency + 1
+        total = latency + n
+        size = total + -total % window
+        needed[total:size] = np.inf
+        gain_db = self._work[:n]
+        _sliding_min_into(needed[:size], total, window, gain_db,
+                          self._prefix[:size], self._suffix[:size])
+
+        # gain[i] = min(held[i], gain[i-1] + release), unrolled into a
+        # running minimum of held[k] + release * (i - k)
+        ramp = self._ramp[:n]
+        np.subtract(gain_db, ramp, out=gain_db)
+        np.minimum(gain_db, self._gain_db + self._release, out=gain_db)
+        np.minimum.accumulate(gain_db, out=gain_db)
+        np.add(gain_db, ramp, out=gain_db)
+        np.minimum(gain_db, 0.0, out=gain_db)
+        self._gain_db = float(gain_db[-1])
+
+        gains, next_gains = self._gains
+        linear = gains[latency - 1:latency - 1 + n]
+        np.divide(gain_db, 20.0, out=linear)
+        np.power(10.0, linear, out=linear)
+        next_gains[:latency - 1] = gains[n:n + latency - 1]
+        self._gains = (next_gains, gains)
+        totals = self._totals[:total]
+        totals[0] = 0.0
+        np.cumsum(gains[:latency - 1 + n], out=totals[1:])
+        smoothed = self._work[:n]
+        np.subtract(totals[latency:], totals[:n], out=smoothed)
+        np.divide(smoothed, latency, out=smoothed)
+        gain = self._gain[:n]
+        gain[:] = smoothed
+
+        delays, next_delays = self._delays
+        delays[latency:total] = block
+        for channel in range(self.channels):
+            np.multiply(delays[:n, channel], gain, out=out[:, channel])
+        next_delays[:latency] = delays[n:total]
+        self._delays = (next_delays, delays)
+
+        if self.soft_clip:
+            self._saturate(out)
+        # Rounding can leave a sample a hair above the ceiling
+        np.clip(out, -self.ceiling, self.ceiling, out=out)
+
+    def _saturate(self, out: np.ndarray):
+        # Bend everything above the knee smoothly towards the ceiling:
+        # min(m, knee) + width * tanh(max(m - knee, 0) / width), signed
+        knee = 0.8 * self.ceiling
+        width = self.ceiling - knee
+        magnitude, bent = self._magnitude[:len(out)], self._bent[:len(out)]
+        np.abs(out, out=magnitude)
+        if magnitude.max() <= knee:
+            return
+        np.subtract(magnitude, knee, out=bent)
+        np.maximum(bent, 0.0, out=bent)
+        np.divide(bent, width, out=bent)
+        np.tanh(bent, out=bent)
+        np.multiply(bent, width, out=bent)
+        np.minimum(magnitude, knee, out=magnitude)
+        np.add(bent, magnitude, out=bent)
+        np.copysign(bent, out, out=out)
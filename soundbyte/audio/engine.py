@@ -1,197 +1,694 @@
-import sounddevice as sd
 import soundfile as sf
 import numpy as np
-from typing import Dict, Optional, List, Tuple
-from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, List, Tuple
+from dataclasses import dataclass, field
 from threading import Lock
+from collections import deque
+import logging
+from time import perf_counter, perf_counter_ns
 import os
 
-@dataclass
-class AudioClip:
-    data: np.ndarray
-    start_frame: int
-    length: int
-    track_id: int
-    name: str = ""
+from .backend import AudioBackend, NullBackend, SoundDeviceBackend
+from .automation import FADER_RAMP_SECONDS, Envelope
+from .loader import copy_on_write, load_audio
+from .meter import AudioMeter
+from .mixer import BusState, Mixer, TrackState
+from .parallel import ParallelMixer
+from .resample import DEFAULT_QUALITY, resample_cached
+from .session import ClipTable, SourceTable
+from .stream import DiskReader, StreamingSource
+from .trace import realtime_log, span
+from .transport import (ENDED, PAUSED, PLAYING, SEEKED, STOPPED, TransportPublisher,
+                        TransportState)
+from .track import SamplePool
+
+logger = logging.getLogger(__name__)
 
 @dataclass 
 class AudioTrack:
+    # In-memory samples, or a StreamingSource for tracks played from disk
     data: np.ndarray
     sample_rate: int
     name: str
-    clips: List[AudioClip]
+    # Clip columns sorted by start frame, shared with the audio thread
+    clips: ClipTable
+    muted: bool = False
+    solo: bool = False
+    volume: float = 1.0
+    # Converts integer PCM in `data` to float, see loader.load_audio
+    scale: float = 1.0
+    # Follows `volume` with short ramps so fader moves do not click
+    fader: Envelope = field(default_factory=Envelope)
+    # Breakpoint volume automation, applied on top of the fader
+    volume_automation: Envelope = field(default_factory=Envelope)
+    # File `data` was loaded from; saves reference it while not dirty
+    source_path: Optional[str] = None
+    # Set when `data` no longer matches `source_path` and must be written
+    dirty: bool = False
+    # Bus the track feeds, or None for the master bus
+    output: Optional[int] = None
+
+@dataclass
+class AudioBus:
+    """Group of tracks summed into one sub-mix before the master bus"""
+    name: str
     muted: bool = False
     solo: bool = False
     volume: float = 1.0
+    fader: Envelope = field(default_factory=Envelope)
 
 class AudioEngine:
-    def __init__(self, sample_rate=44100, channels=2, buffer_size=1024):
-        print(f"Initializing AudioEngine with {sample_rate}Hz")  # Debug
+    def __init__(self, sample_rate=44100, channels=2, buffer_size=1024,
+                 sample_pool: Optional[SamplePool] = None, open_stream: bool = True,
+                 render_threads: int = 1, resample_quality: str = DEFAULT_QUALITY,
+                 backend: Optional[AudioBackend] = None):
+        """
+        Args:
+            open_stream: False for an offline engine with no backend, whose
+                callback is only ever driven directly (rendering, tests)
+            backend: Where the callback output goes; by default the sound
+                device, or a `NullBackend` if none can be opened
+        """
+        logger.debug("Initializing AudioEngine with %sHz", sample_rate)
         self.sample_rate = sample_rate
         self.channels = channels
         self.buffer_size = buffer_size
+        # Sources at other rates are converted to sample_rate at this tier
+        self.resample_quality = resample_quality
         self.tracks = {}
+        self.buses: Dict[int, AudioBus] = {}
         self.current_frame = 0
         self.playing = False
+        # Serialises GUI-thread writers; the audio callback never takes it
         self.lock = Lock()
-        
-        try:
-            self.stream = sd.OutputStream(
-                channels=channels,
-                samplerate=sample_rate,
-                blocksize=buffer_size,
-                callback=self._audio_callback
-            )
-            print("Audio stream created successfully")  # Debug
-        except Exception as e:
-            print(f"Failed to create audio stream: {e}")
-            raise
+        # Heard position and state changes for the GUI, see transport.py
+        self.transport = TransportPublisher(sample_rate)
+        # Session length in frames, kept up to date by track and clip edits
+        self._length = 0
+        self._length_lock = Lock()
+        if render_threads > 1:
+            self.mixer = ParallelMixer(channels, buffer_size, render_threads,
+                                       sample_rate=sample_rate)
+        else:
+            self.mixer = Mixer(channels, buffer_size, sample_rate)
+        # Callback timing, xrun counts and per-track mixing time
+        self.meter = AudioMeter()
+        self.mixer.meter = self.meter
+        # Track state published to the audio thread, replaced atomically
+        self._track_states: Tuple[TrackState, ...] = ()
+        # IDs of the tracks in that snapshot
+        self.audible_tracks: FrozenSet[int] = frozenset()
+        # Control messages for the audio thread, drained at block start
+        self._commands = deque()
+        # Clip audio is decoded once per file and shared between clips
+        self.sample_pool = sample_pool or SamplePool()
+        self.sources = SourceTable(self.sample_pool)
+        # Created on the first streamed track
+        self.disk_reader = None
+        # Offline engines (rendering, tests) have no backend at all
+        self.backend: Optional[AudioBackend] = None
+        if not open_stream:
+            return
+
+        if backend is None:
+            try:
+                backend = SoundDeviceBackend()
+                backend.open(self._audio_callback, sample_rate, channels, buffer_size)
+            except Exception:
+                # No usable sound device: keep the transport running without one
+                logger.warning("No audio device available, using the null backend",
+                               exc_info=True)
+                backend = NullBackend()
+                backend.open(self._audio_callback, sample_rate, channels, buffer_size)
+        else:
+            backend.open(self._audio_callback, sample_rate, channels, buffer_size)
+        logger.debug("Opened %s", type(backend).__name__)
+        self.backend = backend
 
     def play(self):
-        print("Play requested")  # Debug
         with self.lock:
             if not self.tracks:
-                print("No tracks to play")
+                logger.info("No tracks to play")
                 return
                 
-            print(f"Starting playback at frame {self.current_frame}")
+            logger.debug("Starting playback at frame %d", self.current_frame)
             self.playing = True
-            self.stream.start()
+            self._post_transport(PLAYING)
+            if self.backend:
+                self.backend.start()
+        self.transport.dispatch()
 
     def stop(self):
         """Stop audio playback and reset position"""
         with self.lock:
             self.playing = False
-            self.stream.stop()
+            if self.backend:
+                self.backend.stop()
+            self._commands.clear()
             self.current_frame = 0
+            self.mixer.reset()
+            self._seek_streams(0)
+            self._post_transport(STOPPED)
+        self.transport.dispatch()
 
     def pause(self):
         """Pause audio playback"""
         with self.lock:
             self.playing = False
-            self.stream.stop()
+            if self.backend:
+                self.backend.stop()
+            # The backend has stopped, so no callback publishes after this
+            self._post_transport(PAUSED)
+        self.transport.dispatch()
+
+    def _post_transport(self, event: str):
+        """Publish the transport as the GUI thread has just left it"""
+        self.transport.publish(TransportState(self.playing, self.current_frame, 0,
+                                              perf_counter(), self.sample_rate))
+        self.transport.post(event, self.current_frame)
+
+    def close(self):
+        """
+        Stop playback and release the backend, e.g. finalising a file sink,
+        then the mixer's worker threads, the disk reader thread and the
+        files of streamed tracks
+        """
+        self.stop()
+        if self.backend:
+            self.backend.close()
+            self.backend = None
+        self.mixer.shutdown()
+        if self.disk_reader is not None:
+            self.disk_reader.stop()
+            self.disk_reader = None
+        for track in self.tracks.values():
+            if isinstance(track.data, StreamingSource):
+                track.data.close()
               
-    def add_track(self, file_path: str, name: str = "") -> int:
+    def add_track(self, file_path: str, name: str = "", streaming: bool = False) -> int:
         """
         Add a new audio track from file
         
         Args:
             file_path: Path to audio file
             name: Optional track name
+            streaming: Play the file from disk through a read-ahead buffer
+                instead of decoding it into memory
         
         Returns:
             track_id: Unique ID for the new track
         """
-        print(f"Loading track from {file_path}")  # Debug
-        data, sr = sf.read(file_path)
-        print(f"Loaded audio: {data.shape}, {sr}Hz")  # Debug
-        
-        if data.dtype != np.float32:
-            data = np.memmap(file_path, dtype='float32', mode='r')
-        if len(data.shape) == 1:
-            data = np.column_stack((data, data))
-            
-        track_id = max(self.tracks.keys(), default=-1) + 1
-        self.tracks[track_id] = AudioTrack(
+        logger.debug("Loading track from %s", file_path)
+        if streaming:
+            return self.add_source_track(self.open_stream_source(file_path), name)
+
+        # Mapped, not decoded: mono stays (frames, 1) and is
+        # broadcast to the output channels by the mixer
+        data, sr, scale = self.load_track_audio(file_path)
+        logger.debug("Loaded audio: %s, %sHz", data.shape, sr)
+        return self._insert_track(AudioTrack(
             data=data,
             sample_rate=sr,
             name=name or os.path.basename(file_path),
-            clips=[]
-        )
+            clips=ClipTable(self.sources),
+            scale=scale,
+            source_path=os.path.abspath(file_path)
+        ))
+
+    def load_track_audio(self, file_path: str) -> Tuple[np.ndarray, int, float]:
+        """
+        Map a file for playback at the session rate
+
+        Files already at `sample_rate` are mapped as is. Anything else is
+        resampled once into the decode cache and mapped from there, so the
+        mixer never converts rates in the audio callback.
+
+        Returns:
+            (data, sample_rate, scale), see loader.load_audio
+        """
+        with span("load", path=file_path):
+            data, sr, scale = load_audio(file_path)
+            if sr == self.sample_rate:
+                return data, sr, scale
+            data = resample_cached(file_path, data, sr, self.sample_rate,
+                                   self.resample_quality, scale)
+            return data, self.sample_rate, 1.0
+
+    def open_stream_source(self, file_path: str) -> StreamingSource:
+        """Open a file for streaming, resampled to the session rate on read"""
+        return StreamingSource(file_path, target_rate=self.sample_rate,
+                               quality=self.resample_quality)
+
+    def add_source_track(self, source: StreamingSource, name: str = "") -> int:
+        """Add a track played from an already opened StreamingSource"""
+        source.seek(self.current_frame)
+        if self.disk_reader is None:
+            self.disk_reader = DiskReader()
+        self.disk_reader.add(source)
+        return self._insert_track(AudioTrack(
+            data=source,
+            sample_rate=source.sample_rate,
+            name=name or os.path.basename(source.path),
+            clips=ClipTable(self.sources),
+            source_path=os.path.abspath(source.path)
+        ))
+
+    def add_data_track(self, data: np.ndarray, sample_rate: int, name: str,
+                       scale: float = 1.0) -> int:
+        """
+        Add a track playing samples already in memory or mapped, e.g. audio
+        embedded in a project container. It has no source file, so a .sbp
+        save writes it out.
+        """
+        return self._insert_track(AudioTrack(
+            data=data,
+            sample_rate=sample_rate,
+            name=name,
+            clips=ClipTable(self.sources),
+            scale=scale
+        ))
+
+    def _insert_track(self, track: AudioTrack) -> int:
+        with self.lock:
+            track_id = max(self.tracks.keys(), default=-1) + 1
+            self.tracks[track_id] = track
+            self._publish_tracks()
+        self._grow_length(len(track.data))
+        return track_id
+
+    def set_track_data(self, track_id: int, data: np.ndarray, scale: float = 1.0):
+        """
+        Swap in new audio for a track, e.g. once a streamed track has been
+        fully mapped. The audio thread picks it up at the next block.
+        """
+        with self.lock:
+            track = self.tracks.get(track_id)
+            if track is None:
+                return
+            old = track.data
+            track.data = data
+            track.scale = scale
+            self._publish_tracks()
+        self._measure_length()
+        if isinstance(old, StreamingSource) and old is not data:
+            self.disk_reader.remove(old)
+
+    def writable_track_data(self, track_id: int) -> np.ndarray:
+        """
+        The track's samples as an array that can be edited in place.
+
+        Mapped audio is swapped for a private copy-on-write map the first
+        time, so edits never reach the source file and only the pages they
+        touch are copied. The track is marked dirty. Streamed tracks cannot
+        be edited until they are fully mapped.
+        """
+        with self.lock:
+            track = self.tracks[track_id]
+            if isinstance(track.data, StreamingSource):
+                raise ValueError(f"Track {track_id} is still streaming from disk")
+            data = copy_on_write(track.data)
+            if data is not track.data:
+                track.data = data
+                self._publish_tracks()
+            track.dirty = True
+            return data
+
+    def detach_track(self, track_id: int) -> Optional[AudioTrack]:
+        """
+        Take a track out of the engine but keep its audio and clips, so
+        `attach_track` can put it back without loading anything
+        """
+        with self.lock:
+            track = self.tracks.pop(track_id, None)
+            if track is not None:
+                self._publish_tracks()
+        self._measure_length()
+        return track
+
+    def attach_track(self, track: AudioTrack, track_id: Optional[int] = None) -> int:
+        """Re-insert a detached track, under `track_id` if that is still free"""
+        with self.lock:
+            if track_id is None or track_id in self.tracks:
+                track_id = max(self.tracks.keys(), default=-1) + 1
+            self.tracks[track_id] = track
+            self._publish_tracks()
+        self._grow_length(max(len(track.data), track.clips.end_frame))
         return track_id
 
-    def set_track_volume(self, track_id: int, volume: float):
-        """Set volume for a track (0.0 to 1.0)"""
+    def release_track(self, track: AudioTrack):
+        """Free the stream and clip sources of a detached track"""
+        if isinstance(track.data, StreamingSource):
+            self.disk_reader.remove(track.data)
+        self.sources.release(track.clips.clear())
+
+    def remove_track(self, track_id: int):
+        """Remove a track from the engine"""
+        track = self.detach_track(track_id)
+        if track is not None:
+            self.release_track(track)
+
+    def _publish_tracks(self):
+        """
+        Rebuild the routing snapshot read by the audio callback
+
+        Only called when mute, solo, routing or track membership changes,
+        always with `lock` held, so concurrent changes cannot publish their
+        snapshots out of order and leave a stale one in place.
+        Tracks that cannot be heard (muted, on a muted bus, or not soloed
+        while something else is) are left out entirely, so they cost
+        nothing per block.
+        """
+        soloed = (any(track.solo for track in self.tracks.values()) or
+                  any(bus.solo for bus in self.buses.values()))
+        master = []
+        routed: Dict[int, List[TrackState]] = {}
+        audible = []
+        for track_id, track in self.tracks.items():
+            bus = self.buses.get(track.output)
+            if track.muted or (bus is not None and bus.muted):
+                continue
+            if soloed and not (track.solo or (bus is not None and bus.solo)):
+                continue
+            state = TrackState(track.data, 1.0, track.clips, track.scale,
+                               (track.fader, track.volume_automation)
+                               if len(track.volume_automation) else (track.fader,),
+                               track_id)
+            if bus is None:
+                master.append(state)
+            else:
+                routed.setdefault(track.output, []).append(state)
+            audible.append(track_id)
+
+        for bus_id, states in routed.items():
+            master.append(BusState(tuple(states), 1.0, (self.buses[bus_id].fader,)))
+        self._track_states = tuple(master)
+        self.audible_tracks = frozenset(audible)
+
+    @property
+    def track_states(self) -> Tuple[TrackState, ...]:
+        """
+        Snapshot of the audible tracks, as mixed by the audio callback;
+        tracks routed to a bus are grouped under a BusState
+        """
+        return self._track_states
+
+    def add_bus(self, name: str = "") -> int:
+        """
+        Add an empty bus; route tracks to it with `set_track_output`
+
+        Returns:
+            bus_id: Unique ID for the new bus
+        """
+        with self.lock:
+            bus_id = max(self.buses.keys(), default=-1) + 1
+            self.buses[bus_id] = AudioBus(name or f"Bus {bus_id + 1}")
+        return bus_id
+
+    def remove_bus(self, bus_id: int):
+        """Remove a bus, sending its tracks straight to the master bus"""
+        with self.lock:
+            if self.buses.pop(bus_id, None) is not None:
+                for track in self.tracks.values():
+                    if track.output == bus_id:
+                        track.output = None
+                self._publish_tracks()
+
+    def set_track_output(self, track_id: int, bus_id: Optional[int]):
+        """Route a track to a bus, or to the master bus with None"""
+        with self.lock:
+            if track_id in self.tracks and (bus_id is None or bus_id in self.buses):
+                self.tracks[track_id].output = bus_id
+                self._publish_tracks()
+
+    def set_bus_volume(self, bus_id: int, volume: float,
+                       ramp_seconds: float = FADER_RAMP_SECONDS):
+        """Set volume for a bus (0.0 to 1.0), ramped like `set_track_volume`"""
+        if bus_id in self.buses:
+            bus = self.buses[bus_id]
+            bus.volume = max(0.0, min(1.0, volume))
+            self._move_fader(bus.fader, bus.volume, ramp_seconds)
+
+    def set_bus_mute(self, bus_id: int, muted: bool):
+        """Mute/unmute every track on a bus"""
+        with self.lock:
+            if bus_id in self.buses:
+                self.buses[bus_id].muted = muted
+                if muted:
+                    self.buses[bus_id].solo = False
+                self._publish_tracks()
+
+    def set_bus_solo(self, bus_id: int, solo: bool):
+        """Solo/unsolo every track on a bus"""
+        with self.lock:
+            if bus_id in self.buses:
+                self.buses[bus_id].solo = solo
+                if solo:
+                    self.buses[bus_id].muted = False
+                self._publish_tracks()
+
+    def set_track_volume(self, track_id: int, volume: float,
+                         ramp_seconds: float = FADER_RAMP_SECONDS):
+        """
+        Set volume for a track (0.0 to 1.0)
+
+        While playing, the change is applied as a linear ramp of
+        `ramp_seconds` from the current position instead of a step.
+        """
         if track_id in self.tracks:
-            self.tracks[track_id].volume = max(0.0, min(1.0, volume))
+            track = self.tracks[track_id]
+            track.volume = max(0.0, min(1.0, volume))
+            self._move_fader(track.fader, track.volume, ramp_seconds)
+
+    def _move_fader(self, fader: Envelope, volume: float, ramp_seconds: float):
+        # The audio thread reads the envelope directly; no republish
+        if self.playing and ramp_seconds > 0:
+            fader.ramp_to(self.current_frame, volume, int(ramp_seconds * self.sample_rate))
+        else:
+            fader.set(volume)
+
+    def set_volume_automation(self, track_id: int, frames, values):
+        """
+        Replace a track's volume automation with breakpoints at `frames`
+
+        Values multiply the fader volume and are interpolated linearly
+        between points, sample by sample. Pass empty sequences to clear.
+        """
+        with self.lock:
+            if track_id in self.tracks:
+                self.tracks[track_id].volume_automation.set_points(frames, values)
+                self._publish_tracks()
 
     def set_track_mute(self, track_id: int, muted: bool):
         """Mute/unmute a track"""
-        if track_id in self.tracks:
-            self.tracks[track_id].muted = muted
-            # Unsolo if muting
-            if muted:
-                self.tracks[track_id].solo = False
+        with self.lock:
+            if track_id in self.tracks:
+                self.tracks[track_id].muted = muted
+                # Unsolo if muting
+                if muted:
+                    self.tracks[track_id].solo = False
+                self._publish_tracks()
 
     def set_track_solo(self, track_id: int, solo: bool):
         """Solo/unsolo a track"""
-        if track_id in self.tracks:
-            self.tracks[track_id].solo = solo
-            # Unmute if soloing
-            if solo:
-                self.tracks[track_id].muted = False
+        with self.lock:
+            if track_id in self.tracks:
+                self.tracks[track_id].solo = solo
+                # Unmute if soloing
+                if solo:
+                    self.tracks[track_id].muted = False
+                self._publish_tracks()
 
     def seek(self, frame: int):
         """Seek to specific frame"""
         with self.lock:
-            self.current_frame = max(0, min(frame, self.get_total_frames()))
+            frame = max(0, min(frame, self.get_total_frames()))
+            if self.playing:
+                # The audio thread owns current_frame while playing
+                self._commands.append(("seek", frame))
+                self.transport.post(SEEKED, frame)
+            else:
+                self.current_frame = frame
+                self.mixer.reset()
+                self._post_transport(SEEKED)
+            self._seek_streams(frame)
+        self.transport.dispatch()
+
+    def _seek_streams(self, frame: int):
+        """
+        Refill the read-ahead buffers of streamed tracks from `frame` and
+        settle fader ramps, which are tied to where playback was
+        """
+        for track in self.tracks.values():
+            track.fader.set(track.volume)
+        for bus in self.buses.values():
+            bus.fader.set(bus.volume)
+        streams = [track.data for track in self.tracks.values()
+                   if isinstance(track.data, StreamingSource)]
+        for source in streams:
+            source.seek(frame)
+        if streams:
+            self.disk_reader.wake()
 
     def get_total_frames(self) -> int:
-        """Get total length in frames"""
-        if not self.tracks:
-            return 0
-        return max(len(track.data) for track in self.tracks.values())
+        """Session length in frames: the end of the longest track or clip"""
+        return self._length
+
+    def _grow_length(self, end: int):
+        """Extend the session length after an edit that only adds audio"""
+        with self._length_lock:
+            if end > self._length:
+                self._length = end
+
+    def _measure_length(self):
+        """Recompute the session length after an edit that may shorten it"""
+        with self._length_lock:
+            self._length = max((max(len(track.data), track.clips.end_frame)
+                                for track in list(self.tracks.values())), default=0)
     
-    def add_clip(self, track_id: int, file_path: str, start_frame: int = 0):
-        """Add audio clip to track at specified position"""
+    def add_clip(self, track_id: int, file_path: str, start_frame: int = 0,
+                 gain: float = 1.0, offset: int = 0,
+                 length: Optional[int] = None) -> Optional[int]:
+        """
+        Add audio clip to track at specified position
+
+        Args:
+            offset: First frame of the file the clip plays
+            length: Frames to play, by default to the end of the file
+
+        Returns:
+            clip_id: Unique ID of the clip within its track, or None if the
+            file could not be loaded
+        """
         if track_id in self.tracks:
             try:
-                data, sr = sf.read(file_path)
-                if data.dtype != np.float32:
-                    data = data.astype(np.float32)
-                if len(data.shape) == 1:  # Mono to stereo
-                    data = np.column_stack((data, data))
-                    
-                clip = AudioClip(
-                    data=data,
-                    start_frame=start_frame,
-                    length=len(data),
-                    track_id=track_id,
-                    name=os.path.basename(file_path)
-                )
-                self.tracks[track_id].clips.append(clip)
-                return True
+                source, frames = self.sources.acquire(
+                    file_path, self.sample_rate, self.resample_quality)
             except Exception as e:
-                print(f"Failed to load audio: {e}")
-                return False
-        return False
-        
-    def move_clip(self, track_id: int, clip_index: int, new_start: int):
+                logger.warning("Failed to load audio %s: %s", file_path, e)
+                return None
+            offset = min(max(offset, 0), max(frames - 1, 0))
+            length = frames - offset if length is None else min(length, frames - offset)
+            clip_id = self.tracks[track_id].clips.add(start_frame, length, source, gain, offset)
+            self._grow_length(start_frame + length)
+            return clip_id
+        return None
+
+    def place_clip(self, track_id: int, file_path: str, start_frame: int = 0,
+                   gain: float = 1.0) -> Optional[int]:
+        """
+        Add a clip from the file's header alone, without decoding it
+
+        The clip has its final length straight away but plays silence until
+        `load_clip_source` has decoded its source; see importer.ClipImporter.
+
+        Returns:
+            clip_id, or None if the file's header could not be read
+        """
+        if track_id not in self.tracks:
+            return None
+        try:
+            info = sf.info(file_path)
+        except Exception as e:
+            logger.warning("Failed to read audio header %s: %s", file_path, e)
+            return None
+        # Length once resampled to the session rate, see Resampler.output_length
+        frames = -(-info.frames * self.sample_rate // info.samplerate)
+        source, length, _ = self.sources.reserve(file_path, frames, info.channels,
+                                                 self.sample_rate, self.resample_quality)
+        clip_id = self.tracks[track_id].clips.add(start_frame, length, source, gain)
+        self._grow_length(start_frame + length)
+        return clip_id
+
+    def load_clip_source(self, source_id: int) -> bool:
+        """
+        Decode a source reserved by `place_clip` and let its clips play it.
+        Safe to call from any thread; returns False if its clips are gone.
+        """
+        if not self.sources.load(source_id, self.resample_quality):
+            return False
+        for track in list(self.tracks.values()):
+            track.clips.refresh()
+        return True
+
+    def move_clip(self, track_id: int, clip_id: int, new_start: int):
         """Move a clip to a new position"""
-        if track_id in self.tracks and clip_index < len(self.tracks[track_id].clips):
-            self.tracks[track_id].clips[clip_index].start_frame = new_start
+        if track_id in self.tracks:
+            self.tracks[track_id].clips.move(clip_id, max(0, new_start))
+            self._measure_length()
 
-    def remove_clip(self, track_id: int, clip_index: int):
-            """Remove a clip from a track"""
-            if track_id in self.tracks and clip_index < len(self.tracks[track_id].clips):
-                self.tracks[track_id].clips.pop(clip_index)
-                
-    def _audio_callback(self, outdata, frames, time, status):
-        if status:
-            print(f"Audio callback status: {status}")
-            
+    def shift_clips(self, after_frame: int, frames: int):
+        """Move every clip starting at or after `after_frame` by `frames`, on all tracks"""
         with self.lock:
-            if not self.playing:
-                outdata.fill(0)
-                return
-                
-            mixed = np.zeros((frames, self.channels), dtype=np.float32)
-            
             for track in self.tracks.values():
-                if track.muted:
-                    continue
-                    
-                chunk_start = self.current_frame
-                chunk_end = chunk_start + frames
-                
-                if chunk_start < len(track.data):
-                    chunk = track.data[chunk_start:chunk_end]
-                    if len(chunk) < frames:
-                        chunk = np.pad(chunk, ((0, frames - len(chunk)), (0, 0)))
-                    mixed += chunk * track.volume
-            
-            if np.max(np.abs(mixed)) > 1.0:
-                mixed /= np.max(np.abs(mixed))
+                track.clips.shift(after_frame, frames)
+        self._measure_length()
+
+    def remove_clip(self, track_id: int, clip_id: int):
+        """Remove a clip from a track"""
+        if track_id in self.tracks:
+            self.sources.release(self.tracks[track_id].clips.remove(clip_id))
+            self._measure_length()
+
+    def split_clip(self, track_id: int, clip_id: int, frames) -> List[int]:
+        """Cut a clip at one or more timeline frames; returns the new clip IDs"""
+        if track_id in self.tracks:
+            return self.tracks[track_id].clips.split(clip_id, frames).tolist()
+        return []
+
+    def trim_clip(self, track_id: int, clip_id: int, start: Optional[int] = None,
+                  end: Optional[int] = None):
+        """Move a clip's edges without moving its audio, see ClipTable.trim"""
+        if track_id in self.tracks:
+            self.tracks[track_id].clips.trim(clip_id, start, end)
+            self._measure_length()
+
+    def slip_clip(self, track_id: int, clip_id: int, frames: int):
+        """Move a clip's audio by `frames` inside its unchanged edges"""
+        if track_id in self.tracks:
+            self.tracks[track_id].clips.slip(clip_id, frames)
+
+    def set_clip_gain(self, track_id: int, clip_id: int, gain: float):
+        if track_id in self.tracks:
+            self.tracks[track_id].clips.set_gain(clip_id, gain)
+
+    def set_clip_fades(self, track_id: int, clip_id: int, fade_in: Optional[int] = None,
+                       fade_out: Optional[int] = None, curve: Optional[int] = None):
+        """Set a clip's fade lengths in frames and/or its FADE_* curve"""
+        if track_id in self.tracks:
+            self.tracks[track_id].clips.set_fades(clip_id, fade_in, fade_out, curve)
                 
-            outdata[:] = mixed
-            self.current_frame += frames
\ No newline at end of file
+    def _audio_callback(self, outdata, frames, time, status):
+        started = perf_counter_ns()
+        if status:
+            self.meter.record_status(status)
+            # Never the logging module here: it takes locks and may do I/O
+            realtime_log.warning("Audio callback status: %s", status)
+
+        while self._commands:
+            command, value = self._commands.popleft()
+            if command == "seek":
+                self.current_frame = value
+                self.mixer.reset()
+
+        if not self.playing:
+            outdata.fill(0)
+            return
+
+        # Leave half the block period for the master stage and the device
+        deadline = perf_counter() + 0.5 * frames / self.sample_rate
+        frame = self.current_frame
+        with span("mix", frame=frame):
+            self.mixer.render(outdata, self._track_states, frame, frames,
+                              deadline=deadline)
+        self.current_frame += frames
+
+        # Only the output latency carries over from the stream's clock; the
+        # limiter's look-ahead delays `frame` further by mixer.latency frames
+        latency = max(0.0, time.outputBufferDacTime - time.currentTime) if time else 0.0
+        latency += self.mixer.latency / self.sample_rate
+        self.transport.publish(TransportState(True, frame, frames, started * 1e-9 + latency,
+                                              self.sample_rate))
+        if frame < self._length <= self.current_frame:
+            self.transport.post(ENDED, self._length)
+        self.meter.record(perf_counter_ns() - started, frames, self.sample_rate,
+                          self.mixer.track_ns)
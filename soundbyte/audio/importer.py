@@ -0,0 +1,132 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition, Lock
+from typing import Callable, Dict, Iterable, List, Optional
+import logging
+
+from .trace import span
+
+logger = logging.getLogger(__name__)
+
+
+class ClipImporter:
+    """
+    Import audio files as clips without blocking the caller.
+
+    `submit` places every clip at once from its file's header, see
+    `AudioEngine.place_clip`, and queues the slow part on a thread pool:
+    decoding, converting to float32 at the session rate, and building the
+    waveform overview when a `PeakCache` is given. A file dropped several
+    times is decoded once. Callbacks run on the worker threads.
+
+    A clip whose audio fails to decode stays in place, silent, and the
+    failure is reported through `take_errors`.
+    """
+
+    def __init__(self, engine, peak_cache=None, max_workers: Optional[int] = None,
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 on_loaded: Optional[Callable[[int, int], None]] = None):
+        self.engine = engine
+        self.peak_cache = peak_cache
+        # Called with (files done, files queued) in the current batch
+        self.on_progress = on_progress
+        # Called with (track_id, clip_id) once a clip plays its audio
+        self.on_loaded = on_loaded
+        self.errors: List[str] = []
+        self._lock = Lock()
+        # Notified whenever a batch completes
+        self._idle = Condition(self._lock)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="soundbyte-import")
+        # Decode job per source, shared by every clip of the same file
+        self._jobs: Dict[int, Future] = {}
+        self._completed = 0
+        self._total = 0
+
+    def submit(self, track_id: int, paths: Iterable[str], start_frame: int = 0) -> List[int]:
+        """
+        Place clips for `paths` end to end on a track from `start_frame` and
+        queue their audio for loading
+
+        Returns:
+            IDs of the clips placed; files whose header cannot be read are
+            skipped, counted as done and reported through `take_errors`
+        """
+        paths = list(paths)
+        with self._lock:
+            self._total += len(paths)
+
+        placed = []
+        position = start_frame
+        for path in paths:
+            clip_id = self.engine.place_clip(track_id, path, position)
+            if clip_id is None:
+                self._error(f"Failed to import {path}")
+                self._advance()
+                continue
+            clips = self.engine.tracks[track_id].clips
+            row = clips.row(clip_id)
+            position += int(clips.columns.length[row])
+            placed.append((clip_id, int(clips.columns.source[row]), path))
+
+        # Queued once everything is placed, so decoding does not hold up placement
+        for clip_id, source_id, path in placed:
+            with self._lock:
+                job = self._jobs.get(source_id)
+                if job is None:
+                    job = self._pool.submit(self._load, source_id, path)
+                    self._jobs[source_id] = job
+            job.add_done_callback(
+                lambda job, clip_id=clip_id, path=path: self._finished(track_id, clip_id,
+                                                                       path, job))
+        return [clip_id for clip_id, _, _ in placed]
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return self._completed < self._total
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Block until every queued file is loaded and return the errors"""
+        with self._idle:
+            self._idle.wait_for(lambda: self._completed == self._total, timeout)
+        return self.take_errors()
+
+    def take_errors(self) -> List[str]:
+        """Return the errors reported so far and clear them"""
+        with self._lock:
+            errors, self.errors = self.errors, []
+        return errors
+
+    def shutdown(self):
+        """Drop the files still queued; the running ones finish in the background"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _error(self, message: str):
+        with self._lock:
+            self.errors.append(message)
+
+    def _load(self, source_id: int, path: str):
+        with span("import", path=path):
+            self.engine.load_clip_source(source_id)
+            if self.peak_cache is not None:
+                self.peak_cache.build(path)
+
+    def _finished(self, track_id: int, clip_id: int, path: str, job: Future):
+        error = None if job.cancelled() else job.exception()
+        if error is not None:
+            logger.warning("Failed to import %s: %s", path, error)
+            self._error(f"Failed to import {path}: {error}")
+        elif not job.cancelled() and self.on_loaded:
+            self.on_loaded(track_id, clip_id)
+        self._advance()
+
+    def _advance(self):
+        with self._lock:
+            self._completed += 1
+            progress = (self._completed, self._total)
+            if self._completed == self._total:
+                # Batch done; the next drop counts from zero
+                self._completed = self._total = 0
+                self._idle.notify_all()
+        if self.on_progress:
+            self.on_progress(*progress)
@@ -0,0 +1,276 @@
+import soundfile as sf
+import numpy as np
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Tuple
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+# Environment overrides for where decoded and resampled audio is kept
+CACHE_DIR_ENV = "SOUNDBYTE_CACHE_DIR"
+CACHE_BYTES_ENV = "SOUNDBYTE_CACHE_BYTES"
+
+DEFAULT_CACHE_BYTES = 4 << 30
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> (numpy dtype, scale to [-1.0, 1.0))
+_MAPPABLE = {
+    (_WAVE_FORMAT_PCM, 16): ('<i2', 1.0 / 2 ** 15),
+    (_WAVE_FORMAT_PCM, 32): ('<i4', 1.0 / 2 ** 31),
+    (_WAVE_FORMAT_IEEE_FLOAT, 32): ('<f4', 1.0),
+    (_WAVE_FORMAT_IEEE_FLOAT, 64): ('<f8', 1.0),
+}
+
+
+class LoadedAudio(NamedTuple):
+    """
+    Memory-mapped samples of shape (frames, channels).
+
+    `data` may hold integer PCM; multiply by `scale` to get float samples.
+    """
+    data: np.ndarray
+    sample_rate: int
+    scale: float
+
+
+class WavLayout(NamedTuple):
+    format_tag: int
+    channels: int
+    sample_rate: int
+    bits: int
+    data_offset: int
+    data_size: int
+
+
+def parse_wav(file_path: str) -> Optional[WavLayout]:
+    """Locate the fmt and data chunks of a RIFF/WAVE file, or None if not WAV"""
+    with open(file_path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return None
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                body = f.read(size)
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack(
+                    '<HHIIHH', body[:16])
+                if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    # First two bytes of the SubFormat GUID hold the real tag
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (format_tag, channels, sample_rate, bits)
+                if size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    return None
+                return WavLayout(*fmt, data_offset=f.tell(), data_size=size)
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)
+
+
+def map_wav(file_path: str) -> Optional[LoadedAudio]:
+    """Memory-map the data chunk of an uncompressed WAV, or None if unsupported"""
+    layout = parse_wav(file_path)
+    if layout is None:
+        return None
+    mappable = _MAPPABLE.get((layout.format_tag, layout.bits))
+    if mappable is None:
+        return None
+
+    dtype, scale = mappable
+    frame_bytes = layout.channels * layout.bits // 8
+    # Truncated files report a data size larger than what is on disk
+    available = os.path.getsize(file_path) - layout.data_offset
+    frames = min(layout.data_size, available) // frame_bytes
+    if frames == 0:
+        data = np.zeros((0, layout.channels), dtype=dtype)
+    else:
+        data = np.memmap(file_path, dtype=dtype, mode='r',
+                         offset=layout.data_offset,
+                         shape=(frames, layout.channels))
+    return LoadedAudio(data, layout.sample_rate, scale)
+
+
+# (real path, size, mtime_ns) -> content hash of the files hashed so far
+_hashes: Dict[Tuple[str, int, int], str] = {}
+_hashes_lock = Lock()
+
+
+def content_hash(file_path: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Hash of the file contents, used as the decode cache key.
+
+    Hashing reads the whole file, so the result is remembered against the
+    file's size and modification time, in memory and, given `cache_dir`,
+    on disk for later sessions; the file is only read again once it changes.
+    """
+    st = os.stat(file_path)
+    stat_key = (os.path.realpath(file_path), st.st_size, st.st_mtime_ns)
+    with _hashes_lock:
+        known = _hashes.get(stat_key)
+    if known is not None:
+        return known
+
+    memo_path = None
+    if cache_dir is not None:
+        name = hashlib.blake2b(repr(stat_key).encode(), digest_size=20).hexdigest()
+        memo_path = os.path.join(cache_dir, 'hashes', name)
+        try:
+            with open(memo_path) as f:
+                known = f.read(64).strip() or None
+        except OSError:
+            pass
+
+    if known is None:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        known = digest.hexdigest()
+        if memo_path is not None:
+            try:
+                os.makedirs(os.path.dirname(memo_path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(memo_path))
+                with os.fdopen(fd, 'w') as f:
+                    f.write(known)
+                os.replace(tmp_path, memo_path)
+            except OSError:
+                # Only costs a rehash next session
+                pass
+
+    with _hashes_lock:
+        _hashes[stat_key] = known
+    return known
+
+
+def default_cache_dir() -> str:
+    """$SOUNDBYTE_CACHE_DIR, or ~/.cache/soundbyte when unset"""
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "soundbyte")
+
+
+def cache_budget() -> int:
+    """Bytes the cache may hold: $SOUNDBYTE_CACHE_BYTES, or DEFAULT_CACHE_BYTES"""
+    return int(os.environ.get(CACHE_BYTES_ENV) or DEFAULT_CACHE_BYTES)
+
+
+def cache_hit(cache_path: str) -> bool:
+    """
+    Whether `cache_path` is cached, marking it as just used if so.
+
+    The modification time doubles as the last use, since access times are
+    often not kept; `trim_cache` evicts by it.
+    """
+    try:
+        os.utime(cache_path)
+    except OSError:
+        return False
+    return True
+
+
+def trim_cache(cache_dir: str, max_bytes: Optional[int] = None, keep: Optional[str] = None):
+    """
+    Evict the least recently used `.npy` entries until the cache fits `max_bytes`.
+
+    `keep`, the entry just written, is never evicted, even on its own over
+    budget. Entries still mapped elsewhere stay readable there on POSIX;
+    where they cannot be removed they are skipped.
+    """
+    if max_bytes is None:
+        max_bytes = cache_budget()
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.npy') and entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    keep = keep and os.path.abspath(keep)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if os.path.abspath(path) == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def decode_cached(file_path: str, cache_dir: Optional[str] = None) -> LoadedAudio:
+    """
+    Decode a file to float32 once and memory-map the cached result.
+
+    The cache file is named after the content hash, so renamed or copied
+    sources share an entry and edited sources get a new one. `cache_dir`
+    defaults to `default_cache_dir()` and is kept within `cache_budget()`.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    info = sf.info(file_path)
+    cache_path = os.path.join(cache_dir, content_hash(file_path, cache_dir) + '.npy')
+
+    if not cache_hit(cache_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.npy', dir=cache_dir)
+        os.close(fd)
+        try:
+            with sf.SoundFile(file_path) as f:
+                out = np.lib.format.open_memmap(
+                    tmp_path, mode='w+', dtype=np.float32,
+                    shape=(f.frames, f.channels))
+                # Decode block by block so large files never sit in RAM whole
+                pos = 0
+                for block in f.blocks(blocksize=1 << 16, dtype='float32',
+                                      always_2d=True):
+                    out[pos:pos + len(block)] = block
+                    pos += len(block)
+                out.flush()
+                del out
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        trim_cache(cache_dir, keep=cache_path)
+
+    data = np.load(cache_path, mmap_mode='r')
+    return LoadedAudio(data, info.samplerate, 1.0)
+
+
+def load_audio(file_path: str, cache_dir: Optional[str] = None) -> LoadedAudio:
+    """
+    Load an audio file without copying it into process memory.
+
+    Uncompressed 16/32-bit integer and float WAVs are mapped in place.
+    Everything else (24-bit PCM, FLAC, OGG, MP3, ...) is decoded once into
+    a float32 cache file under `cache_dir` and mapped from there.
+    """
+    return map_wav(file_path) or decode_cached(file_path, cache_dir)
+
+
+def copy_on_write(data: np.ndarray) -> np.ndarray:
+    """
+    A writable version of `data` that never writes through to its file.
+
+    Read-only memory maps are remapped privately (mode 'c'): the OS copies
+    a page only when it is first written, so editing a few seconds of a
+    long track costs those pages, not the whole file. Other read-only
+    arrays are copied; writable arrays are returned as they are.
+    """
+    if data.flags.writeable:
+        return data
+    # Only a whole map's `offset` is its own; slices report their parent's
+    if isinstance(data, np.memmap) and isinstance(data.base, mmap.mmap):
+        return np.memmap(data.filename, dtype=data.dtype, mode='c',
+                         offset=data.offset, shape=data.shape)
+    return data.copy()
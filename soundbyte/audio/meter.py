@@ -0,0 +1,128 @@
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional
+import csv
+import json
+
+DEFAULT_CAPACITY = 2048
+
+
+class MeterReading(NamedTuple):
+    """Summary of recent audio callbacks, see `AudioMeter.reading`"""
+    callbacks: int
+    # Mean and worst callback time over the window, as % of the block budget
+    load_percent: float
+    peak_load_percent: float
+    underflows: int
+    overflows: int
+    # Track ID -> share of the window's mixing time spent on it, in %
+    track_percent: Dict[int, float]
+
+
+class AudioMeter:
+    """
+    Timing of the audio callback, written only by the audio thread.
+
+    Each callback's wall time and budget (`frames / sample_rate`) go into
+    preallocated ring buffers: the slot is written first and the `written`
+    counter bumped after, so readers on other threads never need a lock and
+    at worst see one slot being overwritten. The mixer's per-track timings
+    of each block are kept in the same ring, so they cover the same window.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.wall_ns = np.zeros(capacity, dtype=np.int64)
+        self.budget_ns = np.zeros(capacity, dtype=np.int64)
+        self.written = 0
+        self.underflows = 0
+        self.overflows = 0
+        # Track ID -> ns per callback; the dicts are never written once stored
+        self.track_ns: List[Optional[Dict[int, int]]] = [None] * capacity
+
+    def record(self, wall_ns: int, frames: int, sample_rate: int,
+               track_ns: Optional[Dict[int, int]] = None):
+        """
+        Store one callback; called from the audio thread
+
+        Args:
+            track_ns: The block's mixing time per track ID, which the caller
+                must not modify afterwards
+        """
+        slot = self.written % self.capacity
+        self.wall_ns[slot] = wall_ns
+        self.budget_ns[slot] = frames * 1_000_000_000 // sample_rate
+        self.track_ns[slot] = track_ns
+        self.written += 1
+
+    def record_status(self, status):
+        """Count the xrun flags of a sounddevice CallbackFlags"""
+        if getattr(status, 'output_underflow', False) or getattr(status, 'input_underflow', False):
+            self.underflows += 1
+        if getattr(status, 'output_overflow', False) or getattr(status, 'input_overflow', False):
+            self.overflows += 1
+
+    def _slots(self, count: int = None) -> np.ndarray:
+        written = self.written
+        count = min(count or self.capacity, written, self.capacity)
+        return np.arange(written - count, written) % self.capacity
+
+    def history(self, count: int = None):
+        """(wall_ns, budget_ns) arrays of the last `count` callbacks, oldest first"""
+        slots = self._slots(count)
+        return self.wall_ns[slots], self.budget_ns[slots]
+
+    def track_time(self, count: int = None) -> Dict[int, int]:
+        """Mixing time per track ID over the last `count` callbacks, in ns"""
+        total: Dict[int, int] = {}
+        for slot in self._slots(count).tolist():
+            for track_id, ns in (self.track_ns[slot] or {}).items():
+                total[track_id] = total.get(track_id, 0) + ns
+        return total
+
+    def reading(self, window: int = 64) -> MeterReading:
+        """Load over the last `window` callbacks plus the running counters"""
+        wall, budget = self.history(window)
+        if len(wall):
+            load = 100.0 * wall / np.maximum(budget, 1)
+            mean, peak = float(load.mean()), float(load.max())
+        else:
+            mean = peak = 0.0
+        track_ns = self.track_time(window)
+        total = sum(track_ns.values()) or 1
+        return MeterReading(self.written, mean, peak, self.underflows, self.overflows,
+                            {track_id: 100.0 * ns / total for track_id, ns in track_ns.items()})
+
+    def reset(self):
+        self.written = 0
+        self.underflows = 0
+        self.overflows = 0
+        self.track_ns = [None] * self.capacity
+
+    def dump(self, path: str):
+        """
+        Write the callback history to `path`: CSV if it ends in .csv, JSON
+        (history, counters and per-track time over the history) otherwise
+        """
+        wall, budget = self.history()
+        first = self.written - len(wall)
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['callback', 'wall_ns', 'budget_ns', 'load_percent'])
+                for i, (w, b) in enumerate(zip(wall.tolist(), budget.tolist())):
+                    writer.writerow([first + i, w, b, round(100.0 * w / max(b, 1), 2)])
+            return
+
+        reading = self.reading(len(wall))
+        with open(path, 'w') as f:
+            json.dump({
+                'callbacks': reading.callbacks,
+                'underflows': reading.underflows,
+                'overflows': reading.overflows,
+                'load_percent': reading.load_percent,
+                'peak_load_percent': reading.peak_load_percent,
+                'track_ns': {str(k): v for k, v in self.track_time(len(wall)).items()},
+                'first_callback': first,
+                'wall_ns': wall.tolist(),
+                'budget_ns': budget.tolist(),
+            }, f, indent=4)
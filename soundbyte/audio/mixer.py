@@ -0,0 +1,242 @@
+import numpy as np
+from time import perf_counter_ns
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .automation import Envelope
+from .dynamics import Limiter
+from .meter import AudioMeter
+from .session import ClipSpan, ClipTable, fade_shape
+
+
+class TrackState(NamedTuple):
+    """Immutable view of a track as seen by the audio thread"""
+    data: np.ndarray
+    volume: float
+    clips: ClipTable
+    # Applied to `data` only; integer PCM tracks are mixed without a copy
+    scale: float = 1.0
+    # Multiplied into `volume` frame by frame, e.g. fader ramps and automation
+    envelopes: Tuple[Envelope, ...] = ()
+    # Engine track ID, for per-track timing
+    track_id: int = -1
+
+
+class BusState(NamedTuple):
+    """Tracks summed into one sub-mix, which is then mixed like a track"""
+    tracks: Tuple[TrackState, ...]
+    volume: float
+    envelopes: Tuple[Envelope, ...] = ()
+
+
+class Mixer:
+    """
+    Block mixer used by the real-time callback.
+
+    Scratch buffers are allocated once and reused for every block, and all
+    arithmetic is done in place, so rendering a block does not allocate
+    sample memory.
+
+    The master bus runs through a look-ahead `Limiter`, which delays the
+    output by `latency` frames. Pass `limit=False` for a plain sum.
+    """
+
+    def __init__(self, channels: int, max_frames: int, sample_rate: int = 44100,
+                 limit: bool = True):
+        self.channels = channels
+        self.limiter = Limiter(channels, sample_rate, max_frames=max_frames) if limit else None
+        # Set to time every track's share of mix_tracks
+        self.meter: Optional[AudioMeter] = None
+        # Track ID -> ns spent on it by the last mix_tracks, while metered.
+        # A new dict each block, only written by the thread mixing it
+        self.track_ns: Dict[int, int] = {}
+        self._mix = np.zeros((max_frames, channels), dtype=np.float32)
+        self._scratch = np.zeros((max_frames, channels), dtype=np.float32)
+        self._stream = np.zeros((max_frames, channels), dtype=np.float32)
+        self._bus = np.zeros((max_frames, channels), dtype=np.float32)
+        self._allocate_gain(max_frames)
+
+    def _allocate_gain(self, frames: int):
+        self._gain = np.zeros((frames, 1), dtype=np.float32)
+        self._envelope = np.zeros((frames, 1), dtype=np.float32)
+        self._fade = np.zeros((frames, 1), dtype=np.float32)
+        self._offsets = np.arange(frames, dtype=np.float32).reshape(-1, 1)
+
+    @property
+    def max_frames(self) -> int:
+        return len(self._mix)
+
+    @property
+    def latency(self) -> int:
+        """Frames the master stage delays the output by"""
+        return self.limiter.latency if self.limiter else 0
+
+    def reset(self):
+        """Clear the master stage's history, e.g. after a seek"""
+        if self.limiter:
+            self.limiter.reset()
+
+    def shutdown(self):
+        """Release worker threads; this mixer runs on the caller's thread only"""
+
+    def reserve(self, frames: int):
+        """Grow the scratch buffers so blocks of `frames` fit without allocating"""
+        if frames > self.max_frames:
+            self._mix = np.zeros((frames, self.channels), dtype=np.float32)
+            self._scratch = np.zeros((frames, self.channels), dtype=np.float32)
+            self._stream = np.zeros((frames, self.channels), dtype=np.float32)
+            self._bus = np.zeros((frames, self.channels), dtype=np.float32)
+            self._allocate_gain(frames)
+            if self.limiter:
+                self.limiter.reserve(frames)
+
+    def render(self, outdata: np.ndarray, tracks: Sequence[Union[TrackState, BusState]],
+               start_frame: int, frames: int, deadline: float = None):
+        """
+        Mix `frames` frames of `tracks` starting at `start_frame` into `outdata`
+
+        Args:
+            outdata: Output buffer of shape (frames, channels)
+            tracks: Snapshot of the audible tracks and buses
+            start_frame: Timeline position of the first frame
+            frames: Number of frames to render
+            deadline: Unused by the serial mixer, see ParallelMixer
+        """
+        mix = self.mix_tracks(tracks, start_frame, frames)
+        self.master(outdata, mix)
+
+    def mix_tracks(self, tracks: Sequence[Union[TrackState, BusState]],
+                   start_frame: int, frames: int) -> np.ndarray:
+        """
+        Sum `tracks` into this mixer's master buffer; each bus is summed
+        once into a sub-mix and added like a single track
+
+        Returns:
+            View of the master buffer holding the (frames, channels) sum
+        """
+        self.reserve(frames)
+        if self.meter is not None:
+            self.track_ns = {}
+        mix = self._mix[:frames]
+        mix.fill(0)
+        for track in tracks:
+            if isinstance(track, BusState):
+                bus = self._bus[:frames]
+                bus.fill(0)
+                for routed in track.tracks:
+                    self._add_track(bus, routed, start_frame, frames)
+                volume, gain = self._track_gain(track, start_frame, frames)
+                self._add(mix, self._scratch, 0, bus, volume, gain)
+            else:
+                self._add_track(mix, track, start_frame, frames)
+        return mix
+
+    def _add_track(self, mix: np.ndarray, track: TrackState, start_frame: int,
+                   frames: int):
+        if self.meter is None:
+            self._mix_track(mix, track, start_frame, frames)
+        else:
+            started = perf_counter_ns()
+            self._mix_track(mix, track, start_frame, frames)
+            track_ns = self.track_ns
+            track_ns[track.track_id] = (track_ns.get(track.track_id, 0) +
+                                        perf_counter_ns() - started)
+
+    def _mix_track(self, mix: np.ndarray, track: TrackState, start_frame: int,
+                   frames: int):
+        """Accumulate one track's audio and clips into `mix`"""
+        scratch = self._scratch
+        end_frame = start_frame + frames
+        volume, gain = self._track_gain(track, start_frame, frames)
+        data = track.data
+        if start_frame < len(data):
+            if isinstance(data, np.ndarray):
+                chunk = data[start_frame:end_frame]
+            else:
+                # Streamed from disk: copy out of the read-ahead ring
+                chunk = self._stream[:frames]
+                data.read_into(chunk, start_frame, frames)
+            self._add(mix, scratch, 0, chunk, volume * track.scale, gain)
+
+        for entry in track.clips.overlapping(start_frame, end_frame):
+            offset = max(start_frame, entry.start)
+            n = min(end_frame, entry.end) - offset
+            dst = offset - start_frame
+            # Position within the clip, and within its source
+            pos = offset - entry.start
+            src = entry.offset + pos
+            clip_gain = gain
+            if pos < entry.fade_in or pos + n > entry.end - entry.start - entry.fade_out:
+                clip_gain = self._fade_gain(entry, dst, pos, n, gain)
+            self._add(mix, scratch, dst, entry.data[src:src + n], volume * entry.gain,
+                      clip_gain)
+
+    def _fade_gain(self, entry: ClipSpan, dst: int, pos: int, n: int,
+                   gain: Optional[np.ndarray]) -> np.ndarray:
+        """
+        The block's per-frame gain with a clip's fades multiplied in, for
+        clip frames [pos, pos+n) landing at block row `dst`
+        """
+        fade = self._fade[dst:dst + n]
+        if gain is None:
+            fade.fill(1.0)
+        else:
+            fade[:] = gain[dst:dst + n]
+        if pos < entry.fade_in:
+            stop = min(pos + n, entry.fade_in)
+            fade[:stop - pos] *= fade_shape(entry.curve, entry.fade_in)[pos:stop]
+        fade_start = entry.end - entry.start - entry.fade_out
+        if entry.fade_out and pos + n > fade_start:
+            first = max(pos, fade_start)
+            shape = fade_shape(entry.curve, entry.fade_out)[::-1]
+            fade[first - pos:] *= shape[first - fade_start:pos + n - fade_start]
+        return self._fade
+
+    def _track_gain(self, track: Union[TrackState, BusState], start_frame: int,
+                    frames: int) -> Tuple[float, Optional[np.ndarray]]:
+        """
+        Evaluate a track's envelopes for one block
+
+        Returns:
+            (volume, gain): the constant part of the track's gain, and a
+            (frames, 1) per-frame gain if any envelope moves in this block
+        """
+        volume = track.volume
+        gain = None
+        for envelope in track.envelopes:
+            target = self._envelope if gain is not None else self._gain
+            value = envelope.evaluate(start_frame, frames, target, self._offsets)
+            if not isinstance(value, np.ndarray):
+                volume *= value
+            elif gain is None:
+                gain = value
+            else:
+                np.multiply(gain, value, out=gain)
+        return volume, gain
+
+    def master(self, outdata: np.ndarray, mix: np.ndarray):
+        """Apply the master bus stage to a summed block and write it out"""
+        if self.limiter:
+            self.limiter.process(mix, outdata)
+        else:
+            outdata[:] = mix
+
+    @staticmethod
+    def _add(mix, scratch, dst: int, chunk: np.ndarray, volume: float,
+             gain: Optional[np.ndarray] = None):
+        """
+        Accumulate `chunk * volume` into `mix` at row `dst`, times the
+        per-frame `gain` of the block if there is one
+        """
+        n = len(chunk)
+        target = mix[dst:dst + n]
+        # Mono sources are stored as (frames, 1) and broadcast here
+        if gain is not None:
+            np.multiply(chunk, gain[dst:dst + n], out=scratch[:n])
+            if volume != 1.0:
+                np.multiply(scratch[:n], volume, out=scratch[:n])
+            np.add(target, scratch[:n], out=target)
+        elif volume == 1.0:
+            np.add(target, chunk, out=target)
+        else:
+            np.multiply(chunk, volume, out=scratch[:n])
+            np.add(target, scratch[:n], out=target)
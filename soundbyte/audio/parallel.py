@@ -0,0 +1,119 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Sequence
+import os
+import time
+
+from .mixer import Mixer, TrackState
+
+
+class ParallelMixer:
+    """
+    Mixer that spreads tracks across a thread pool.
+
+    Tracks are dealt round-robin into one group per worker. Each group is
+    summed into its own bus buffer by a private `Mixer`, so workers never
+    share scratch memory, and the calling thread then adds the buses into
+    the master and applies the master stage. NumPy releases the GIL inside
+    the per-track ufuncs, so large blocks scale with the number of cores.
+
+    The calling thread always renders the first group itself. With a
+    `deadline`, groups the pool has not started by then are cancelled and
+    rendered inline instead, so a saturated pool degrades to serial mixing
+    rather than an xrun. `late_blocks` counts blocks that needed this
+    fallback.
+    """
+
+    def __init__(self, channels: int, max_frames: int, threads: int = None,
+                 min_tracks_per_thread: int = 8, sample_rate: int = 44100,
+                 limit: bool = True):
+        self.channels = channels
+        self.threads = max(1, threads or os.cpu_count() or 1)
+        self.min_tracks_per_thread = min_tracks_per_thread
+        # Only the main mixer's master stage runs; groups just sum tracks
+        self._main = Mixer(channels, max_frames, sample_rate, limit)
+        self._groups = [Mixer(channels, max_frames, limit=False)
+                        for _ in range(self.threads)]
+        self._pool = ThreadPoolExecutor(max_workers=self.threads - 1,
+                                        thread_name_prefix="soundbyte-mix") \
+            if self.threads > 1 else None
+        self.late_blocks = 0
+        # Track ID -> ns of the last block, folded from the groups' timings
+        self.track_ns: Dict[int, int] = {}
+
+    @property
+    def max_frames(self) -> int:
+        return self._main.max_frames
+
+    @property
+    def latency(self) -> int:
+        return self._main.latency
+
+    @property
+    def meter(self):
+        return self._main.meter
+
+    @meter.setter
+    def meter(self, meter):
+        # Each group times its own tracks; render folds them into track_ns
+        for mixer in [self._main] + self._groups:
+            mixer.meter = meter
+
+    def reset(self):
+        self._main.reset()
+
+    def reserve(self, frames: int):
+        self._main.reserve(frames)
+        for mixer in self._groups:
+            mixer.reserve(frames)
+
+    def render(self, outdata: np.ndarray, tracks: Sequence[TrackState],
+               start_frame: int, frames: int, deadline: float = None):
+        """
+        Mix a block like `Mixer.render`, in parallel when it is worth it
+
+        Args:
+            deadline: Optional `time.perf_counter()` value by which pool
+                work must have started; later groups are rendered inline
+        """
+        groups = min(self.threads, len(tracks) // self.min_tracks_per_thread)
+        if groups <= 1:
+            self._main.render(outdata, tracks, start_frame, frames)
+            self.track_ns = self._main.track_ns
+            return
+
+        futures = [
+            self._pool.submit(self._groups[i].mix_tracks, tracks[i::groups],
+                              start_frame, frames)
+            for i in range(1, groups)
+        ]
+        mix = self._groups[0].mix_tracks(tracks[0::groups], start_frame, frames)
+        master = self._main.mix_tracks((), start_frame, frames)
+        np.add(master, mix, out=master)
+
+        timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        _, pending = wait(futures, timeout=timeout)
+        if pending:
+            self.late_blocks += 1
+
+        for i, future in enumerate(futures, start=1):
+            if future in pending and future.cancel():
+                mix = self._groups[i].mix_tracks(tracks[i::groups], start_frame, frames)
+            else:
+                # Already running on a worker; it owns the group's buffer
+                mix = future.result()
+            np.add(master, mix, out=master)
+
+        if self.meter is not None:
+            # Every group is done, so their timings are complete; groups
+            # hold different tracks, so no entry is summed twice
+            track_ns = {}
+            for mixer in self._groups[:groups]:
+                track_ns.update(mixer.track_ns)
+            self.track_ns = track_ns
+        self._main.master(outdata, master)
+
+    def shutdown(self):
+        """Stop the worker threads, waiting for a block in progress"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,231 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import os
+
+from .loader import load_audio
+
+logger = logging.getLogger(__name__)
+
+BASE_BIN = 256
+LEVEL_FACTOR = 4
+# Frames reduced per step while building, keeps memory flat for long files
+_BUILD_CHUNK = BASE_BIN * 4096
+_SIDECAR_SUFFIX = '.peaks.npz'
+
+
+class PeakPyramid:
+    """
+    Min/max waveform overview of one audio source at several resolutions.
+
+    Level 0 holds one (min, max) pair per 256 frames, each following level
+    reduces the previous one by 4 (1024, 4096, ... frames per bin) until a
+    level has a single bin. Channels are folded together.
+    """
+
+    def __init__(self, sample_rate: int, frames: int,
+                 levels: List[Tuple[np.ndarray, np.ndarray]]):
+        self.sample_rate = sample_rate
+        self.frames = frames
+        self.levels = levels
+
+    @staticmethod
+    def bin_size(level: int) -> int:
+        return BASE_BIN * LEVEL_FACTOR ** level
+
+    @classmethod
+    def build(cls, data: np.ndarray, sample_rate: int, scale: float = 1.0) -> "PeakPyramid":
+        """Reduce (frames, channels) samples into a pyramid"""
+        frames = len(data)
+        bins = -(-frames // BASE_BIN)
+        mins = np.zeros(bins, dtype=np.float32)
+        maxs = np.zeros(bins, dtype=np.float32)
+
+        for start in range(0, frames, _BUILD_CHUNK):
+            chunk = np.asarray(data[start:start + _BUILD_CHUNK])
+            if chunk.ndim == 1:
+                chunk = chunk[:, None]
+            full = len(chunk) // BASE_BIN
+            b = start // BASE_BIN
+            if full:
+                blocks = chunk[:full * BASE_BIN].reshape(full, -1)
+                mins[b:b + full] = blocks.min(axis=1)
+                maxs[b:b + full] = blocks.max(axis=1)
+            if len(chunk) % BASE_BIN:
+                tail = chunk[full * BASE_BIN:]
+                mins[b + full] = tail.min()
+                maxs[b + full] = tail.max()
+
+        if scale != 1.0:
+            mins *= scale
+            maxs *= scale
+
+        levels = [(mins, maxs)]
+        while len(levels[-1][0]) > 1:
+            mins, maxs = levels[-1]
+            pad = -len(mins) % LEVEL_FACTOR
+            if pad:
+                mins = np.concatenate((mins, np.repeat(mins[-1:], pad)))
+                maxs = np.concatenate((maxs, np.repeat(maxs[-1:], pad)))
+            levels.append((mins.reshape(-1, LEVEL_FACTOR).min(axis=1),
+                           maxs.reshape(-1, LEVEL_FACTOR).max(axis=1)))
+        return cls(sample_rate, frames, levels)
+
+    def level_for(self, frames_per_pixel: float) -> int:
+        """Finest level whose bins are at least one pixel wide"""
+        for level in range(len(self.levels)):
+            if self.bin_size(level) >= frames_per_pixel:
+                return level
+        return len(self.levels) - 1
+
+    def pixels(self, start_frame: float, frames_per_pixel: float,
+               width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Min and max for `width` pixels starting at `start_frame`
+
+        Reads exactly one bin per pixel, so the cost depends on the width in
+        pixels and not on how many frames are on screen.
+        """
+        level = self.level_for(frames_per_pixel)
+        mins, maxs = self.levels[level]
+        if not len(mins):
+            # A zero-length source has no bins to read
+            return mins[:0], maxs[:0]
+        positions = start_frame + np.arange(width) * frames_per_pixel
+        idx = np.clip((positions // self.bin_size(level)).astype(np.int64),
+                      0, len(mins) - 1)
+        return mins[idx], maxs[idx]
+
+    def save(self, path: str, source_stat: os.stat_result):
+        arrays = {}
+        for level, (mins, maxs) in enumerate(self.levels):
+            arrays[f'min{level}'] = mins
+            arrays[f'max{level}'] = maxs
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, sample_rate=self.sample_rate, frames=self.frames,
+                 source_size=source_stat.st_size,
+                 source_mtime=source_stat.st_mtime_ns, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, source_stat: os.stat_result) -> Optional["PeakPyramid"]:
+        """Load a sidecar, or None if it is missing or out of date"""
+        try:
+            with np.load(path) as f:
+                if (int(f['source_size']) != source_stat.st_size or
+                        int(f['source_mtime']) != source_stat.st_mtime_ns):
+                    return None
+                levels = []
+                while f'min{len(levels)}' in f:
+                    level = len(levels)
+                    levels.append((f[f'min{level}'], f[f'max{level}']))
+                return cls(int(f['sample_rate']), int(f['frames']), levels)
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def sidecar_path(file_path: str) -> str:
+    return file_path + _SIDECAR_SUFFIX
+
+
+def _source_version(file_path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of `file_path`, or None if it cannot be read"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def peaks_for_file(file_path: str) -> PeakPyramid:
+    """Load the sidecar next to `file_path`, or build and write it"""
+    st = os.stat(file_path)
+    path = sidecar_path(file_path)
+    peaks = PeakPyramid.load(path, st)
+    if peaks is None:
+        data, sr, scale = load_audio(file_path)
+        peaks = PeakPyramid.build(data, sr, scale)
+        try:
+            peaks.save(path, st)
+        except OSError:
+            # Read-only location; the pyramid is still cached in memory
+            pass
+    return peaks
+
+
+class PeakCache:
+    """
+    In-memory pyramids by file path, built on a background thread.
+
+    `get` never blocks: it returns None and queues a build the first time a
+    file is asked for, then calls `on_ready(path)` from the worker once the
+    pyramid is available. A failed build is only tried again once the file
+    changes.
+    """
+
+    def __init__(self, on_ready: Optional[Callable[[str], None]] = None,
+                 max_workers: int = 2):
+        self.on_ready = on_ready
+        self._peaks: Dict[str, PeakPyramid] = {}
+        self._building = set()
+        # path -> _source_version of the file when its build failed
+        self._failed: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._lock = Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="soundbyte-peaks")
+
+    def get(self, file_path: str) -> Optional[PeakPyramid]:
+        with self._lock:
+            peaks = self._peaks.get(file_path)
+            if peaks is not None or file_path in self._building:
+                return peaks
+        if not self._failed_unchanged(file_path) and self._claim(file_path):
+            self._pool.submit(self._build, file_path)
+        return None
+
+    def build(self, file_path: str) -> Optional[PeakPyramid]:
+        """
+        Build a file's pyramid on the calling thread, e.g. an import worker,
+        unless it is cached, already being built, or failed and is unchanged
+        """
+        if not self._failed_unchanged(file_path) and self._claim(file_path):
+            self._build(file_path)
+        with self._lock:
+            return self._peaks.get(file_path)
+
+    def _failed_unchanged(self, file_path: str) -> bool:
+        """Whether the last build of `file_path` failed and the file is as it was then"""
+        with self._lock:
+            if file_path not in self._failed:
+                return False
+            version = self._failed[file_path]
+        # A stat per get, but only for the files that failed
+        return _source_version(file_path) == version
+
+    def _claim(self, file_path: str) -> bool:
+        """Mark `file_path` as building, unless it is built or being built"""
+        with self._lock:
+            if file_path in self._peaks or file_path in self._building:
+                return False
+            self._building.add(file_path)
+            return True
+
+    def _build(self, file_path: str):
+        # Taken first, so a file that changes mid-build is tried again
+        version = _source_version(file_path)
+        try:
+            peaks = peaks_for_file(file_path)
+        except Exception as e:
+            logger.warning("Failed to build peaks for %s: %s", file_path, e)
+            with self._lock:
+                self._failed[file_path] = version
+                self._building.discard(file_path)
+            return
+        with self._lock:
+            self._peaks[file_path] = peaks
+            self._failed.pop(file_path, None)
+            self._building.discard(file_path)
+        if self.on_ready:
+            self.on_ready(file_path)
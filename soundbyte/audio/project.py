@@ -0,0 +1,355 @@
+import soundfile as sf
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+import tempfile
+
+from .stream import StreamingSource
+from .trace import traced
+
+PROJECT_VERSION = "1.0"
+
+# Subtype that stores each sample dtype of track data without loss
+_SUBTYPES = {'i2': 'PCM_16', 'i4': 'PCM_32', 'f4': 'FLOAT', 'f8': 'DOUBLE'}
+
+
+def read_project(file_path: str) -> dict:
+    """Parse a .sbp project file"""
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+
+def load_tracks(engine, project_data: dict, project_dir: str) -> Tuple[List[int], List[str]]:
+    """
+    Add the tracks and clips described by `project_data` to `engine`
+
+    Args:
+        engine: AudioEngine to populate
+        project_data: Parsed project, see `read_project`
+        project_dir: Directory relative track and clip paths resolve against
+
+    Returns:
+        (track_ids, errors): IDs of the loaded tracks and a message for every
+        track or clip that could not be loaded
+    """
+    track_ids = []
+    errors = []
+
+    buses = _load_buses(engine, project_data)
+    for track in project_data['tracks']:
+        track_path = os.path.join(project_dir, track['file'])
+        if not os.path.exists(track_path):
+            errors.append(f"Track file not found: {track['file']}")
+            continue
+        try:
+            track_id = engine.add_track(track_path, track['name'])
+        except Exception as e:
+            errors.append(f"Failed to load track {track['name']}: {str(e)}")
+            continue
+
+        _apply_track_settings(engine, track_id, track, buses)
+        errors.extend(_load_clips(engine, track_id, track, project_dir))
+        track_ids.append(track_id)
+
+    return track_ids, errors
+
+
+class ProjectLoader:
+    """
+    Open a project's tracks concurrently, playable before they are loaded.
+
+    `open` reads only the file headers, on a thread pool, and adds every
+    track to the engine as a disk-streamed track, so the UI can list the
+    tracks and playback can start straight away. Each track is then mapped
+    (or decoded into the cache) in the background together with its clips
+    and swapped in for the stream once ready, see `AudioEngine.set_track_data`.
+    """
+
+    def __init__(self, engine, project_data: dict, project_dir: str,
+                 max_workers: Optional[int] = None):
+        self.engine = engine
+        self.project_data = project_data
+        self.project_dir = project_dir
+        self.errors: List[str] = []
+        self._errors_lock = Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="soundbyte-load")
+        self._pending = []
+
+    def open(self, on_loaded: Optional[Callable[[int], None]] = None) -> List[int]:
+        """
+        Add every track to the engine and start loading their audio
+
+        Args:
+            on_loaded: Called from a worker thread with the track ID once a
+                track's audio and clips are fully loaded
+
+        Returns:
+            IDs of the tracks added, in project order
+        """
+        entries = self.project_data['tracks']
+        buses = _load_buses(self.engine, self.project_data)
+        paths = [os.path.join(self.project_dir, track['file']) for track in entries]
+        sources = [self._pool.submit(self.engine.open_stream_source, path)
+                   for path in paths]
+
+        track_ids = []
+        for track, path, source in zip(entries, paths, sources):
+            try:
+                track_id = self.engine.add_source_track(source.result(), track['name'])
+            except Exception as e:
+                if not os.path.exists(path):
+                    self._error(f"Track file not found: {track['file']}")
+                else:
+                    self._error(f"Failed to load track {track['name']}: {str(e)}")
+                continue
+
+            _apply_track_settings(self.engine, track_id, track, buses)
+            self._pending.append(self._pool.submit(
+                self._materialise, track_id, track, path, on_loaded))
+            track_ids.append(track_id)
+
+        self._pool.shutdown(wait=False)
+        return track_ids
+
+    def take_errors(self) -> List[str]:
+        """Return the errors reported so far and clear them"""
+        with self._errors_lock:
+            errors, self.errors = self.errors, []
+        return errors
+
+    def _error(self, message: str):
+        with self._errors_lock:
+            self.errors.append(message)
+
+    @property
+    def done(self) -> bool:
+        return all(future.done() for future in self._pending)
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Block until every track is loaded and return the errors"""
+        wait(self._pending, timeout=timeout)
+        return self.take_errors()
+
+    @traced("load")
+    def _materialise(self, track_id: int, track: dict, path: str, on_loaded):
+        try:
+            data, _, scale = self.engine.load_track_audio(path)
+            self.engine.set_track_data(track_id, data, scale)
+        except Exception as e:
+            # Keep streaming from disk; playback still works
+            self._error(f"Failed to map track {track['name']}: {str(e)}")
+
+        for error in _load_clips(self.engine, track_id, track, self.project_dir):
+            self._error(error)
+
+        if on_loaded:
+            on_loaded(track_id)
+
+
+def load_project(file_path: str, engine_factory) -> Tuple[object, List[str]]:
+    """
+    Build an engine for a project file
+
+    Args:
+        file_path: Path to the .sbp file, or a binary .sbpx project
+        engine_factory: Called with sample_rate= to create the engine
+
+    Returns:
+        (engine, errors), see `load_tracks`
+    """
+    # Imported here: the container builds on this module's loaders
+    from .container import is_container, load_container
+    if is_container(file_path):
+        return load_container(file_path, engine_factory)
+
+    project_data = read_project(file_path)
+    engine = engine_factory(sample_rate=project_data.get('sample_rate', 44100))
+    _, errors = load_tracks(engine, project_data, os.path.dirname(file_path))
+    return engine, errors
+
+
+@traced("save")
+def save_project(engine, file_path: str):
+    """
+    Save the project incrementally
+
+    Tracks whose audio is unchanged since it was loaded are saved as a
+    reference to their source file; only dirty tracks (or tracks with no
+    source on disk) are written next to the project, as `track_{id}.wav`
+    or, when another track or clip already uses that file, `track_{id}_{n}.wav`.
+    Every file is written to a temporary name and renamed into place, so a
+    crash mid-save never leaves a truncated project or track behind.
+    """
+    project_dir = os.path.dirname(file_path)
+
+    buses, bus_index = _bus_entries(engine)
+    project_data = {
+        'version': PROJECT_VERSION,
+        'sample_rate': engine.sample_rate,
+        'buses': buses,
+        'tracks': []
+    }
+
+    for track_id, track in engine.tracks.items():
+        if track.dirty or not (track.source_path and os.path.exists(track.source_path)):
+            track_path = _track_file_path(engine, track_id, project_dir)
+            _write_track_audio(track, track_path)
+            track.source_path = os.path.abspath(track_path)
+            track.dirty = False
+
+        track_data = {
+            'name': track.name,
+            'file': _relative_path(track.source_path, project_dir),
+            'volume': track.volume,
+            'muted': track.muted,
+            'solo': track.solo,
+            'output': bus_index.get(track.output),
+            'clips': _clip_entries(engine, track.clips.columns, project_dir)
+        }
+        if len(track.volume_automation):
+            frames, values = track.volume_automation.points
+            track_data['volume_automation'] = {
+                'frames': frames.tolist(),
+                'values': values.tolist(),
+            }
+        project_data['tracks'].append(track_data)
+
+    with _atomic_write(file_path) as tmp_path:
+        with open(tmp_path, 'w') as f:
+            json.dump(project_data, f, indent=4)
+
+
+@contextmanager
+def _atomic_write(path: str):
+    """Yield a temporary path that replaces `path` once the block succeeds"""
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.',
+                                    suffix='.tmp',
+                                    dir=os.path.dirname(path) or os.curdir)
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _bus_entries(engine) -> Tuple[List[dict], Dict[int, int]]:
+    """Saved form of the engine's buses, and bus ID -> index in that list"""
+    entries = []
+    # Saved bus positions, referenced by the tracks' 'output'
+    bus_index = {}
+    for bus_id, bus in engine.buses.items():
+        bus_index[bus_id] = len(entries)
+        entries.append({
+            'name': bus.name,
+            'volume': bus.volume,
+            'muted': bus.muted,
+            'solo': bus.solo,
+        })
+    return entries, bus_index
+
+
+def _load_buses(engine, project_data: dict) -> Dict[int, int]:
+    """Add the project's buses to `engine`, returning saved index -> bus ID"""
+    buses = {}
+    for index, bus in enumerate(project_data.get('buses', [])):
+        bus_id = engine.add_bus(bus['name'])
+        engine.set_bus_volume(bus_id, bus['volume'])
+        engine.set_bus_mute(bus_id, bus['muted'])
+        engine.set_bus_solo(bus_id, bus['solo'])
+        buses[index] = bus_id
+    return buses
+
+
+def _apply_track_settings(engine, track_id: int, track: dict, buses: Dict[int, int]):
+    """Restore a loaded track's mixer settings and automation"""
+    engine.set_track_volume(track_id, track['volume'])
+    _load_automation(engine, track_id, track)
+    if track.get('output') is not None:
+        engine.set_track_output(track_id, buses.get(track['output']))
+    engine.set_track_mute(track_id, track['muted'])
+    engine.set_track_solo(track_id, track['solo'])
+
+
+def _load_automation(engine, track_id: int, track: dict):
+    automation = track.get('volume_automation')
+    if automation:
+        engine.set_volume_automation(track_id, automation['frames'], automation['values'])
+
+
+def _load_clips(engine, track_id: int, track: dict, project_dir: str) -> List[str]:
+    errors = []
+    for clip in track.get('clips', []):
+        clip_path = os.path.join(project_dir, clip['file'])
+        # Projects from before clip edits hold whole files with no fades
+        clip_id = engine.add_clip(track_id, clip_path, clip['start_frame'],
+                                  clip.get('gain', 1.0), clip.get('offset', 0),
+                                  clip.get('length'))
+        if clip_id is None:
+            errors.append(f"Failed to load clip {clip['file']}")
+        elif clip.get('fade_in') or clip.get('fade_out'):
+            engine.set_clip_fades(track_id, clip_id, clip.get('fade_in', 0),
+                                  clip.get('fade_out', 0), clip.get('curve', 0))
+    return errors
+
+
+def _clip_entries(engine, columns, project_dir: str) -> List[dict]:
+    # Relative paths are computed once per source rather than once per clip
+    paths = {source: _relative_path(engine.sources[source].key[0], project_dir)
+             for source in set(columns.source.tolist())}
+    return [
+        {'file': paths[source], 'start_frame': start, 'gain': gain, 'offset': offset,
+         'length': length, 'fade_in': fade_in, 'fade_out': fade_out, 'curve': curve}
+        for start, source, gain, offset, length, fade_in, fade_out, curve in zip(
+            columns.start.tolist(), columns.source.tolist(), columns.gain.tolist(),
+            columns.offset.tolist(), columns.length.tolist(), columns.fade_in.tolist(),
+            columns.fade_out.tolist(), columns.curve.tolist())
+    ]
+
+
+def _track_file_path(engine, track_id: int, project_dir: str) -> str:
+    # Track IDs are renumbered on load, so `track_{id}.wav` may already be
+    # another track's source; only the track's own file may be overwritten
+    used = set()
+    for other_id, other in engine.tracks.items():
+        if other_id != track_id and other.source_path:
+            used.add(os.path.abspath(other.source_path))
+        used.update(os.path.abspath(engine.sources[source].key[0])
+                    for source in set(other.clips.columns.source.tolist()))
+    path = os.path.join(project_dir, f"track_{track_id}.wav")
+    n = 1
+    while os.path.abspath(path) in used:
+        path = os.path.join(project_dir, f"track_{track_id}_{n}.wav")
+        n += 1
+    return path
+
+
+def _write_track_audio(track, path: str):
+    # The old file may be memory-mapped as the track's data, so never
+    # truncate it in place; the rename leaves existing mappings intact
+    with _atomic_write(path) as tmp_path:
+        if isinstance(track.data, StreamingSource):
+            # Copy block by block rather than pulling the whole file into memory
+            with sf.SoundFile(track.data.path) as src, \
+                    sf.SoundFile(tmp_path, 'w', src.samplerate, src.channels,
+                                 format='WAV', subtype='FLOAT') as dst:
+                for block in src.blocks(blocksize=1 << 16, dtype='float32'):
+                    dst.write(block)
+        else:
+            # Float audio is written as float, so edits are not quantised
+            sf.write(tmp_path, track.data, track.sample_rate, format='WAV',
+                     subtype=_SUBTYPES.get(track.data.dtype.str[1:], 'FLOAT'))
+
+
+def _relative_path(path: str, start: str) -> str:
+    try:
+        return os.path.relpath(path, start or os.curdir)
+    except ValueError:
+        # Different drive on Windows
+        return path
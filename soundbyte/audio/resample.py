@@ -0,0 +1,185 @@
+import numpy as np
+from math import gcd
+from typing import Dict, Optional, Tuple
+import os
+import tempfile
+
+from .loader import cache_hit, content_hash, default_cache_dir, trim_cache
+
+# quality -> (taps per side at unity ratio, Kaiser beta, passband edge)
+QUALITY_TIERS = {
+    'fast': (8, 6.0, 0.88),
+    'medium': (16, 8.0, 0.93),
+    'high': (32, 10.0, 0.96),
+}
+DEFAULT_QUALITY = 'medium'
+
+# Outputs computed per vectorised step; bounds temporary memory
+_CHUNK = 1 << 15
+
+_tables: Dict[Tuple[int, int, str], np.ndarray] = {}
+
+
+def ratio(src_rate: int, dst_rate: int) -> Tuple[int, int]:
+    """Reduced (up, down) factors for converting src_rate to dst_rate"""
+    g = gcd(int(src_rate), int(dst_rate))
+    return int(dst_rate) // g, int(src_rate) // g
+
+
+def design_filter(up: int, down: int, quality: str = DEFAULT_QUALITY) -> np.ndarray:
+    """
+    Polyphase table of a Kaiser-windowed sinc low-pass, shape (up, taps).
+
+    Row p holds the taps for outputs that fall p/up of the way between two
+    input samples; every row is normalised to unity DC gain. Tables are
+    cached since they only depend on the ratio and quality.
+    """
+    key = (up, down, quality)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+
+    half, beta, rolloff = QUALITY_TIERS[quality]
+    # When decimating, the cutoff drops and the filter must get longer
+    cutoff = rolloff * min(1.0, up / down)
+    half = int(np.ceil(half / min(1.0, up / down)))
+    taps = 2 * half
+
+    phase = np.arange(up)[:, None] / up
+    # Distance from each tap to the output position, in input samples
+    t = phase + (half - 1) - np.arange(taps)[None, :]
+    window = np.i0(beta * np.sqrt(np.clip(1 - (t / half) ** 2, 0, None))) / np.i0(beta)
+    table = cutoff * np.sinc(cutoff * t) * window
+    table /= table.sum(axis=1, keepdims=True)
+    table = table.astype(np.float32)
+    _tables[key] = table
+    return table
+
+
+class StreamResampler:
+    """
+    Block-wise rational resampler that carries its filter history across
+    calls, so feeding a signal in pieces gives the same output as feeding
+    it whole.
+
+    Output n is centred on input position n * down / up. Inputs and outputs
+    are (frames, channels) float32.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, channels: int,
+                 quality: str = DEFAULT_QUALITY):
+        self.up, self.down = ratio(src_rate, dst_rate)
+        self.channels = channels
+        self.table = design_filter(self.up, self.down, quality)
+        self.taps = self.table.shape[1]
+        self.reset()
+
+    def reset(self, output_frame: int = 0):
+        """Restart with silent history so the next output is `output_frame`"""
+        half = self.taps // 2
+        self._next = output_frame
+        self._base = output_frame * self.down // self.up - (half - 1)
+        self._buffer = np.zeros((half - 1, self.channels), dtype=np.float32)
+
+    def input_frame(self, output_frame: int) -> int:
+        """Input frame the given output frame is centred on"""
+        return output_frame * self.down // self.up
+
+    def output_length(self, input_frames: int) -> int:
+        return -(-input_frames * self.up // self.down)
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Consume input frames and return every output they complete"""
+        half = self.taps // 2
+        buffer = np.concatenate((self._buffer, np.asarray(x, dtype=np.float32)))
+        # Last input index the newest output may centre on
+        last = self._base + len(buffer) - half - 1
+        if last < 0:
+            end = self._next
+        else:
+            end = max(self._next, (last * self.up + self.up - 1) // self.down + 1)
+
+        out = np.zeros((end - self._next, self.channels), dtype=np.float32)
+        for start in range(self._next, end, _CHUNK):
+            n = np.arange(start, min(start + _CHUNK, end), dtype=np.int64)
+            pos = n * self.down
+            first = pos // self.up - (half - 1) - self._base
+            coeffs = self.table[pos % self.up]
+            y = out[start - self._next:start - self._next + len(n)]
+            # One vector multiply-add per tap over the whole chunk
+            for m in range(self.taps):
+                y += coeffs[:, m:m + 1] * buffer[first + m]
+
+        self._next = end
+        keep = end * self.down // self.up - (half - 1) - self._base
+        keep = max(0, min(keep, len(buffer)))
+        self._buffer = buffer[keep:]
+        self._base += keep
+        return out
+
+    def flush(self) -> np.ndarray:
+        """Return the outputs still held back waiting for future input"""
+        return self.process(np.zeros((self.taps // 2, self.channels), dtype=np.float32))
+
+
+def resample(data: np.ndarray, src_rate: int, dst_rate: int,
+             quality: str = DEFAULT_QUALITY, scale: float = 1.0) -> np.ndarray:
+    """Resample a whole (frames, channels) array in memory"""
+    if src_rate == dst_rate:
+        data = np.asarray(data, dtype=np.float32)
+        return data * np.float32(scale) if scale != 1.0 else data
+    resampler = StreamResampler(src_rate, dst_rate, data.shape[1], quality)
+    length = resampler.output_length(len(data))
+    out = np.empty((length, data.shape[1]), dtype=np.float32)
+    _resample_into(resampler, data, scale, out)
+    return out
+
+
+def resample_cached(file_path: str, data: np.ndarray, src_rate: int, dst_rate: int,
+                    quality: str = DEFAULT_QUALITY, scale: float = 1.0,
+                    cache_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Resample a file's samples once and memory-map the result on later calls
+
+    The cache entry is keyed by the source content, the target rate and the
+    quality tier, and shares the decode cache's budget. Conversion streams through the file in blocks, so memory
+    use stays flat however long the source is.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    name = f"{content_hash(file_path, cache_dir)}-{dst_rate}-{quality}.npy"
+    cache_path = os.path.join(cache_dir, name)
+    if not cache_hit(cache_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        resampler = StreamResampler(src_rate, dst_rate, data.shape[1], quality)
+        fd, tmp_path = tempfile.mkstemp(suffix='.npy', dir=cache_dir)
+        os.close(fd)
+        try:
+            out = np.lib.format.open_memmap(
+                tmp_path, mode='w+', dtype=np.float32,
+                shape=(resampler.output_length(len(data)), data.shape[1]))
+            _resample_into(resampler, data, scale, out)
+            out.flush()
+            del out
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        trim_cache(cache_dir, keep=cache_path)
+    return np.load(cache_path, mmap_mode='r')
+
+
+def _resample_into(resampler: StreamResampler, data: np.ndarray, scale: float,
+                   out: np.ndarray):
+    pos = 0
+    block = 1 << 16
+    for start in range(0, len(data), block):
+        x = np.asarray(data[start:start + block], dtype=np.float32)
+        if scale != 1.0:
+            x = x * np.float32(scale)
+        y = resampler.process(x)[:len(out) - pos]
+        out[pos:pos + len(y)] = y
+        pos += len(y)
+    y = resampler.flush()[:len(out) - pos]
+    out[pos:pos + len(y)] = y
+    pos += len(y)
+    out[pos:] = 0
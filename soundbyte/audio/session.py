@@ -0,0 +1,517 @@
+import numpy as np
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .resample import DEFAULT_QUALITY
+from .track import SampleKey, SamplePool
+
+# Fade curves, stored per clip in the `curve` column
+FADE_LINEAR = 0
+FADE_EQUAL_POWER = 1
+
+
+@lru_cache(maxsize=256)
+def fade_shape(curve: int, length: int) -> np.ndarray:
+    """
+    Read-only (length, 1) float32 gain rising from 0 to 1 over `length`
+    frames; fade-outs read it backwards. Cached by (curve, length), so clips
+    sharing a fade length share the array and the mixer only slices it.
+    """
+    t = (np.arange(length, dtype=np.float64) + 0.5) / length
+    if curve == FADE_EQUAL_POWER:
+        t = np.sin(t * (np.pi / 2))
+    shape = t.astype(np.float32).reshape(-1, 1)
+    shape.flags.writeable = False
+    return shape
+
+
+class Source(NamedTuple):
+    """Decoded audio that clips refer to by source id"""
+    path: str
+    key: SampleKey
+    data: np.ndarray
+    sample_rate: int
+
+
+class SourceTable:
+    """
+    Audio files used by clips, numbered with small integer source ids.
+
+    Each distinct file is taken from the `SamplePool` once and kept for as
+    long as any clip refers to it. `data` maps source id to samples and is
+    replaced, never mutated, so clip snapshots can keep reading it from the
+    audio thread while sources come and go.
+
+    A source can also be `reserve`d from the file's header alone, playing
+    silence of the right length until `load` decodes it, so clips can be
+    placed before their audio is read.
+    """
+
+    def __init__(self, pool: Optional[SamplePool] = None):
+        self.pool = pool if pool is not None else SamplePool()
+        self.data: Dict[int, np.ndarray] = {}
+        self._sources: Dict[int, Source] = {}
+        self._ids: Dict[SampleKey, int] = {}
+        self._refs: Dict[int, int] = {}
+        # Reserved sources not decoded yet; they hold no pool reference
+        self._pending = set()
+        self._next_id = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def __getitem__(self, source_id: int) -> Source:
+        return self._sources[source_id]
+
+    def acquire(self, file_path: str, sample_rate: Optional[int] = None,
+                quality: str = DEFAULT_QUALITY) -> Tuple[int, int]:
+        """
+        Take a reference to a file's samples for one clip
+
+        Returns:
+            (source_id, length in frames)
+        """
+        key, data, sr = self.pool.acquire(file_path, sample_rate, quality)
+        with self._lock:
+            source_id = self._ids.get(key)
+            if source_id is None:
+                source_id = self._next_id
+                self._next_id += 1
+                self._ids[key] = source_id
+                self._sources[source_id] = Source(file_path, key, data, sr)
+                self._refs[source_id] = 0
+                self.data = {**self.data, source_id: data}
+            else:
+                # The table already holds a pool reference for this file
+                self.pool.release(key)
+            self._refs[source_id] += 1
+        return source_id, len(data)
+
+    def reserve(self, file_path: str, frames: int, channels: int, sample_rate: int,
+                quality: str = DEFAULT_QUALITY) -> Tuple[int, int, bool]:
+        """
+        Take a reference to a file's samples for one clip without decoding it
+
+        Args:
+            frames, channels: Shape of the file at `sample_rate`, from its header
+            quality: Resampler quality tier `load` will be called with
+
+        Returns:
+            (source_id, length in frames, pending): `pending` is True when
+            the source is new and plays silence until `load`ed
+        """
+        key = self.pool.key_for(file_path, sample_rate, quality)
+        with self._lock:
+            source_id = self._ids.get(key)
+            if source_id is not None:
+                self._refs[source_id] += 1
+                return source_id, len(self.data[source_id]), False
+            source_id = self._next_id
+            self._next_id += 1
+            # Broadcast zeros: the right shape, no memory
+            silence = np.broadcast_to(np.zeros((1, channels), np.float32), (frames, channels))
+            self._ids[key] = source_id
+            self._sources[source_id] = Source(file_path, key, silence, sample_rate)
+            self._refs[source_id] = 1
+            self._pending.add(source_id)
+            self.data = {**self.data, source_id: silence}
+        return source_id, frames, True
+
+    def load(self, source_id: int, quality: str = DEFAULT_QUALITY) -> bool:
+        """
+        Decode a `reserve`d source and swap its samples in; returns False
+        if every clip using it was removed in the meantime. Clip snapshots
+        see the new samples once republished, see `ClipTable.refresh`.
+        """
+        with self._lock:
+            source = self._sources.get(source_id)
+            if source_id not in self._pending:
+                return source is not None
+        key, data, sr = self.pool.acquire(source.path, source.sample_rate, quality)
+        with self._lock:
+            if source_id not in self._pending:
+                self.pool.release(key)
+                return False
+            self._pending.discard(source_id)
+            self._sources[source_id] = source._replace(data=data, sample_rate=sr)
+            self.data = {**self.data, source_id: data}
+        return True
+
+    def retain(self, source_ids):
+        """Take one more clip reference per id in `source_ids`, e.g. for a split"""
+        with self._lock:
+            for source_id in np.atleast_1d(source_ids).tolist():
+                self._refs[source_id] += 1
+
+    def release(self, source_ids):
+        """Drop one clip reference per id in `source_ids`"""
+        released = []
+        with self._lock:
+            for source_id in np.atleast_1d(source_ids).tolist():
+                self._refs[source_id] -= 1
+                if self._refs[source_id] == 0:
+                    source = self._sources.pop(source_id)
+                    del self._refs[source_id]
+                    del self._ids[source.key]
+                    if source_id in self._pending:
+                        self._pending.discard(source_id)
+                    else:
+                        released.append(source)
+            if released:
+                self.data = {i: d for i, d in self.data.items() if i in self._sources}
+        for source in released:
+            self.pool.release(source.key)
+
+
+class ClipColumns(NamedTuple):
+    """
+    Immutable struct-of-arrays snapshot of one track's clips.
+
+    Rows are sorted by start frame; every column has one entry per clip.
+    """
+    clip_id: np.ndarray
+    start: np.ndarray
+    length: np.ndarray
+    source: np.ndarray
+    gain: np.ndarray
+    # First source frame the clip plays; the clip is a view of
+    # source[offset:offset + length], never a copy
+    offset: np.ndarray
+    # Fade lengths in frames, applied at mix time, and their FADE_* curve
+    fade_in: np.ndarray
+    fade_out: np.ndarray
+    curve: np.ndarray
+    # Upper bound on `length`, bounds the scan in `ClipTable.overlapping`
+    max_length: int
+    # Source id -> samples, as of when this snapshot was built
+    sources: Dict[int, np.ndarray]
+
+
+class ClipSpan(NamedTuple):
+    start: int
+    end: int
+    # The whole source; the clip plays data[offset:offset + end - start]
+    data: np.ndarray
+    gain: float
+    offset: int = 0
+    fade_in: int = 0
+    fade_out: int = 0
+    curve: int = FADE_LINEAR
+
+
+_COLUMNS = (('clip_id', np.int64), ('start', np.int64), ('length', np.int64),
+            ('source', np.int32), ('gain', np.float32), ('offset', np.int64),
+            ('fade_in', np.int64), ('fade_out', np.int64), ('curve', np.int8))
+
+
+def _empty_columns(sources: Dict[int, np.ndarray]) -> ClipColumns:
+    return ClipColumns(*(np.zeros(0, dtype) for _, dtype in _COLUMNS), 0, sources)
+
+
+class ClipTable:
+    """
+    Clips of one track stored as NumPy columns sorted by start frame.
+
+    Finding the clips overlapping a block is two binary searches plus a
+    vectorised end check over the window bounded by the longest clip, and
+    bulk edits such as `shift` are single array operations however many
+    clips they touch. Edits build a new `ClipColumns` and swap it in with a
+    single attribute assignment, so the audio thread always reads a
+    consistent snapshot without taking a lock.
+
+    Edits never re-sort the table: new clips are inserted where
+    `np.searchsorted` puts them and a moved clip is spliced into its new
+    row. Clips added after the last one, as imports place them, are
+    written into spare capacity past the end of the current snapshot, so a
+    run of them costs amortised O(1) each.
+
+    Edits are non-destructive: a clip is a window (`offset`, `length`) into
+    a shared source plus gain and fades, so splitting, trimming and
+    slipping only rewrite a few column entries and never touch samples.
+    """
+
+    def __init__(self, sources: Optional[SourceTable] = None):
+        self.sources = sources if sources is not None else SourceTable()
+        self.columns = _empty_columns(self.sources.data)
+        self._next_id = 1
+        # Orders edits against `refresh`, which may come from a loader thread
+        self._publish_lock = Lock()
+        # Arrays the current columns are a prefix of, with room to append
+        self._spare: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.columns.clip_id)
+
+    @property
+    def end_frame(self) -> int:
+        """Frame just after the last clip ends"""
+        columns = self.columns
+        return int((columns.start + columns.length).max()) if len(columns.start) else 0
+
+    def add(self, start: int, length: int, source: int, gain: float = 1.0,
+            offset: int = 0) -> int:
+        """Insert a clip and return its clip id"""
+        return int(self.extend([start], [length], [source], [gain], [offset])[0])
+
+    def extend(self, starts, lengths, sources, gains=None, offsets=None) -> np.ndarray:
+        """Insert many clips in one edit and return their clip ids"""
+        starts = np.asarray(starts, dtype=np.int64)
+        count = len(starts)
+        ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._next_id += count
+        if gains is None:
+            gains = np.ones(count, dtype=np.float32)
+        if offsets is None:
+            offsets = np.zeros(count, dtype=np.int64)
+        no_fade = np.zeros(count, dtype=np.int64)
+        added = (ids, starts, lengths, sources, gains, offsets, no_fade, no_fade,
+                 np.full(count, FADE_LINEAR, dtype=np.int8))
+        if count:
+            self._insert(self._with(), added, appendable=True)
+        return ids
+
+    def remove(self, clip_id: int) -> int:
+        """Remove a clip and return the source id it used"""
+        row = self.row(clip_id)
+        source = int(self.columns.source[row])
+        keep = np.ones(len(self), dtype=bool)
+        keep[row] = False
+        self._publish([getattr(self.columns, name)[keep] for name, _ in _COLUMNS])
+        return source
+
+    def move(self, clip_id: int, new_start: int):
+        """Move a clip to `new_start` as a single atomic edit"""
+        row = self.row(clip_id)
+        start = self._set(self.columns.start, row, new_start)
+        self._publish(self._reposition(self._with(start=start), row))
+
+    def shift(self, after_frame: int, frames: int):
+        """Move every clip starting at or after `after_frame` by `frames`"""
+        start = self.columns.start.copy()
+        # Rows are sorted, so the clips that move are the ones from `first` on
+        first = int(np.searchsorted(start, after_frame, 'left'))
+        start[first:] = np.maximum(start[first:] + frames, 0)
+        arrays = self._with(start=start)
+        if frames < 0 and first:
+            # Both parts are still sorted: merge the moved ones back in
+            rows = np.searchsorted(start[:first], start[first:], 'right')
+            arrays = [np.insert(a[:first], rows, a[first:]) for a in arrays]
+        self._publish(arrays)
+
+    def set_gain(self, clip_id: int, gain: float):
+        self._publish(self._with(gain=self._set(self.columns.gain, self.row(clip_id), gain)))
+
+    def split(self, clip_id: int, frames) -> np.ndarray:
+        """
+        Cut a clip at one or more timeline frames inside it and return the
+        ids of the new pieces after the first, which keeps `clip_id`.
+
+        The fade-in stays on the first piece and the fade-out moves to the
+        last. Every piece is a view of the same source: no samples are
+        copied, and any number of cuts is a single edit.
+        """
+        row = self.row(clip_id)
+        c = self.columns
+        start, length = int(c.start[row]), int(c.length[row])
+        cuts = np.unique(np.asarray(frames, dtype=np.int64))
+        cuts = cuts[(cuts > start) & (cuts < start + length)]
+        if not len(cuts):
+            return np.zeros(0, dtype=np.int64)
+
+        bounds = np.concatenate(([start], cuts, [start + length]))
+        pieces = len(cuts)
+        self.sources.retain(np.full(pieces, c.source[row]))
+        ids = np.arange(self._next_id, self._next_id + pieces, dtype=np.int64)
+        self._next_id += pieces
+        fade_in = np.zeros(pieces, dtype=np.int64)
+        fade_out = np.zeros(pieces, dtype=np.int64)
+        fade_out[-1] = min(c.fade_out[row], bounds[-1] - bounds[-2])
+        added = (ids, bounds[1:-1], np.diff(bounds)[1:],
+                 np.full(pieces, c.source[row]), np.full(pieces, c.gain[row]),
+                 c.offset[row] + bounds[1:-1] - start, fade_in, fade_out,
+                 np.full(pieces, c.curve[row]))
+
+        first = bounds[1] - start
+        fade_first = min(c.fade_in[row], first)
+        self._prepare_fades(int(c.curve[row]), int(fade_first), int(fade_out[-1]))
+        arrays = self._with(length=self._set(c.length, row, first),
+                            fade_in=self._set(c.fade_in, row, fade_first),
+                            fade_out=self._set(c.fade_out, row, 0))
+        self._insert(arrays, added)
+        return ids
+
+    def trim(self, clip_id: int, start: Optional[int] = None, end: Optional[int] = None):
+        """
+        Move a clip's start and/or end on the timeline, revealing or hiding
+        source audio; the audio under the rest of the clip stays in place.
+        Both edges are clamped to the source and to at least one frame.
+        """
+        row = self.row(clip_id)
+        c = self.columns
+        old_start, offset = int(c.start[row]), int(c.offset[row])
+        # Timeline span the whole source would cover at this position
+        source_start = old_start - offset
+        source_end = source_start + len(self.sources.data[int(c.source[row])])
+        new_start = old_start if start is None else start
+        new_start = min(max(new_start, source_start, 0), source_end - 1)
+        end = old_start + int(c.length[row]) if end is None else end
+        end = max(min(end, source_end), new_start + 1)
+        new_length = end - new_start
+        fade_in, fade_out = min(c.fade_in[row], new_length), min(c.fade_out[row], new_length)
+        self._prepare_fades(int(c.curve[row]), int(fade_in), int(fade_out))
+        arrays = self._with(
+            start=self._set(c.start, row, new_start),
+            length=self._set(c.length, row, new_length),
+            offset=self._set(c.offset, row, new_start - source_start),
+            fade_in=self._set(c.fade_in, row, fade_in),
+            fade_out=self._set(c.fade_out, row, fade_out),
+        )
+        self._publish(self._reposition(arrays, row) if new_start != old_start else arrays)
+
+    def slip(self, clip_id: int, frames: int):
+        """
+        Shift the audio inside a clip by `frames` while the clip stays put,
+        clamped so the clip never reads outside its source
+        """
+        row = self.row(clip_id)
+        c = self.columns
+        source_length = len(self.sources.data[int(c.source[row])])
+        # Positive frames move the audio later, i.e. start reading earlier
+        offset = int(np.clip(c.offset[row] - frames, 0,
+                             max(0, source_length - c.length[row])))
+        self._publish(self._with(offset=self._set(c.offset, row, offset)))
+
+    def set_fades(self, clip_id: int, fade_in: Optional[int] = None,
+                  fade_out: Optional[int] = None, curve: Optional[int] = None):
+        """Set a clip's fade lengths in frames and/or curve"""
+        row = self.row(clip_id)
+        c = self.columns
+        length = int(c.length[row])
+        fade_in = int(c.fade_in[row]) if fade_in is None else min(max(fade_in, 0), length)
+        fade_out = int(c.fade_out[row]) if fade_out is None else min(max(fade_out, 0), length)
+        curve = int(c.curve[row]) if curve is None else curve
+        self._prepare_fades(curve, fade_in, fade_out)
+        self._publish(self._with(fade_in=self._set(c.fade_in, row, fade_in),
+                                 fade_out=self._set(c.fade_out, row, fade_out),
+                                 curve=self._set(c.curve, row, curve)))
+
+    def clear(self) -> np.ndarray:
+        """Remove every clip and return the source ids they used"""
+        with self._publish_lock:
+            sources = self.columns.source
+            self.columns = _empty_columns(self.sources.data)
+            self._spare = None
+        return sources
+
+    def row(self, clip_id: int) -> int:
+        rows = np.flatnonzero(self.columns.clip_id == clip_id)
+        if not len(rows):
+            raise KeyError(f"No clip with id {clip_id}")
+        return int(rows[0])
+
+    def refresh(self):
+        """Republish the clips with the source table's current samples"""
+        with self._publish_lock:
+            self.columns = self.columns._replace(sources=self.sources.data)
+
+    def window(self, start: int, end: int) -> np.ndarray:
+        """Rows of the clips overlapping the frame range [start, end)"""
+        columns = self.columns
+        lo = np.searchsorted(columns.start, start - columns.max_length, 'right')
+        hi = np.searchsorted(columns.start, end, 'left')
+        ends = columns.start[lo:hi] + columns.length[lo:hi]
+        return lo + np.flatnonzero(ends > start)
+
+    def overlapping(self, start: int, end: int) -> List[ClipSpan]:
+        """Return the clips overlapping the frame range [start, end)"""
+        columns = self.columns
+        rows = self.window(start, end)
+        return [ClipSpan(s, s + n, columns.sources[source], gain, offset, fade_in,
+                         fade_out, curve)
+                for s, n, source, gain, offset, fade_in, fade_out, curve in zip(
+                    columns.start[rows].tolist(), columns.length[rows].tolist(),
+                    columns.source[rows].tolist(), columns.gain[rows].tolist(),
+                    columns.offset[rows].tolist(), columns.fade_in[rows].tolist(),
+                    columns.fade_out[rows].tolist(), columns.curve[rows].tolist())]
+
+    def _with(self, **replaced) -> List[np.ndarray]:
+        return [replaced.get(name, getattr(self.columns, name)) for name, _ in _COLUMNS]
+
+    @staticmethod
+    def _prepare_fades(curve: int, *fades: int):
+        # Build the shapes here rather than on the audio thread's first use
+        for fade in fades:
+            if fade:
+                fade_shape(curve, fade)
+
+    @staticmethod
+    def _set(column: np.ndarray, row: int, value) -> np.ndarray:
+        # Copy, never write: the current snapshot may be in use
+        column = column.copy()
+        column[row] = value
+        return column
+
+    def _insert(self, arrays: List[np.ndarray], added, appendable: bool = False):
+        """
+        Publish `arrays` with the `added` rows merged in by start frame;
+        `appendable` when `arrays` are the current columns, unchanged
+        """
+        added = [np.asarray(new, dtype) for (_, dtype), new in zip(_COLUMNS, added)]
+        if len(added[1]) > 1 and np.any(added[1][1:] < added[1][:-1]):
+            order = np.argsort(added[1], kind='stable')
+            added = [new[order] for new in added]
+        start = arrays[1]
+        if appendable and (not len(start) or added[1][0] >= start[-1]):
+            self._append(arrays, added)
+            return
+        # Like a stable sort, new clips go after existing ones at the same frame
+        rows = np.searchsorted(start, added[1], 'right')
+        if len(rows) == 1:
+            row = int(rows[0])
+            merged = [np.concatenate((column[:row], new, column[row:]))
+                      for column, new in zip(arrays, added)]
+        else:
+            merged = [np.insert(column, rows, new) for column, new in zip(arrays, added)]
+        self._publish(merged)
+
+    def _append(self, arrays: List[np.ndarray], added: List[np.ndarray]):
+        count, extra = len(arrays[0]), len(added[0])
+        spare = self._spare
+        if spare is None or len(spare[0]) < count + extra:
+            # Grow geometrically; earlier snapshots keep the old arrays
+            capacity = max(16, 2 * (count + extra))
+            spare = [np.empty(capacity, dtype) for _, dtype in _COLUMNS]
+            for buffer, column in zip(spare, arrays):
+                buffer[:count] = column
+        # Past the end of every published snapshot, so nothing reads these rows yet
+        for buffer, new in zip(spare, added):
+            buffer[count:count + extra] = new
+        max_length = max(self.columns.max_length, int(added[2].max()))
+        self._publish([buffer[:count + extra] for buffer in spare], max_length)
+        self._spare = spare
+
+    @staticmethod
+    def _reposition(arrays: List[np.ndarray], row: int) -> List[np.ndarray]:
+        """Splice `row`, whose start frame changed, back into start order"""
+        start = arrays[1]
+        new_start = start[row]
+        # Clips at the same frame keep their order relative to the moved one
+        if row and new_start < start[row - 1]:
+            target = int(np.searchsorted(start[:row], new_start, 'right'))
+            return [np.concatenate((a[:target], a[row:row + 1], a[target:row], a[row + 1:]))
+                    for a in arrays]
+        if row + 1 < len(start) and new_start > start[row + 1]:
+            target = row + int(np.searchsorted(start[row + 1:], new_start, 'left'))
+            return [np.concatenate((a[:row], a[row + 1:target + 1], a[row:row + 1],
+                                    a[target + 1:])) for a in arrays]
+        return arrays
+
+    def _publish(self, arrays: List[np.ndarray], max_length: Optional[int] = None):
+        if max_length is None:
+            length = arrays[2]
+            max_length = int(length.max()) if len(length) else 0
+        with self._publish_lock:
+            self.columns = ClipColumns(*arrays, max_length, self.sources.data)
+            self._spare = None
@@ -0,0 +1,248 @@
+import soundfile as sf
+import numpy as np
+from threading import Thread, Event, Lock
+import logging
+from typing import List, Optional
+
+from .resample import DEFAULT_QUALITY, StreamResampler
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingSource:
+    """
+    Audio file played straight from disk through a read-ahead ring buffer.
+
+    The file stays open for the lifetime of the source and only
+    `ring_frames` frames are held in memory. A `DiskReader` thread fills the
+    ring ahead of the play position, and the audio thread copies out of it
+    with `read_into`. The two sides only share immutable tuples that are
+    replaced with a single assignment, so neither side ever waits on the
+    other:
+
+    - `_span = (generation, start, end)` is written by the reader and marks
+      the absolute frames currently held in the ring.
+    - `_consumed = (generation, frame)` is written by the audio thread and
+      tells the reader which frames may be overwritten.
+
+    A seek bumps the generation, which invalidates the ring in one step.
+    Once a chunk's worth of the ring has been played, `read_into` sets the
+    reader's wake-up event, the one thing the audio thread does besides
+    copying; the lock behind it is only ever held for an instant.
+
+    With a `target_rate` different from the file's, the reader thread runs
+    each block through a `StreamResampler` before it enters the ring, so
+    frame positions and `frames` are in the target rate.
+    """
+
+    def __init__(self, file_path: str, ring_frames: int = 1 << 17,
+                 chunk_frames: int = 8192, target_rate: Optional[int] = None,
+                 quality: str = DEFAULT_QUALITY):
+        self.path = file_path
+        self.file = sf.SoundFile(file_path)
+        self.source_rate = self.file.samplerate
+        self.sample_rate = target_rate or self.source_rate
+        self.channels = self.file.channels
+        self.frames = self.file.frames
+        self.chunk_frames = chunk_frames
+        self.resampler = None
+        if self.sample_rate != self.source_rate:
+            self.resampler = StreamResampler(self.source_rate, self.sample_rate,
+                                             self.channels, quality)
+            self.frames = self.resampler.output_length(self.frames)
+        # Resampled frames that did not fit in the ring yet
+        self._pending = None
+        self._flushed = False
+        self.ring = np.zeros((ring_frames, self.channels), dtype=np.float32)
+        self.underruns = 0
+
+        self._span = (0, 0, 0)
+        self._consumed = (0, 0)
+        self._seek_to = None
+        self._closed = False
+        # Set by the `DiskReader` this source is added to
+        self._wake: Optional[Event] = None
+        # Held by the reader thread while it uses the file, so `close`
+        # never pulls it out from under a read; the audio thread never takes it
+        self._file_lock = Lock()
+
+    def __len__(self) -> int:
+        return self.frames
+
+    @property
+    def shape(self):
+        return (self.frames, self.channels)
+
+    def seek(self, frame: int):
+        """Request a refill from `frame`; called from the control thread"""
+        self._seek_to = max(0, min(frame, self.frames))
+
+    def read_into(self, out: np.ndarray, start: int, frames: int) -> int:
+        """
+        Copy frames [start, start+frames) into `out`, zero-filling anything
+        not buffered yet. Called from the audio thread; never blocks.
+
+        Returns:
+            Number of frames copied from the ring
+        """
+        generation, span_start, span_end = self._span
+        if start < span_start or start >= span_end:
+            n = 0
+        else:
+            n = min(frames, span_end - start)
+            capacity = len(self.ring)
+            head = start % capacity
+            first = min(n, capacity - head)
+            out[:first] = self.ring[head:head + first]
+            if first < n:
+                out[first:n] = self.ring[:n - first]
+            self._consumed = (generation, start + n)
+            # Room for another chunk: ask for a refill, unless already asked
+            wake = self._wake
+            if (wake is not None and span_end < self.frames
+                    and capacity - (span_end - start - n) >= self.chunk_frames
+                    and not wake.is_set()):
+                wake.set()
+
+        if n < frames:
+            out[n:frames] = 0
+            if start + n < self.frames:
+                self.underruns += 1
+        return n
+
+    def fill(self) -> bool:
+        """
+        Read ahead as far as the ring allows; called from the reader thread.
+
+        Returns:
+            True if any frames were read
+        """
+        with self._file_lock:
+            return not self._closed and self._fill()
+
+    def _fill(self) -> bool:
+        if self._seek_to is not None:
+            frame, self._seek_to = self._seek_to, None
+            generation = self._span[0] + 1
+            if self.resampler:
+                self.file.seek(self.resampler.input_frame(frame))
+                self.resampler.reset(frame)
+                self._pending = None
+                self._flushed = False
+            else:
+                self.file.seek(frame)
+            self._span = (generation, frame, frame)
+
+        generation, span_start, span_end = self._span
+        consumed_generation, consumed = self._consumed
+        if consumed_generation != generation or consumed < span_start:
+            consumed = span_start
+
+        capacity = len(self.ring)
+        free = capacity - (span_end - consumed)
+        n = min(free, self.chunk_frames, self.frames - span_end)
+        if n <= 0:
+            return False
+
+        head = span_end % capacity
+        n = min(n, capacity - head)
+        if self.resampler:
+            read = self._read_resampled(self.ring[head:head + n])
+        else:
+            read = self.file.read(n, dtype='float32', always_2d=True,
+                                  out=self.ring[head:head + n])
+        # Drop the oldest frames from the span once the ring has wrapped
+        span_end += len(read)
+        span_start = max(span_start, span_end - capacity)
+        self._span = (generation, span_start, span_end)
+        return len(read) > 0
+
+    def _read_resampled(self, out: np.ndarray) -> np.ndarray:
+        """Fill as much of `out` as one source block allows, at the target rate"""
+        if self._pending is None or not len(self._pending):
+            block = self.file.read(self.chunk_frames, dtype='float32', always_2d=True)
+            if len(block):
+                self._pending = self.resampler.process(block)
+            elif not self._flushed:
+                self._pending = self.resampler.flush()
+                self._flushed = True
+            else:
+                return out[:0]
+        n = min(len(out), len(self._pending))
+        out[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return out[:n]
+
+    def close(self):
+        with self._file_lock:
+            if not self._closed:
+                self._closed = True
+                self.file.close()
+
+
+class DiskReader:
+    """
+    Background thread keeping every `StreamingSource` topped up.
+
+    The thread sleeps until there is work: a source being added, a seek
+    (`wake`), or the audio thread having played a chunk's worth of a ring.
+    """
+
+    def __init__(self):
+        self.sources: List[StreamingSource] = []
+        self._lock = Lock()
+        self._wake = Event()
+        self._stopping = False
+        self._thread = None
+
+    def add(self, source: StreamingSource):
+        source._wake = self._wake
+        with self._lock:
+            self.sources.append(source)
+        if self._thread is None:
+            self._stopping = False
+            self._thread = Thread(target=self._run, name="soundbyte-disk-reader",
+                                  daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def remove(self, source: StreamingSource):
+        with self._lock:
+            if source in self.sources:
+                self.sources.remove(source)
+        source.close()
+
+    def wake(self):
+        """Service all sources now, e.g. after seeking them"""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the thread, waiting for it to finish, and close every source"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            sources, self.sources = self.sources, []
+        for source in sources:
+            source.close()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping:
+                return
+            busy = True
+            # Round-robin one chunk per source until everything is full
+            while busy:
+                busy = False
+                with self._lock:
+                    sources = list(self.sources)
+                for source in sources:
+                    if not source._closed:
+                        try:
+                            busy |= source.fill()
+                        except (RuntimeError, ValueError) as e:
+                            logger.error("Disk reader error on %s: %s", source.path, e)
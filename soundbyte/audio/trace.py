@@ -0,0 +1,169 @@
+import functools
+import json
+import logging
+import os
+import threading
+from collections import deque
+from threading import Event, Thread
+from time import perf_counter_ns
+from typing import Dict, List
+
+
+class _NullSpan:
+    """Shared do-nothing span handed out while tracing is off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.category, self.start, perf_counter_ns(), self.args)
+        return False
+
+
+class Tracer:
+    """
+    Timed spans collected as Chrome trace events.
+
+    While `enabled` is False, `span` returns one shared no-op object, so an
+    instrumented block costs a single attribute check. Enabled spans append
+    a tuple to a bounded deque, which is safe from any thread, including
+    the audio callback, without a lock. `dump` writes the Chrome
+    trace-event JSON that chrome://tracing and Perfetto load.
+    """
+
+    def __init__(self, max_events: int = 1 << 20):
+        self.enabled = False
+        self._events = deque(maxlen=max_events)
+        self._threads: Dict[int, str] = {}
+
+    def span(self, name: str, category: str = 'soundbyte', **args):
+        """Context manager timing the enclosed block as one event"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def add(self, name: str, category: str, start_ns: int, end_ns: int, args: dict):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append((name, category, start_ns, end_ns, tid, args))
+
+    def clear(self):
+        self._events.clear()
+
+    def events(self) -> List[dict]:
+        """Recorded spans as trace-event dicts, with thread names first"""
+        pid = os.getpid()
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+             'args': {'name': name}}
+            for tid, name in list(self._threads.items())
+        ]
+        for name, category, start, end, tid, args in list(self._events):
+            events.append({
+                'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': start / 1000, 'dur': (end - start) / 1000, 'args': args,
+            })
+        return events
+
+    def dump(self, path: str):
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f)
+
+
+tracer = Tracer()
+
+
+def span(name: str, category: str = 'soundbyte', **args):
+    """Time a block on the global tracer: `with span("save"): ...`"""
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def traced(name: str, category: str = 'soundbyte'):
+    """Decorator timing every call of a function on the global tracer"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with _Span(tracer, name, category, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class RealtimeLog:
+    """
+    Logging for the audio thread.
+
+    `log` only appends to a bounded deque, which never blocks or takes a
+    lock; a background thread forwards the entries to a `logging` logger,
+    where formatting and I/O happen. If the drain thread falls behind, the
+    oldest entries are dropped rather than stalling the audio thread.
+    """
+
+    def __init__(self, name: str, interval: float = 0.05, max_pending: int = 1024):
+        self.logger = logging.getLogger(name)
+        self.interval = interval
+        self._pending = deque(maxlen=max_pending)
+        self._stop = Event()
+        self._thread = None
+
+    def log(self, level: int, msg: str, *args):
+        self._pending.append((level, msg, args))
+
+    def warning(self, msg: str, *args):
+        self.log(logging.WARNING, msg, *args)
+
+    def error(self, msg: str, *args):
+        self.log(logging.ERROR, msg, *args)
+
+    def start(self):
+        """Start the drain thread; safe to call more than once"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="soundbyte-rt-log", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the drain thread after forwarding everything pending"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.drain()
+
+    def drain(self):
+        while self._pending:
+            level, msg, args = self._pending.popleft()
+            self.logger.log(level, msg, *args)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.drain()
+
+
+realtime_log = RealtimeLog("soundbyte.realtime")
@@ -0,0 +1,117 @@
+import soundfile as sf
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional, Tuple
+import os
+
+from .resample import DEFAULT_QUALITY, resample
+
+# (real path, mtime, size, sample rate or 0 for the file's own,
+#  resampler quality tier or "" when not resampled)
+SampleKey = Tuple[str, int, int, int, str]
+
+
+@dataclass
+class PooledSample:
+    data: np.ndarray
+    sample_rate: int
+    refs: int = 0
+
+
+class SamplePool:
+    """
+    Shared, decoded audio for clips.
+
+    Samples are keyed by (real path, mtime, size, rate, quality), so placing
+    the same file many times decodes and resamples it once and every clip
+    gets a read-only view of the same buffer. Buffers no clip references
+    any more are kept around for reuse and evicted least recently used
+    first once the pool grows past `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._samples: "OrderedDict[SampleKey, PooledSample]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @staticmethod
+    def key_for(file_path: str, sample_rate: Optional[int] = None,
+                quality: str = DEFAULT_QUALITY) -> SampleKey:
+        st = os.stat(file_path)
+        return (os.path.realpath(file_path), st.st_mtime_ns, st.st_size,
+                sample_rate or 0, quality if sample_rate else "")
+
+    def acquire(self, file_path: str, sample_rate: Optional[int] = None,
+                quality: str = DEFAULT_QUALITY) -> Tuple[SampleKey, np.ndarray, int]:
+        """
+        Get the decoded samples for a file and take a reference to them
+
+        Args:
+            file_path: Audio file to decode
+            sample_rate: Rate to convert to, or None to keep the file's rate
+            quality: Resampler quality tier, see resample.QUALITY_TIERS
+
+        Returns:
+            (key, data, sample_rate) where data is a read-only float32 view
+            of shape (frames, channels); pass key to `release` when done
+        """
+        key = self.key_for(file_path, sample_rate, quality)
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is not None:
+                self._samples.move_to_end(key)
+                sample.refs += 1
+                return key, sample.data.view(), sample.sample_rate
+
+        # Decode outside the lock so other files can load in parallel
+        data, sr = sf.read(file_path, dtype='float32', always_2d=True)
+        if sample_rate and sr != sample_rate:
+            data = resample(data, sr, sample_rate, quality)
+            sr = sample_rate
+        data.flags.writeable = False
+
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = PooledSample(data, sr)
+                self._samples[key] = sample
+                self.nbytes += data.nbytes
+            sample.refs += 1
+            self._evict()
+            return key, sample.data.view(), sample.sample_rate
+
+    def release(self, key: SampleKey):
+        """Drop a reference taken by `acquire`"""
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is not None and sample.refs > 0:
+                sample.refs -= 1
+                self._evict()
+
+    def set_max_bytes(self, max_bytes: int):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear_unused(self):
+        """Evict every buffer no clip references"""
+        with self._lock:
+            for key in [k for k, s in self._samples.items() if s.refs == 0]:
+                self.nbytes -= self._samples.pop(key).data.nbytes
+
+    def _evict(self):
+        if self.nbytes <= self.max_bytes:
+            return
+        for key in list(self._samples):
+            sample = self._samples[key]
+            if sample.refs == 0:
+                del self._samples[key]
+                self.nbytes -= sample.data.nbytes
+                if self.nbytes <= self.max_bytes:
+                    break
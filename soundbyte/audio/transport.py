@@ -0,0 +1,81 @@
+from collections import deque
+from time import perf_counter
+from typing import Callable, List, NamedTuple, Optional
+
+# Transport events, passed to subscribers with the frame they happened at
+PLAYING = "playing"
+PAUSED = "paused"
+STOPPED = "stopped"
+SEEKED = "seeked"
+# Playback crossed the end of the session; it keeps running until stopped
+ENDED = "ended"
+
+Subscriber = Callable[[str, int], None]
+
+
+class TransportState(NamedTuple):
+    """
+    Where playback is, as of the latest audio callback.
+
+    `frame` is the first frame of the latest block and `dac_time` the
+    perf_counter() time it reaches the output, from the stream's
+    outputBufferDacTime plus the mixer's latency, so `position` can work
+    out the frame being heard between callbacks rather than the frame
+    being rendered.
+    """
+    playing: bool
+    frame: int
+    frames: int
+    dac_time: float
+    sample_rate: int
+
+    def position(self, now: Optional[float] = None) -> int:
+        """Frame heard at perf_counter() time `now`"""
+        if not self.playing:
+            return self.frame
+        if now is None:
+            now = perf_counter()
+        heard = self.frame + int((now - self.dac_time) * self.sample_rate)
+        # If callbacks stall, hold at the end of what has been rendered
+        return max(0, min(heard, self.frame + self.frames))
+
+
+class TransportPublisher:
+    """
+    Transport state and events for threads other than the audio thread.
+
+    `state` is an immutable `TransportState` replaced with a single
+    assignment, and events go into a bounded deque; neither blocks, so the
+    audio callback publishes directly. Subscribers are called from
+    `dispatch`, on the thread that calls it: the engine dispatches right
+    away for changes made through it (play, pause, stop, seek), and events
+    from the audio thread wait for the consumer's next `dispatch`, e.g. a
+    GUI frame tick, which only runs while playing.
+    """
+
+    def __init__(self, sample_rate: int, max_pending: int = 256):
+        self.state = TransportState(False, 0, 0, 0.0, sample_rate)
+        self._events = deque(maxlen=max_pending)
+        self._subscribers: List[Subscriber] = []
+
+    def subscribe(self, callback: Subscriber):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber):
+        self._subscribers.remove(callback)
+
+    def publish(self, state: TransportState):
+        self.state = state
+
+    def post(self, event: str, frame: int):
+        self._events.append((event, frame))
+
+    def dispatch(self) -> int:
+        """Pass pending events to the subscribers; returns how many there were"""
+        count = 0
+        while self._events:
+            event, frame = self._events.popleft()
+            for callback in list(self._subscribers):
+                callback(event, frame)
+            count += 1
+        return count
@@ -1,2 +1,3 @@
 from .base import Command
-from .track_commands import AddTrackCommand
\ No newline at end of file
+from .history import History
+from .audio_commands import EditAudioCommand, SetTrackVolumeCommand
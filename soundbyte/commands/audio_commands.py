@@ -0,0 +1,175 @@
+from time import monotonic
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import os
+import tempfile
+
+import numpy as np
+
+from .base import Command
+
+# Granularity of audio undo snapshots
+BLOCK_BYTES = 64 << 10
+# Volume changes closer together than this undo as one step
+COALESCE_SECONDS = 0.5
+
+
+class BlockSnapshot:
+    """
+    The fixed-size blocks of an array that an edit touches, as they were
+    before it.
+
+    `swap` exchanges the saved blocks with the array's current contents, so
+    undo and redo are the same operation, and both cost O(changed blocks)
+    whatever the length of the array.
+    """
+
+    def __init__(self, data: np.ndarray, ranges: Iterable[Tuple[int, int]]):
+        frame_bytes = data.itemsize * int(np.prod(data.shape[1:], dtype=np.int64))
+        self.frames_per_block = max(1, BLOCK_BYTES // frame_bytes)
+        step = self.frames_per_block
+        indices = sorted({block for start, end in ranges if end > start
+                          for block in range(start // step, (end - 1) // step + 1)})
+        self.blocks: Optional[Dict[int, np.ndarray]] = {
+            i: np.array(data[i * step:(i + 1) * step]) for i in indices}
+        # Set while the blocks live in a file instead of `blocks`
+        self._spilled = None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.nbytes for block in self.blocks.values()) if self.blocks else 0
+
+    @property
+    def disk_bytes(self) -> int:
+        return os.path.getsize(self._spilled[0]) if self._spilled else 0
+
+    def swap(self, data: np.ndarray):
+        self._load()
+        step = self.frames_per_block
+        for i, block in self.blocks.items():
+            rows = slice(i * step, i * step + len(block))
+            current = data[rows].copy()
+            data[rows] = block
+            self.blocks[i] = current
+
+    def spill(self, directory: str):
+        if not self.blocks:
+            return
+        fd, path = tempfile.mkstemp(suffix='.npy', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, np.concatenate(list(self.blocks.values())))
+        self._spilled = (path, [(i, len(block)) for i, block in self.blocks.items()])
+        self.blocks = None
+
+    def release(self):
+        self.blocks = None
+        if self._spilled:
+            os.remove(self._spilled[0])
+            self._spilled = None
+
+    def _load(self):
+        if self._spilled is None:
+            return
+        path, layout = self._spilled
+        saved = np.load(path)
+        self.blocks = {}
+        pos = 0
+        for i, frames in layout:
+            self.blocks[i] = saved[pos:pos + frames]
+            pos += frames
+        os.remove(path)
+        self._spilled = None
+
+
+class EditAudioCommand(Command):
+    """
+    Overwrite part of a track's samples, undoably.
+
+    The first execute snapshots the blocks it is about to overwrite; undo
+    and redo then swap them back and forth in place.
+    """
+
+    def __init__(self, engine, track_id: int, start_frame: int, samples: np.ndarray):
+        self.engine = engine
+        self.track_id = track_id
+        self.start_frame = start_frame
+        # Float samples, (frames, channels) like the track; dropped once applied
+        self.samples = samples
+        self.snapshot: Optional[BlockSnapshot] = None
+
+    def execute(self):
+        data = self.engine.writable_track_data(self.track_id)
+        if self.snapshot is not None:
+            self.snapshot.swap(data)
+            return
+        start = self.start_frame
+        end = min(start + len(self.samples), len(data))
+        self.snapshot = BlockSnapshot(data, [(start, end)])
+        data[start:end] = self._convert(self.samples[:end - start], data.dtype)
+        # The snapshot holds everything redo needs from here on
+        self.samples = None
+
+    def undo(self):
+        self.snapshot.swap(self.engine.writable_track_data(self.track_id))
+
+    def _convert(self, samples: np.ndarray, dtype) -> np.ndarray:
+        if not np.issubdtype(dtype, np.integer):
+            return samples
+        # Back to the track's integer PCM, see loader.load_audio
+        info = np.iinfo(dtype)
+        scaled = np.round(samples / self.engine.tracks[self.track_id].scale)
+        return np.clip(scaled, info.min, info.max).astype(dtype)
+
+    def memory_bytes(self) -> int:
+        return self.snapshot.nbytes if self.snapshot else 0
+
+    def disk_bytes(self) -> int:
+        return self.snapshot.disk_bytes if self.snapshot else 0
+
+    def spill(self, directory: str):
+        if self.snapshot:
+            self.snapshot.spill(directory)
+
+    def release(self):
+        if self.snapshot:
+            self.snapshot.release()
+
+
+class SetTrackVolumeCommand(Command):
+    """
+    Fader move; successive moves of the same track within
+    `COALESCE_SECONDS` of each other, as a slider drag produces, merge
+    into one undo step
+    """
+
+    def __init__(self, engine, track_id: int, volume: float,
+                 on_applied: Optional[Callable[[float], None]] = None):
+        self.engine = engine
+        self.track_id = track_id
+        self.volume = volume
+        self.previous = None
+        # Lets the GUI move its slider on undo/redo without re-recording
+        self.on_applied = on_applied
+        self.updated = 0.0
+
+    def execute(self):
+        if self.previous is None:
+            self.previous = self.engine.tracks[self.track_id].volume
+        self._apply(self.volume)
+        self.updated = monotonic()
+
+    def undo(self):
+        self._apply(self.previous)
+
+    def merge(self, other: Command) -> bool:
+        if (not isinstance(other, SetTrackVolumeCommand) or other.engine is not self.engine
+                or other.track_id != self.track_id
+                or other.updated - self.updated > COALESCE_SECONDS):
+            return False
+        self.volume = other.volume
+        self.updated = other.updated
+        return True
+
+    def _apply(self, volume: float):
+        self.engine.set_track_volume(self.track_id, volume)
+        if self.on_applied:
+            self.on_applied(volume)
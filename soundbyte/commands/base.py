@@ -5,8 +5,31 @@ class Command(ABC):
     def execute(self):
         """Execute the command"""
         pass
-        
+
     @abstractmethod
     def undo(self):
         """Undo the command"""
-        pass
\ No newline at end of file
+        pass
+
+    def merge(self, other: "Command") -> bool:
+        """
+        Absorb `other`, which has just been executed, so both undo as one
+        step; return False to keep them separate
+        """
+        return False
+
+    def memory_bytes(self) -> int:
+        """Bytes of undo data held in memory, counted against History's budget"""
+        return 0
+
+    def disk_bytes(self) -> int:
+        """Bytes of undo data spilled to disk"""
+        return 0
+
+    def spill(self, directory: str):
+        """Move undo data held in memory to a file under `directory`"""
+        pass
+
+    def release(self):
+        """Free all undo data; called once the command leaves the history"""
+        pass
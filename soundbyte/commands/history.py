@@ -0,0 +1,121 @@
+from collections import deque
+from typing import Callable, Deque, Optional
+import tempfile
+
+from .base import Command
+
+# In-memory undo data kept before the oldest entries are spilled to disk
+DEFAULT_MEMORY_BYTES = 256 << 20
+# Total undo data, memory and disk, kept before the oldest entries are dropped
+DEFAULT_BUDGET_BYTES = 2 << 30
+
+
+class History:
+    """
+    Undo/redo stacks of `Command`s within a byte budget.
+
+    After every change the oldest undo entries are spilled to a temporary
+    directory until what is held in memory fits `memory_bytes`, and dropped
+    altogether until memory and disk together fit `budget_bytes`. Dropped
+    and discarded commands are `release`d. A command executed right after
+    another one it `merge`s with, e.g. successive steps of a slider drag,
+    joins that entry instead of adding one.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES,
+                 memory_bytes: int = DEFAULT_MEMORY_BYTES,
+                 spill_dir: Optional[str] = None,
+                 on_change: Optional[Callable[[], None]] = None):
+        self.budget_bytes = budget_bytes
+        self.memory_bytes = memory_bytes
+        self.on_change = on_change
+        # Oldest first, so eviction pops from the left
+        self.undo_stack: Deque[Command] = deque()
+        self.redo_stack: Deque[Command] = deque()
+        self._spill_parent = spill_dir
+        self._spill_dir = None
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def usage(self):
+        """(bytes in memory, bytes on disk) over every entry"""
+        commands = (*self.undo_stack, *self.redo_stack)
+        return (sum(c.memory_bytes() for c in commands),
+                sum(c.disk_bytes() for c in commands))
+
+    def execute(self, command: Command):
+        """Execute `command` and record it; returns what `execute` returned"""
+        result = command.execute()
+        self._discard(self.redo_stack)
+        if self.undo_stack and self.undo_stack[-1].merge(command):
+            command.release()
+        else:
+            self.undo_stack.append(command)
+        self._enforce_budget()
+        self._changed()
+        return result
+
+    def undo(self) -> bool:
+        if not self.undo_stack:
+            return False
+        command = self.undo_stack.pop()
+        command.undo()
+        self.redo_stack.append(command)
+        self._changed()
+        return True
+
+    def redo(self) -> bool:
+        if not self.redo_stack:
+            return False
+        command = self.redo_stack.pop()
+        command.execute()
+        self.undo_stack.append(command)
+        self._changed()
+        return True
+
+    def clear(self):
+        self._discard(self.undo_stack)
+        self._discard(self.redo_stack)
+        if self._spill_dir is not None:
+            self._spill_dir.cleanup()
+            self._spill_dir = None
+        self._changed()
+
+    def _enforce_budget(self):
+        memory, disk = self.usage()
+        # Oldest first; the newest entry stays in memory for a quick undo
+        for command in list(self.undo_stack)[:-1]:
+            if memory <= self.memory_bytes:
+                break
+            held, spilled = command.memory_bytes(), command.disk_bytes()
+            if held:
+                command.spill(self._spill_path())
+                memory += command.memory_bytes() - held
+                disk += command.disk_bytes() - spilled
+
+        while len(self.undo_stack) > 1 and (memory > self.memory_bytes
+                                            or memory + disk > self.budget_bytes):
+            command = self.undo_stack.popleft()
+            memory -= command.memory_bytes()
+            disk -= command.disk_bytes()
+            command.release()
+
+    def _spill_path(self) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.TemporaryDirectory(
+                prefix="soundbyte-undo-", dir=self._spill_parent)
+        return self._spill_dir.name
+
+    def _discard(self, stack: Deque[Command]):
+        while stack:
+            stack.pop().release()
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
@@ -8,12 +8,21 @@ class AddTrackCommand(Command):
         self.window = window
         self.file_path = file_path
         self.track_id = None
+        # The engine track while undone, so redo does not load it again
+        self.detached = None
         
     def execute(self):
         try:
-            self.track_id = self.window.audio_engine.add_track(self.file_path)
-            track_widget = TrackWidget(self.track_id, self.window.audio_engine)
+            engine = self.window.audio_engine
+            if self.detached is not None:
+                self.track_id = engine.attach_track(self.detached, self.track_id)
+                self.detached = None
+            else:
+                self.track_id = engine.add_track(self.file_path)
+            track_widget = TrackWidget(self.track_id, engine, history=self.window.history)
+            track_widget.clip_import_requested.connect(self.window.timeline.set_pending_clip)
             self.window.tracks_layout.addWidget(track_widget)
+            self.window.timeline.add_track(self.track_id)
             self.window.track_list.addItem(f"Track {self.track_id}")
             self.window.play_button.setEnabled(True)
             return self.track_id
@@ -23,8 +32,9 @@ class AddTrackCommand(Command):
         
     def undo(self):
         if self.track_id is not None:
-            # Remove from engine
-            del self.window.audio_engine.tracks[self.track_id]
+            # Keep the audio and clips for redo
+            self.detached = self.window.audio_engine.detach_track(self.track_id)
+            self.window.timeline.remove_track(self.track_id)
             
             # Remove widget
             for i in reversed(range(self.window.tracks_layout.count())): 
@@ -39,4 +49,9 @@ class AddTrackCommand(Command):
                 self.window.track_list.takeItem(self.window.track_list.row(items[0]))
             
             if not self.window.audio_engine.tracks:
-                self.window.play_button.setEnabled(False)
\ No newline at end of file
+                self.window.play_button.setEnabled(False)
+
+    def release(self):
+        if self.detached is not None:
+            self.window.audio_engine.release_track(self.detached)
+            self.detached = None
@@ -1,25 +1,34 @@
 from PyQt6.QtWidgets import (QMainWindow,   QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QLabel, QListWidget, QFileDialog, QMessageBox, QScrollArea, QSlider, QSplitter)
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction
 from audio.engine import AudioEngine
-import json
+from audio.transport import ENDED, PAUSED, PLAYING, STOPPED
+from audio.container import (CONTAINER_EXTENSION, ContainerLoader, ContainerReader,
+                             is_container, save_container)
+from audio.project import ProjectLoader, read_project, save_project
+import logging
 import os
+import numpy as np
 from pathlib import Path
-import soundfile as sf
-from commands.base import Command
+from time import perf_counter
+from commands.history import History
 from commands.track_commands import AddTrackCommand
 from .timeline_widget import TimelineWidget
 from .track_widget import TrackWidget
 
+logger = logging.getLogger(__name__)
+
 class MainWindow(QMainWindow):
+    # Emitted from loader threads as each track of an opened project loads
+    track_loaded = pyqtSignal(int)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SoundByte")
         self.setGeometry(100, 100, 800, 600)
         
         # Initialize core components
-        self.undo_stack = []
-        self.redo_stack = []
+        self.history = History(on_change=self.update_edit_actions)
         self.audio_engine = AudioEngine()
         
         # Create central widget and main layout
@@ -96,6 +105,11 @@ class MainWindow(QMainWindow):
         transport_layout.addWidget(self.seek_slider)
         transport_layout.addStretch()
         
+        # DSP load of the audio callback against its real-time budget
+        self.cpu_label = QLabel("DSP 0%")
+        self.cpu_label.setStyleSheet("color: #ddd; font-family: monospace; font-size: 12px;")
+        transport_layout.addWidget(self.cpu_label)
+        
         main_layout.addWidget(transport_widget)
         
         # Create main splitter
@@ -136,7 +150,7 @@ class MainWindow(QMainWindow):
         sequencer_layout.setContentsMargins(0, 0, 0, 0)
         
         self.timeline = TimelineWidget()
-        self.timeline.set_engine(self.audio_engine)
+        self.timeline.import_progress.connect(self.show_import_progress)
         sequencer_layout.addWidget(self.timeline)
         
         # Add both panels to splitter
@@ -149,44 +163,25 @@ class MainWindow(QMainWindow):
         # Create menu bar
         self.create_menu_bar()
         
-        # Timer for updates
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_time_display)
-        self.timer.start(100)  # Update every 100ms
+        # Animates the position at the display's refresh rate, only while
+        # playing; transport events start and stop it
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.frame_timer.timeout.connect(self.on_frame)
+        self.shown_second = None
+        self.meter_updated = 0.0
+        self.bind_engine()
         
         self.current_project_path = None
         self.project_modified = False
+        # Background track loading started by open_project
+        self.project_loader = None
+        self.loading_tracks = 0
+        self.track_loaded.connect(self.on_track_loaded)
     
         def connect_track_signals(track_widget):
             track_widget.clip_import_requested.connect(self.timeline.set_pending_clip)
     
-    def add_track(self):
-        # Debug print current state
-        print("Current layout items before adding:")
-        for i in range(self.tracks_layout.count()):
-            widget = self.tracks_layout.itemAt(i).widget()
-            print(f"Item {i}: {type(widget).__name__}")
-
-        # Get number of actual tracks (excluding Add Track button and spacer)
-        existing_tracks = []
-        for i in range(self.tracks_layout.count()):
-            widget = self.tracks_layout.itemAt(i).widget()
-            if isinstance(widget, TrackWidget):
-                existing_tracks.append(widget)
-        
-        # Set track_id based on number of existing tracks
-        track_id = len(existing_tracks) - 1# Start from 1
-        print(f"Creating new track with ID: {track_id}")
-        
-        track_widget = TrackWidget(track_id, self.audio_engine)
-        track_widget.clip_import_requested.connect(self.timeline.set_pending_clip)
-        
-        # Insert at position 1 (after Add Track button)
-        self.tracks_layout.insertWidget(1, track_widget)
-        self.timeline.tracks.append(track_id)
-        
-        return track_id
-        
     def create_menu_bar(self):
         """Create and setup the menu bar"""
         menubar = self.menuBar()
@@ -220,6 +215,10 @@ class MainWindow(QMainWindow):
         save_as_action.setShortcut("Ctrl+Shift+S")
         save_as_action.triggered.connect(self.save_project_as)
         file_menu.addAction(save_as_action)
+        
+        perf_action = QAction("Export &Performance Log...", self)
+        perf_action.triggered.connect(self.export_performance_log)
+        file_menu.addAction(perf_action)
 
         # Edit menu
         edit_menu = menubar.addMenu("&Edit")
@@ -250,39 +249,112 @@ class MainWindow(QMainWindow):
             elif reply == QMessageBox.StandardButton.Cancel:
                 event.ignore()
                 return
+        self.audio_engine.close()
         event.accept()
      
     def add_track(self):
-        track_id = len(self.tracks_layout)
-        track_widget = TrackWidget(track_id, self.audio_engine)
+        """Add an empty track for clips to be imported onto"""
+        engine = self.audio_engine
+        track_id = engine.add_data_track(np.zeros((0, engine.channels), dtype=np.float32),
+                                         engine.sample_rate, f"Track {len(engine.tracks) + 1}")
+        track_widget = TrackWidget(track_id, engine, history=self.history)
+        track_widget.clip_import_requested.connect(self.timeline.set_pending_clip)
         self.tracks_layout.addWidget(track_widget)
+        self.timeline.add_track(track_id)
+        self.update_transport_controls()
+        self.mark_project_modified()
+        return track_id
     
-    def update_playhead(self):
-        if self.audio_engine.playing:
-            self.timeline.playhead_pos = (
-                self.audio_engine.current_frame / 
-                self.audio_engine.sample_rate
-            )
-            self.timeline.update()
+    def bind_engine(self):
+        """Point the views at a new `audio_engine` and follow its transport"""
+        self.timeline.set_engine(self.audio_engine)
+        self.audio_engine.transport.subscribe(self.on_transport_event)
+        self.on_transport_event(STOPPED, 0)
             
     def seek_changed(self, value):
         frame = int((value / 100.0) * self.audio_engine.get_total_frames())
         self.audio_engine.seek(frame)
+    
+    def on_transport_event(self, event: str, frame: int):
+        """Engine transport changes; ENDED arrives through the frame tick"""
+        if event == ENDED:
+            self.audio_engine.stop()
+            return
+        if event == PLAYING:
+            rate = self.screen().refreshRate() if self.screen() else 0
+            self.frame_timer.start(round(1000 / (rate or 60)))
+        elif event in (PAUSED, STOPPED):
+            self.frame_timer.stop()
+        self.update_transport_controls()
+        self.update_time_display()
+    
+    def on_frame(self):
+        # Delivers events the audio thread posted, such as ENDED
+        self.audio_engine.transport.dispatch()
+        self.update_time_display()
          
     def update_time_display(self):
-        self.timeline.current_position = self.audio_engine.current_frame
-        self.timeline.update()
-        
-        if self.audio_engine.playing:
-            seconds = self.audio_engine.current_frame / self.audio_engine.sample_rate
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            seconds = int(seconds % 60)
-            self.time_label.setText(f"{hours:02d}:{minutes:02d}:{seconds:02d}")
-            
-            # Check if playback finished
-            if self.audio_engine.current_frame >= max(len(track.data) for track in self.audio_engine.tracks.values()):
-                self.stop()
+        """Show the position being heard, see TransportState.position"""
+        seconds = self.audio_engine.transport.state.position() / self.audio_engine.sample_rate
+        # Each of these only repaints when what it shows has changed
+        self.timeline.update_playhead(seconds)
+        self.show_seek_position(seconds * self.audio_engine.sample_rate)
+        whole = int(seconds)
+        if whole != self.shown_second:
+            self.shown_second = whole
+            self.time_label.setText(f"{whole // 3600:02d}:{whole % 3600 // 60:02d}:{whole % 60:02d}")
+        
+        now = perf_counter()
+        if now - self.meter_updated >= 0.1:
+            self.meter_updated = now
+            self.update_cpu_meter()
+    
+    def show_seek_position(self, frame: float):
+        """Move the seek slider without seeking"""
+        total = self.audio_engine.get_total_frames()
+        value = int(frame / total * 100) if total else 0
+        if value != self.seek_slider.value():
+            self.seek_slider.blockSignals(True)
+            self.seek_slider.setValue(value)
+            self.seek_slider.blockSignals(False)
+    
+    def on_track_loaded(self, track_id: int):
+        """Report load errors once every track of the opened project is in"""
+        self.loading_tracks -= 1
+        if self.loading_tracks > 0 or self.project_loader is None:
+            return
+        for error in self.project_loader.take_errors():
+            QMessageBox.warning(self, "Track Load Warning", error)
+        self.project_loader = None
+        self.update_transport_controls()
+    
+    def update_cpu_meter(self):
+        reading = self.audio_engine.meter.reading()
+        xruns = reading.underflows + reading.overflows
+        text = f"DSP {reading.load_percent:3.0f}% peak {reading.peak_load_percent:3.0f}%"
+        if xruns:
+            text += f" xruns {xruns}"
+        self.cpu_label.setText(text)
+        overloaded = xruns or reading.peak_load_percent > 80
+        self.cpu_label.setStyleSheet(
+            f"color: {'#e55' if overloaded else '#ddd'}; font-family: monospace; font-size: 12px;")
+        
+        # Heaviest tracks first, by share of mixing time
+        heaviest = sorted(reading.track_percent.items(), key=lambda item: -item[1])[:5]
+        names = {track_id: track.name for track_id, track in self.audio_engine.tracks.items()}
+        self.cpu_label.setToolTip("\n".join(
+            f"{names.get(track_id, track_id)}: {percent:.0f}%" for track_id, percent in heaviest))
+    
+    def export_performance_log(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Performance Log", "",
+            "JSON Files (*.json);;CSV Files (*.csv)"
+        )
+        if file_path:
+            try:
+                self.audio_engine.meter.dump(file_path)
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Could not write log: {str(e)}")
     
     def clear_tracks(self):
         """Clear all tracks from layout"""
@@ -306,8 +378,10 @@ class MainWindow(QMainWindow):
             elif reply == QMessageBox.StandardButton.Cancel:
                 return
 
-        self.audio_engine.stop()
+        self.history.clear()
+        self.audio_engine.close()
         self.audio_engine = AudioEngine()
+        self.bind_engine()
         self.clear_tracks()
         self.current_project_path = None
         self.project_modified = False
@@ -333,52 +407,42 @@ class MainWindow(QMainWindow):
             self,
             "Open Project",
             "",
-            "SoundByte Project (*.sbp);;All Files (*.*)"
+            "SoundByte Project (*.sbp *.sbpx);;All Files (*.*)"
         )
         
         if file_name:
             try:
-                with open(file_name, 'r') as f:
-                    project_data = json.load(f)
+                # Binary projects only read their index and session here
+                reader = ContainerReader(file_name) if is_container(file_name) else None
+                project_data = reader.project_data if reader else read_project(file_name)
                 
-                self.audio_engine.stop()
+                self.history.clear()
+                self.audio_engine.close()
                 self.audio_engine = AudioEngine(
                     sample_rate=project_data.get('sample_rate', 44100)
                 )
+                self.bind_engine()
                 
                 self.track_list.clear()
                 
                 project_dir = os.path.dirname(file_name)
-                load_success = True
+                # Tracks are listed and playable as soon as their headers are
+                # read; audio and clips keep loading in the background
+                if reader:
+                    self.project_loader = ContainerLoader(self.audio_engine, reader)
+                else:
+                    self.project_loader = ProjectLoader(self.audio_engine, project_data,
+                                                        project_dir)
+                track_ids = self.project_loader.open(on_loaded=self.track_loaded.emit)
+                self.loading_tracks = len(track_ids)
+                errors = self.project_loader.take_errors()
+                load_success = not errors
 
-                for track in project_data['tracks']:
-                    track_path = os.path.join(project_dir, track['file'])
-                    if os.path.exists(track_path):
-                        try:
-                            track_id = self.audio_engine.add_track(
-                                track_path,
-                                track['name']
-                            )
-                            self.track_list.addItem(track['name'])
-                            
-                            audio_track = self.audio_engine.tracks[track_id]
-                            audio_track.volume = track['volume']
-                            audio_track.muted = track['muted']
-                            audio_track.solo = track['solo']
-                        except Exception as e:
-                            QMessageBox.warning(
-                                self,
-                                "Track Load Warning",
-                                f"Failed to load track {track['name']}: {str(e)}"
-                            )
-                            load_success = False
-                    else:
-                        QMessageBox.warning(
-                            self,
-                            "Track Load Warning",
-                            f"Track file not found: {track['file']}"
-                        )
-                        load_success = False
+                for track_id in track_ids:
+                    self.track_list.addItem(self.audio_engine.tracks[track_id].name)
+                    self.timeline.add_track(track_id)
+                for error in errors:
+                    QMessageBox.warning(self, "Track Load Warning", error)
                 
                 self.current_project_path = file_name
                 self.project_modified = False
@@ -411,55 +475,28 @@ class MainWindow(QMainWindow):
         self.stop_button.setEnabled(is_playing)
         self.pause_button.setEnabled(is_playing)
         
-        # Update seek position
-        if self.audio_engine.get_total_frames() > 0:
-            position = (self.audio_engine.current_frame / 
-                    self.audio_engine.get_total_frames()) * 100
-            self.seek_slider.setValue(int(position))
+        self.show_seek_position(self.audio_engine.transport.state.position())
 
+    # Controls and time display follow from the transport events these cause
     def play(self):
         if self.audio_engine.tracks:
             self.audio_engine.play()
-            self.update_transport_controls()
 
     def stop(self):
         self.audio_engine.stop()
-        self.update_transport_controls()
-        self.time_label.setText("00:00:00")
 
     def pause(self):
         self.audio_engine.pause()
-        self.update_transport_controls()
     
     def save_project(self):
         if not self.current_project_path:
             return self.save_project_as()
             
         try:
-            project_dir = os.path.dirname(self.current_project_path)
-            
-            project_data = {
-                'version': '1.0',
-                'sample_rate': self.audio_engine.sample_rate,
-                'tracks': []
-            }
-            
-            for track_id, track in self.audio_engine.tracks.items():
-                track_filename = f"track_{track_id}.wav"
-                track_path = os.path.join(project_dir, track_filename)
-                sf.write(track_path, track.data, track.sample_rate)
-                
-                track_data = {
-                    'name': track.name,
-                    'file': track_filename,
-                    'volume': track.volume,
-                    'muted': track.muted,
-                    'solo': track.solo
-                }
-                project_data['tracks'].append(track_data)
-            
-            with open(self.current_project_path, 'w') as f:
-                json.dump(project_data, f, indent=4)
+            if self.current_project_path.endswith(CONTAINER_EXTENSION):
+                save_container(self.audio_engine, self.current_project_path)
+            else:
+                save_project(self.audio_engine, self.current_project_path)
                 
             self.project_modified = False
             
@@ -473,16 +510,16 @@ class MainWindow(QMainWindow):
         return True
 
     def save_project_as(self):
-        file_name, _ = QFileDialog.getSaveFileName(
+        file_name, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Save Project",
             "",
-            "SoundByte Project (*.sbp);;All Files (*.*)"
+            "SoundByte Project (*.sbp);;SoundByte Single-File Project (*.sbpx);;All Files (*.*)"
         )
         
         if file_name:
-            if not file_name.endswith('.sbp'):
-                file_name += '.sbp'
+            if not file_name.endswith(('.sbp', CONTAINER_EXTENSION)):
+                file_name += CONTAINER_EXTENSION if '*.sbpx' in selected_filter else '.sbp'
             
             self.current_project_path = file_name
             if self.save_project():
@@ -491,24 +528,18 @@ class MainWindow(QMainWindow):
         return False
 
     def undo(self):
-        if self.undo_stack:
-            command = self.undo_stack.pop()
-            command.undo()
-            self.redo_stack.append(command)
+        if self.history.undo():
             self.mark_project_modified()
     
     def redo(self):
-        if self.redo_stack:
-            command = self.redo_stack.pop()
-            command.execute()
-            self.undo_stack.append(command)
+        if self.history.redo():
             self.mark_project_modified()
     
     def update_edit_actions(self):
         if hasattr(self, 'undo_action'):
-            self.undo_action.setEnabled(bool(self.undo_stack))
+            self.undo_action.setEnabled(self.history.can_undo)
         if hasattr(self, 'redo_action'):
-            self.redo_action.setEnabled(bool(self.redo_stack))
+            self.redo_action.setEnabled(self.history.can_redo)
     
     def mark_project_modified(self):
         """Call this whenever project state changes"""
@@ -520,21 +551,20 @@ class MainWindow(QMainWindow):
             
     def zoom_in(self):
         self.timeline.zoom_level *= 1.2
-        self.timeline.update()
         
     def zoom_out(self):
         self.timeline.zoom_level /= 1.2
-        self.timeline.update()
+
+    def show_import_progress(self, done: int, total: int):
+        """Report background clip imports, and their failures once a batch ends"""
+        if done < total:
+            self.statusBar().showMessage(f"Importing clips {done}/{total}")
+            return
+        self.statusBar().showMessage(f"Imported {total} clips", 3000)
+        errors = self.timeline.importer.take_errors()
+        if errors:
+            QMessageBox.warning(self, "Import Warning", "\n".join(errors))
 
     def autosave_project(self):
         if self.current_project_path and self.project_modified:
             self.save_project()
-        
-    def add_clip_to_timeline(self, track_id, start_time, audio_data):
-        if track_id not in self.timeline.clips:
-            self.timeline.clips[track_id] = []
-            
-        duration = len(audio_data) / self.audio_engine.sample_rate
-        clip = (start_time, start_time + duration, audio_data)
-        self.timeline.clips[track_id].append(clip)
-        self.timeline.update()
\ No newline at end of file
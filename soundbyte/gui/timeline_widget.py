@@ -1,19 +1,39 @@
 from PyQt6.QtWidgets import QWidget, QScrollArea
-from PyQt6.QtGui import QPainter, QPen, QColor, QBrush
-from PyQt6.QtCore import Qt, QRect, QSize, QPointF
+from PyQt6.QtGui import QPainter, QPen, QColor, QBrush, QPolygonF, QPixmap
+from PyQt6.QtCore import Qt, QRect, QSize, QPointF, pyqtSignal
+from audio.importer import ClipImporter
+from audio.peaks import PeakCache
+from audio.trace import span
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 class TimelineWidget(QWidget):
+    # Emitted from the peak builder thread; Qt queues it to the GUI thread
+    peaks_ready = pyqtSignal(str)
+    # Emitted from import workers: (files done, files queued), and
+    # (track_id, clip_id) once a clip's audio is loaded
+    import_progress = pyqtSignal(int, int)
+    clip_loaded = pyqtSignal(int, int)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(40)
+        
+        # Grid and clips are drawn into this pixmap and only redrawn where
+        # invalidated; paintEvent just blits it and adds the playhead
+        self._static_cache = None
+        self._static_dirty = QRect()
+        
         self.zoom_level = 50
         self.grid_size = 16
         self.track_height = 40
+        # Engine track IDs, one row each from the top; see add_track
         self.tracks = []
-        self.clips = {}
         self.playhead_pos = 0
         self.engine = None
+        self.importer = None
         self.setAcceptDrops(True)
         self.pending_clip_import = None
         self.setCursor(Qt.CursorShape.CrossCursor)
@@ -22,126 +42,260 @@ class TimelineWidget(QWidget):
         self.drag_start = None
         self.dragged_clip = None
         self.drag_offset = 0
+        
+        # Waveform overviews, built in the background on first use
+        self.peaks_ready.connect(lambda _: self.invalidate())
+        self.peak_cache = PeakCache(on_ready=self.peaks_ready.emit)
+        self.clip_loaded.connect(lambda *_: self.invalidate())
+    
+    @property
+    def zoom_level(self):
+        return self._zoom_level
+    
+    @zoom_level.setter
+    def zoom_level(self, value):
+        self._zoom_level = value
+        self.invalidate()
+    
+    def invalidate(self, rect: QRect = None):
+        """
+        Mark part of the static layer (grid and clips) as stale, or all of it.
+        Call after editing clips or tracks; zoom changes do this themselves.
+        """
+        if rect is None:
+            rect = self.rect()
+        self._static_dirty = self._static_dirty.united(rect)
+        self.update(rect)
     
     def set_engine(self, engine):
         """Set audio engine reference"""
         self.engine = engine
+        # Rows belong to the previous engine's tracks
+        self.tracks = []
+        self.updateGeometry()
+        if self.importer is not None:
+            self.importer.shutdown()
+        # Clips are placed at once and decoded in the background
+        self.importer = ClipImporter(engine, self.peak_cache,
+                                     on_progress=self.import_progress.emit,
+                                     on_loaded=self.clip_loaded.emit)
+        self.invalidate()
         
+    def add_track(self, track_id: int):
+        """Give an engine track a row below the others"""
+        if track_id not in self.tracks:
+            self.tracks.append(track_id)
+            self.updateGeometry()
+            self.invalidate()
+
+    def remove_track(self, track_id: int):
+        """Drop a track's row; the rows below it move up"""
+        if track_id in self.tracks:
+            self.tracks.remove(track_id)
+            self.updateGeometry()
+            self.invalidate()
+
     def set_pending_clip(self, track_id: int, file_path: str):
         """Set clip waiting for placement"""
-        print(f"Ready to place clip: track {track_id}, file {file_path}")
+        logger.debug("Ready to place clip: track %d, file %s", track_id, file_path)
         self.pending_clip_import = (track_id, file_path)
         self.setCursor(Qt.CursorShape.CrossCursor)
            
-    def draw_grid(self, painter):
+    def draw_grid(self, painter, rect: QRect):
         """Draw timeline grid"""
         # Set grid pen
         grid_pen = QPen(QColor(40, 40, 40))
         painter.setPen(grid_pen)
         
         # Draw background
-        painter.fillRect(self.rect(), QColor(30, 30, 30))
+        painter.fillRect(rect, QColor(30, 30, 30))
         
-        # Draw vertical time divisions
-        seconds_visible = self.width() / self.zoom_level
-        for x in range(0, self.width(), int(self.zoom_level)):
+        # Draw vertical time divisions inside rect only
+        step = max(1, int(self.zoom_level))
+        first = (max(0, rect.left() - 1) // step) * step
+        for x in range(first, rect.right() + 2, step):
             # Major lines every second
             if x % self.zoom_level == 0:
                 painter.setPen(QPen(QColor(60, 60, 60), 2))
             else:
                 # Minor lines for subdivisions
                 painter.setPen(QPen(QColor(40, 40, 40)))
-            painter.drawLine(x, 0, x, self.height())
+            painter.drawLine(x, rect.top(), x, rect.bottom())
             
         # Draw horizontal track divisions
         for y in range(0, len(self.tracks) * self.track_height, self.track_height):
-            painter.setPen(QPen(QColor(60, 60, 60)))
-            painter.drawLine(0, y, self.width(), y)
+            if rect.top() <= y <= rect.bottom():
+                painter.setPen(QPen(QColor(60, 60, 60)))
+                painter.drawLine(rect.left(), y, rect.right(), y)
+    
+    def visible_clips(self, track_id: int, rect: QRect):
+        """
+        Clips of one track that intersect `rect` horizontally, as
+        (start_time, end_time, file_path, offset_time), read from the engine's
+        clip columns; `offset_time` is where in the file the clip starts
+        """
+        track = self.engine.tracks.get(track_id) if self.engine else None
+        if track is None:
+            return []
+        sample_rate = self.engine.sample_rate
+        left = int(rect.left() / self.zoom_level * sample_rate)
+        right = int((rect.right() + 1) / self.zoom_level * sample_rate) + 1
+        columns = track.clips.columns
+        rows = track.clips.window(left, right)
+        starts = columns.start[rows] / sample_rate
+        ends = starts + columns.length[rows] / sample_rate
+        offsets = columns.offset[rows] / sample_rate
+        sources = self.engine.sources
+        return [(start, end, sources[source].path, offset)
+                for start, end, source, offset in zip(starts.tolist(), ends.tolist(),
+                                                      columns.source[rows].tolist(),
+                                                      offsets.tolist())]
 
-    def draw_clips(self, painter):
-        """Draw audio clips"""
+    def draw_clips(self, painter, rect: QRect):
+        """Draw audio clips that intersect rect"""
         clip_brush = QBrush(QColor(60, 100, 160))
+        wave_brush = QBrush(QColor(150, 190, 240))
         
-        for track_id, track_clips in self.clips.items():
-            y = track_id * self.track_height
+        for row, track_id in enumerate(self.tracks):
+            y = row * self.track_height
+            if y > rect.bottom() or y + self.track_height < rect.top():
+                continue
             
-            for start_time, end_time, file_path in track_clips:
+            for start_time, end_time, file_path, offset in self.visible_clips(track_id, rect):
                 x = int(start_time * self.zoom_level)
                 width = int((end_time - start_time) * self.zoom_level)
                 
                 # Draw clip background
                 painter.fillRect(x, y + 2, width, self.track_height - 4, clip_brush)
                 
+                peaks = self.peak_cache.get(file_path)
+                if peaks is not None and width > 0:
+                    self.draw_waveform(painter, peaks, x, y + 2, width, self.track_height - 4,
+                                       wave_brush, rect, offset)
+                
                 # Draw clip name
                 painter.setPen(Qt.GlobalColor.white)
                 clip_name = os.path.basename(file_path)
                 painter.drawText(x + 4, y + self.track_height//2, clip_name)
+    
+    def draw_waveform(self, painter, peaks, x, y, width, height, brush, rect: QRect,
+                      offset: float = 0.0):
+        """
+        Draw the visible part of a clip's min/max envelope, one peak bin per
+        pixel, starting `offset` seconds into the file
+        """
+        left = max(x, rect.left())
+        right = min(x + width, rect.right() + 1)
+        if right <= left:
+            return
+        frames_per_pixel = peaks.sample_rate / self.zoom_level
+        first = offset * peaks.sample_rate + (left - x) * frames_per_pixel
+        mins, maxs = peaks.pixels(first, frames_per_pixel, right - left)
+        mid = y + height / 2
+        half = height / 2
+        top = mid - maxs.clip(-1, 1) * half
+        bottom = mid - mins.clip(-1, 1) * half
+        xs = range(left, right)
+        outline = [QPointF(px, py) for px, py in zip(xs, top.tolist())]
+        outline += [QPointF(px, py) for px, py in zip(reversed(xs), bottom[::-1].tolist())]
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(brush)
+        painter.drawPolygon(QPolygonF(outline))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+    
+    def render_static(self):
+        """Redraw the invalidated part of the cached grid and clip layer"""
+        ratio = self.devicePixelRatioF()
+        size = self.size() * ratio
+        if self._static_cache is None or self._static_cache.size() != size:
+            self._static_cache = QPixmap(size)
+            self._static_cache.setDevicePixelRatio(ratio)
+            self._static_dirty = self.rect()
+        
+        dirty = self._static_dirty.intersected(self.rect())
+        self._static_dirty = QRect()
+        if dirty.isEmpty():
+            return
+        
+        with span("paint", width=dirty.width(), height=dirty.height()):
+            painter = QPainter(self._static_cache)
+            painter.setClipRect(dirty)
+            self.draw_grid(painter, dirty)
+            self.draw_clips(painter, dirty)
+            painter.end()
+    
+    def playhead_x(self) -> int:
+        return int(self.playhead_pos * self.zoom_level)
                    
     def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Draw grid
-        self.draw_grid(painter)
+        self.render_static()
         
-        # Draw clips
-        self.draw_clips(painter)
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.drawPixmap(rect, self._static_cache, QRect(
+            rect.topLeft() * self.devicePixelRatioF(),
+            rect.size() * self.devicePixelRatioF()))
         
         # Draw playhead
-        if self.playhead_pos > 0:
+        x = self.playhead_x()
+        if self.playhead_pos > 0 and rect.left() - 2 <= x <= rect.right() + 2:
             painter.setPen(QPen(Qt.GlobalColor.red, 2))
-            x = int(self.playhead_pos * self.zoom_level)
-            painter.drawLine(x, 0, x, self.height())
+            painter.drawLine(x, rect.top(), x, rect.bottom())
+    
+    def resizeEvent(self, event):
+        self.invalidate()
+        super().resizeEvent(event)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and self.pending_clip_import:
             if not self.engine:
-                print("No engine reference set")
+                logger.warning("No engine reference set")
                 return
                 
             track_id, file_path = self.pending_clip_import
-            click_time = event.x() / self.zoom_level
-            start_frame = int(click_time * self.engine.sample_rate)
-            
-            print(f"Adding clip at frame {start_frame}")
-            success = self.engine.add_clip(track_id, file_path, start_frame)
+            start_frame = self.frame_at(event.position().x())
             
-            if success:
-                if track_id not in self.clips:
-                    self.clips[track_id] = []
-                    
-                # Get audio file length
-                import soundfile as sf
-                audio_data, sr = sf.read(file_path)
-                duration = len(audio_data) / sr
-                
-                self.clips[track_id].append((click_time, click_time + duration, file_path))
+            logger.debug("Adding clip at frame %d", start_frame)
+            # The engine's clip table is what gets drawn, nothing to mirror here
+            self.importer.submit(track_id, [file_path], start_frame)
                 
             self.pending_clip_import = None
             self.setCursor(Qt.CursorShape.ArrowCursor)
-            self.update()
-            
-            # For debugging
-            print(f"Clips after adding: {self.clips}")
+            self.invalidate()
+    
+    def frame_at(self, x: float) -> int:
+        return int(x / self.zoom_level * self.engine.sample_rate)
+    
+    def track_at(self, y: float):
+        """Track drawn at height `y`, or None"""
+        row = int(y // self.track_height)
+        return self.tracks[row] if 0 <= row < len(self.tracks) else None
+    
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+    
+    def dragMoveEvent(self, event):
+        if self.track_at(event.position().y()) is not None:
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+    
+    def dropEvent(self, event):
+        """Import dropped files end to end on the track under the cursor"""
+        track_id = self.track_at(event.position().y())
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if track_id is None or not paths or not self.engine:
+            event.ignore()
+            return
+        self.importer.submit(track_id, paths, self.frame_at(event.position().x()))
+        event.acceptProposedAction()
+        self.invalidate()
         
     def sizeHint(self):
         width = int(60 * self.zoom_level)  # 60 seconds default width
         height = len(self.tracks) * self.track_height
         return QSize(width, height)
-    
-    def set_pending_clip(self, track_id: int, file_path: str):
-        """Set clip waiting for placement"""
-        self.pending_clip_import = (track_id, file_path)
-        
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton and self.pending_clip_import:
-            track_id, file_path = self.pending_clip_import
-            click_time = event.x() / self.zoom_level
-            start_frame = int(click_time * self.engine.sample_rate)
-            
-            self.engine.add_clip(track_id, file_path, start_frame)
-            self.pending_clip_import = None
-            self.update()
         
     def mouseMoveEvent(self, event):
         if self.drag_start:
@@ -149,8 +303,15 @@ class TimelineWidget(QWidget):
             # Update clip position
             
     def update_playhead(self, position):
+        """Move the playhead, repainting only the strips it leaves and enters"""
+        old_x = self.playhead_x() if self.playhead_pos > 0 else None
         self.playhead_pos = position
-        self.update()
+        new_x = self.playhead_x() if self.playhead_pos > 0 else None
+        if old_x == new_x:
+            return
+        for x in (old_x, new_x):
+            if x is not None:
+                self.update(QRect(x - 2, 0, 5, self.height()))
         
     def snap_to_grid(self, x_pos):
         """Snap position to nearest grid line"""
@@ -1,17 +1,23 @@
 from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, 
                            QSlider, QPushButton, QLabel, QFileDialog,QMessageBox)
 from PyQt6.QtCore import Qt, pyqtSignal
+import logging
 import os
+from commands.audio_commands import SetTrackVolumeCommand
+
+logger = logging.getLogger(__name__)
 
 class TrackWidget(QWidget):
     clip_import_requested = pyqtSignal(int, str)
     
-    def __init__(self, track_id: int, engine, parent=None):
+    def __init__(self, track_id: int, engine, parent=None, history=None):
         super().__init__(parent)
-        track_id = track_id - 1
+        # The engine's id; fader and import requests are addressed by it
         self.track_id = track_id
-        print(f"Creating TrackWidget with ID: {track_id}")
+        logger.debug("Creating TrackWidget with ID: %d", track_id)
         self.engine = engine
+        # Fader moves are recorded here when set, see commands.History
+        self.history = history
         self.setFixedHeight(80)
         
         layout = QHBoxLayout(self)
@@ -19,7 +25,7 @@ class TrackWidget(QWidget):
         layout.setSpacing(4)
         
         # Track name label
-        display_number = track_id
+        display_number = track_id + 1
         self.name_label = QLabel(f"Track {display_number}")
         self.name_label.setStyleSheet("""
             QLabel {
@@ -73,8 +79,19 @@ class TrackWidget(QWidget):
     def volume_changed(self, value):
         """Add volume level indicator"""
         volume = value / 100.0
-        self.engine.set_track_volume(self.track_id, volume)
+        if self.history is not None:
+            self.history.execute(SetTrackVolumeCommand(
+                self.engine, self.track_id, volume, on_applied=self.show_volume))
+        else:
+            self.engine.set_track_volume(self.track_id, volume)
         self.volume_slider.setToolTip(f"{value}%")
+
+    def show_volume(self, volume: float):
+        """Move the slider to `volume` without recording another change"""
+        self.volume_slider.blockSignals(True)
+        self.volume_slider.setValue(round(volume * 100))
+        self.volume_slider.blockSignals(False)
+        self.volume_slider.setToolTip(f"{round(volume * 100)}%")
         
     def import_audio(self):
         try:
@@ -85,7 +102,7 @@ class TrackWidget(QWidget):
                 "Audio Files (*.wav *.mp3 *.ogg)"
             )
             if file_path:
-                print(f"Emitting clip_import_requested for track {self.track_id}")
+                logger.debug("Emitting clip_import_requested for track %d", self.track_id)
                 self.clip_import_requested.emit(self.track_id, file_path)
                 self.name_label.setText(os.path.splitext(os.path.basename(file_path))[0])
                 return True
@@ -1,12 +1,19 @@
 import sys
 from PyQt6.QtWidgets import QApplication
 from gui.main_window import MainWindow
+from utils.config import configure_logging
 
 def main():
+    configure_logging()
+    # Offline rendering runs without a window or an audio device
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        from render import main as render_main
+        sys.exit(render_main(sys.argv[2:]))
+
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
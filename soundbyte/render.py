@@ -0,0 +1,45 @@
+import argparse
+import sys
+from audio.render import DEFAULT_BLOCK_SIZE, render_project
+
+def main(argv=None):
+    """Render a project to an audio file: render project.sbp out.wav"""
+    parser = argparse.ArgumentParser(
+        prog="soundbyte render",
+        description="Render a SoundByte project to an audio file, faster than real time"
+    )
+    parser.add_argument("project", help="Project file (.sbp or .sbpx)")
+    parser.add_argument("output", help="Output audio file, format follows the extension")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                        help="Frames rendered per block")
+    parser.add_argument("--subtype", default=None,
+                        help="Sample format, e.g. PCM_16, PCM_24 or FLOAT")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="Worker threads used to mix tracks")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress")
+    args = parser.parse_args(argv)
+
+    def report(done, total):
+        print(f"\rRendering {done * 100 // max(total, 1):3d}%", end="", file=sys.stderr)
+
+    try:
+        stats = render_project(
+            args.project,
+            args.output,
+            block_size=args.block_size,
+            subtype=args.subtype,
+            threads=args.threads,
+            progress=None if args.quiet else report
+        )
+    except Exception as e:
+        print(f"Render failed: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Rendered {stats.audio_seconds:.2f}s in {stats.wall_seconds:.2f}s "
+          f"({stats.realtime_factor:.1f}x realtime) to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from audio.trace import realtime_log, tracer
+
+# Environment overrides, so a packaged build can be diagnosed without flags
+LOG_LEVEL_ENV = "SOUNDBYTE_LOG_LEVEL"
+LOG_FILE_ENV = "SOUNDBYTE_LOG_FILE"
+TRACE_ENV = "SOUNDBYTE_TRACE"
+
+DEFAULT_LOG_LEVEL = "WARNING"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s [%(threadName)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None, log_file: Optional[str] = None,
+                      trace_path: Optional[str] = None):
+    """
+    Set up logging and tracing for the application; call once at startup
+
+    Every logger hands its records to a queue, and a listener thread does
+    the formatting and writing, so logging never blocks on the console or
+    disk. The audio thread logs through `audio.trace.realtime_log`, which
+    does not even take the queue's lock.
+
+    Args:
+        level: Log level name, defaults to $SOUNDBYTE_LOG_LEVEL or WARNING
+        log_file: Also write the log here, defaults to $SOUNDBYTE_LOG_FILE
+        trace_path: Record load/save/mix/paint spans and write them to
+            this file as Chrome trace events at exit, defaults to
+            $SOUNDBYTE_TRACE; tracing is off when unset
+    """
+    global _listener
+    level = (level or os.environ.get(LOG_LEVEL_ENV) or DEFAULT_LOG_LEVEL).upper()
+    log_file = log_file or os.environ.get(LOG_FILE_ENV)
+    trace_path = trace_path or os.environ.get(TRACE_ENV)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(records)]
+    root.setLevel(level)
+
+    if _listener is not None:
+        _listener.stop()
+    else:
+        atexit.register(_shutdown)
+    _listener = QueueListener(records, *handlers)
+    _listener.start()
+    realtime_log.start()
+
+    if trace_path:
+        tracer.enabled = True
+        atexit.register(tracer.dump, trace_path)
+
+
+def _shutdown():
+    global _listener
+    # Flush the audio thread's records into the queue before it closes
+    realtime_log.stop()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
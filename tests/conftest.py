@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep decoded and resampled audio out of the user's cache"""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("SOUNDBYTE_CACHE_DIR", str(path))
+    return path
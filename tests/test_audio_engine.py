@@ -1,15 +1,23 @@
+import numpy as np
+import soundfile as sf
 from soundbyte.audio.engine import AudioEngine
 
-def test_add_track():
-    engine = AudioEngine()
-    track_id = engine.add_track("test.wav")
+
+def write_wav(tmp_path):
+    path = tmp_path / "test.wav"
+    sf.write(path, np.zeros((1000, 2)), 44100, subtype="FLOAT")
+    return str(path)
+
+def test_add_track(tmp_path):
+    engine = AudioEngine(open_stream=False)
+    track_id = engine.add_track(write_wav(tmp_path))
     assert track_id is not None
     assert track_id in engine.tracks
 
-def test_playback():
-    engine = AudioEngine()
-    track_id = engine.add_track("test.wav")
+def test_playback(tmp_path):
+    engine = AudioEngine(open_stream=False)
+    track_id = engine.add_track(write_wav(tmp_path))
     engine.play()
     assert engine.playing
     engine.stop()
-    assert not engine.playing
\ No newline at end of file
+    assert not engine.playing
@@ -0,0 +1,69 @@
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.automation import Envelope
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.mixer import Mixer, TrackState
+from soundbyte.audio.session import ClipTable
+
+
+def test_evaluate_matches_linear_interpolation():
+    envelope = Envelope()
+    frames, values = [100, 150, 150, 400, 1000], [0.0, 1.0, 0.5, 0.25, 1.0]
+    envelope.set_points(frames, values)
+    out = np.empty(256, dtype=np.float32)
+    offsets = np.arange(256, dtype=np.float32)
+    for start in (0, 90, 140, 300, 900):
+        result = envelope.evaluate(start, 256, out, offsets)
+        positions = np.arange(start, start + 256)
+        expected = np.interp(positions, frames, values)
+        # Duplicate frames are a step; interp takes the later value there
+        expected[positions == 150] = 0.5
+        assert np.allclose(result, expected, atol=1e-6)
+
+    assert envelope.evaluate(1000, 256, out, offsets) == 1.0
+    assert envelope.evaluate(-300, 256, out, offsets) == 0.0
+    assert Envelope(0.5).evaluate(0, 256, out, offsets) == 0.5
+
+
+def test_edits_publish_points_and_default_together():
+    envelope = Envelope(1.0)
+    envelope.ramp_to(100, 0.5, 10)
+    ramp = envelope.state
+    assert ramp.default == 0.5 and list(ramp.points.values) == [1.0, 0.5]
+
+    envelope.set(0.25)
+    # The ramp the audio thread may still be reading is left untouched
+    assert ramp.default == 0.5 and len(ramp.points.frames) == 2
+    assert envelope.state.default == 0.25 and not len(envelope.state.points.frames)
+
+
+def test_mixer_applies_envelopes_per_frame():
+    data = np.ones((64, 2), dtype=np.float32)
+    fader = Envelope()
+    fader.ramp_to(16, 0.0, 32)
+    track = TrackState(data, 0.5, ClipTable(), envelopes=(fader,))
+    out = np.empty((64, 2), dtype=np.float32)
+    Mixer(channels=2, max_frames=64, limit=False).render(out, (track,), 0, 64)
+    expected = 0.5 * np.interp(np.arange(64), [16, 48], [1.0, 0.0])
+    assert np.allclose(out[:, 0], expected, atol=1e-6)
+    assert np.allclose(out[:, 1], expected, atol=1e-6)
+
+
+def test_fader_moves_ramp_while_playing_and_settle_on_seek(tmp_path):
+    sf.write(tmp_path / "pad.wav", np.full((44100, 2), 0.5), 44100, subtype="FLOAT")
+    engine = AudioEngine(open_stream=False)
+    track_id = engine.add_track(str(tmp_path / "pad.wav"))
+    fader = engine.tracks[track_id].fader
+
+    engine.set_track_volume(track_id, 0.5)
+    assert len(fader) == 0 and fader.value_at(0) == 0.5
+
+    engine.playing = True
+    engine.current_frame = 1000
+    engine.set_track_volume(track_id, 1.0)
+    assert fader.value_at(1000) == 0.5
+    assert fader.value_at(1000 + int(0.02 * 44100)) == 1.0
+
+    engine.playing = False
+    engine.seek(0)
+    assert len(fader) == 0 and fader.value_at(0) == 1.0
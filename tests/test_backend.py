@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+import soundfile as sf
+from soundbyte.audio import backend as backends
+from soundbyte.audio.backend import FileSinkBackend, NullBackend
+from soundbyte.audio.engine import AudioEngine
+
+
+def wait_for_blocks(backend, count, timeout=10):
+    started = time.monotonic()
+    while backend.blocks < count and time.monotonic() - started < timeout:
+        time.sleep(0.001)
+
+
+def test_engine_falls_back_to_null_backend_without_a_device(monkeypatch):
+    def no_device(*args):
+        raise OSError("no default output device")
+    monkeypatch.setattr(backends.SoundDeviceBackend, "open", no_device)
+    engine = AudioEngine()
+    assert isinstance(engine.backend, NullBackend)
+
+
+def test_null_backend_runs_callbacks_and_process_is_synchronous(tmp_path):
+    sf.write(tmp_path / "a.wav", np.full((44100, 2), 0.25), 44100, subtype="FLOAT")
+    backend = NullBackend()
+    engine = AudioEngine(buffer_size=256, backend=backend)
+    engine.add_track(str(tmp_path / "a.wav"))
+    engine.play()
+    wait_for_blocks(backend, 4)
+    engine.pause()
+    assert backend.blocks >= 4
+    assert engine.current_frame == 256 * backend.blocks
+
+    engine.playing = True
+    backend.process(3)
+    assert engine.current_frame == 256 * backend.blocks
+    assert engine.meter.reading().callbacks == backend.blocks
+
+
+def test_file_sink_writes_callback_output(tmp_path):
+    sf.write(tmp_path / "a.wav", np.full((44100, 2), 0.25), 44100, subtype="FLOAT")
+    out_path = tmp_path / "out.wav"
+    backend = FileSinkBackend(str(out_path))
+    engine = AudioEngine(buffer_size=512, backend=backend)
+    engine.add_track(str(tmp_path / "a.wav"))
+    engine.play()
+    wait_for_blocks(backend, 8)
+    engine.close()
+
+    written, sample_rate = sf.read(out_path, dtype="float32")
+    assert sample_rate == 44100
+    assert len(written) == 512 * backend.blocks
+    # Past the limiter's look-ahead delay the track comes through unchanged
+    latency = engine.mixer.latency
+    assert np.allclose(written[latency:4096], 0.25)
@@ -0,0 +1,80 @@
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.container import (AUDIO_F32, AUDIO_FLAC, ContainerLoader,
+                                       ContainerReader, is_container, save_container)
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.project import load_project
+
+
+def make_session(tmp_path):
+    pcm = (np.arange(3000).reshape(-1, 2) % 1000 - 500).astype(np.int16)
+    sf.write(tmp_path / "drums.wav", pcm, 44100, subtype="PCM_16")
+    sf.write(tmp_path / "pad.wav", np.full((800, 1), 0.25), 44100, subtype="FLOAT")
+    sf.write(tmp_path / "hit.wav", np.full((100, 2), 0.5), 44100, subtype="FLOAT")
+
+    engine = AudioEngine(open_stream=False)
+    drums = engine.add_track(str(tmp_path / "drums.wav"))
+    pad = engine.add_track(str(tmp_path / "pad.wav"))
+    bus = engine.add_bus("Keys")
+    engine.set_track_output(pad, bus)
+    engine.set_track_volume(pad, 0.5)
+    engine.set_volume_automation(drums, [0, 1000], [1.0, 0.0])
+    clip = engine.add_clip(pad, str(tmp_path / "hit.wav"), 900, gain=0.5)
+    engine.trim_clip(pad, clip, 910, 960)
+    engine.set_clip_fades(pad, clip, 5, 20, 1)
+    return engine, pcm
+
+
+def test_round_trip(tmp_path):
+    engine, pcm = make_session(tmp_path)
+    path = tmp_path / "song.sbpx"
+    save_container(engine, str(path))
+    assert is_container(str(path))
+
+    loaded, errors = load_project(
+        str(path), lambda **kwargs: AudioEngine(open_stream=False, **kwargs))
+    assert errors == []
+    drums, pad = loaded.tracks.values()
+    assert [drums.name, pad.name] == ["drums.wav", "pad.wav"]
+    # 16-bit audio comes back bit-exact from FLAC
+    assert drums.data.dtype == np.int16 and np.array_equal(drums.data, pcm)
+    assert drums.scale == engine.tracks[0].scale
+    assert np.all(pad.data == 0.25) and pad.data.shape == (800, 1)
+    assert pad.volume == 0.5 and loaded.buses[pad.output].name == "Keys"
+    assert drums.volume_automation.points.frames.tolist() == [0, 1000]
+
+    columns = pad.clips.columns
+    assert columns.start.tolist() == [910] and columns.offset.tolist() == [10]
+    assert columns.length.tolist() == [50] and columns.gain.tolist() == [0.5]
+    assert (columns.fade_in[0], columns.fade_out[0], columns.curve[0]) == (5, 20, 1)
+
+
+def test_track_audio_is_reached_through_the_index(tmp_path):
+    engine, pcm = make_session(tmp_path)
+    path = tmp_path / "song.sbpx"
+    save_container(engine, str(path))
+
+    reader = ContainerReader(str(path))
+    assert (AUDIO_FLAC, 0) in reader.chunks and (AUDIO_F32, 1) in reader.chunks
+    # Raw float32 is mapped in place, page aligned
+    pad = reader.track_audio(1)
+    assert isinstance(pad.data, np.memmap)
+    assert reader.chunks[AUDIO_F32, 1].offset % 4096 == 0
+    assert np.all(pad.data == 0.25)
+    assert np.array_equal(reader.track_audio(0).data, pcm)
+
+
+def test_uncompressed_tracks_open_fully_mapped(tmp_path):
+    engine, pcm = make_session(tmp_path)
+    path = tmp_path / "song.sbpx"
+    save_container(engine, str(path), compress=False)
+
+    loaded = AudioEngine(open_stream=False)
+    loader = ContainerLoader(loaded, ContainerReader(str(path)))
+    track_ids = loader.open()
+    # Playable at once: nothing is left to decode
+    drums = loaded.tracks[track_ids[0]]
+    assert isinstance(drums.data, np.memmap) and drums.scale == 1.0
+    assert np.allclose(drums.data, pcm / 2 ** 15)
+    assert loader.wait(timeout=10) == []
+    assert len(loaded.tracks[track_ids[1]].clips) == 1
@@ -0,0 +1,59 @@
+import tracemalloc
+
+import numpy as np
+from soundbyte.audio.dynamics import Limiter, sliding_min
+
+
+def limit(signal, block_size, **kwargs):
+    limiter = Limiter(2, 44100, **kwargs)
+    out = np.empty_like(signal)
+    for start in range(0, len(signal), block_size):
+        limiter.process(signal[start:start + block_size], out[start:start + block_size])
+    return limiter, out
+
+
+def test_sliding_min_matches_brute_force():
+    x = np.random.default_rng(0).normal(size=1000)
+    for window in (1, 7, 64, 1000):
+        expected = [x[i:i + window].min() for i in range(len(x) - window + 1)]
+        assert np.array_equal(sliding_min(x, window), expected)
+
+
+def test_limiter_catches_peaks_without_gain_steps():
+    rng = np.random.default_rng(1)
+    signal = np.tile(0.5 * np.sin(np.arange(20000) * 0.05)[:, None], (1, 2)).astype(np.float32)
+    signal[5000:5010] *= 8
+    signal[12000] = rng.uniform(2, 3, 2)
+
+    limiter, out = limit(signal, 256)
+    assert np.abs(out).max() <= 1.0
+    delayed = signal[:len(signal) - limiter.latency]
+    # Below the ceiling the signal passes untouched, just delayed
+    assert np.allclose(out[limiter.latency:4000], delayed[:4000 - limiter.latency])
+    # The gain moves by a small fraction per frame, never in one jump
+    active = np.abs(delayed[:, 0]) > 0.05
+    gain = out[limiter.latency:, 0][active] / delayed[active, 0]
+    assert np.abs(np.diff(gain)).max() < 0.05
+
+
+def test_limiter_output_does_not_depend_on_block_size():
+    signal = np.random.default_rng(2).uniform(-2, 2, (9000, 2)).astype(np.float32)
+    _, reference = limit(signal, 4096, soft_clip=True)
+    for block_size in (64, 1000):
+        _, out = limit(signal, block_size, soft_clip=True)
+        assert np.allclose(out, reference, atol=1e-6)
+
+
+def test_limiter_does_not_allocate_per_block():
+    signal = np.random.default_rng(3).uniform(-2, 2, (3 * 4096, 2)).astype(np.float32)
+    limiter = Limiter(2, 44100, soft_clip=True, max_frames=4096)
+    out = np.empty((4096, 2), dtype=np.float32)
+    limiter.process(signal[:4096], out)
+    tracemalloc.start()
+    try:
+        limiter.process(signal[4096:8192], out)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # numpy's own bookkeeping only, well under one block of samples
+    assert peak < out.nbytes // 4
@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.commands import EditAudioCommand, History, SetTrackVolumeCommand
+from soundbyte.commands.audio_commands import BLOCK_BYTES
+
+
+def make_engine(tmp_path, frames=200_000, subtype="FLOAT"):
+    path = tmp_path / "take.wav"
+    sf.write(path, np.full((frames, 2), 0.25), 44100, subtype=subtype)
+    engine = AudioEngine(open_stream=False)
+    return engine, engine.add_track(str(path)), path
+
+
+def test_edit_snapshots_only_touched_blocks_and_never_writes_the_source(tmp_path):
+    engine, track_id, path = make_engine(tmp_path)
+    history = History()
+    history.execute(EditAudioCommand(engine, track_id, 10_000, np.full((100, 2), 0.5, np.float32)))
+
+    data = engine.tracks[track_id].data
+    assert np.all(data[10_000:10_100] == 0.5) and data[10_100, 0] == 0.25
+    assert engine.tracks[track_id].dirty
+    # 100 frames inside one 64 KiB block
+    assert history.usage() == (BLOCK_BYTES, 0)
+    assert sf.read(path, frames=1, start=10_000)[0][0, 0] == 0.25
+
+    history.undo()
+    assert np.all(engine.tracks[track_id].data[10_000:10_100] == 0.25)
+    history.redo()
+    assert np.all(engine.tracks[track_id].data[10_000:10_100] == 0.5)
+
+
+def test_integer_tracks_are_edited_in_their_own_format(tmp_path):
+    engine, track_id, _ = make_engine(tmp_path, frames=1000, subtype="PCM_16")
+    history = History()
+    history.execute(EditAudioCommand(engine, track_id, 0, np.full((10, 2), 0.5, np.float32)))
+    track = engine.tracks[track_id]
+    assert track.data.dtype == np.int16
+    assert track.data[0, 0] * track.scale == 0.5
+
+
+def test_old_entries_spill_to_disk_then_drop_out_of_the_budget(tmp_path):
+    engine, track_id, _ = make_engine(tmp_path)
+    history = History(budget_bytes=4 * BLOCK_BYTES, memory_bytes=BLOCK_BYTES,
+                      spill_dir=str(tmp_path))
+    block_frames = BLOCK_BYTES // 8
+    for i in range(3):
+        history.execute(EditAudioCommand(engine, track_id, i * block_frames,
+                                         np.full((block_frames, 2), i + 1, np.float32)))
+    # Only the newest edit is still in memory; spills add a 128 byte header
+    assert history.usage() == (BLOCK_BYTES, 2 * (BLOCK_BYTES + 128))
+
+    history.execute(EditAudioCommand(engine, track_id, 3 * block_frames,
+                                     np.full((block_frames, 2), 4, np.float32)))
+    assert len(history.undo_stack) == 3
+
+    # Spilled blocks come back from disk on undo
+    while history.undo():
+        pass
+    data = engine.tracks[track_id].data
+    assert np.all(data[:block_frames] == 1)
+    assert np.all(data[block_frames:] == 0.25)
+    history.clear()
+    assert not [name for name in os.listdir(tmp_path) if name.startswith("soundbyte-undo-")]
+
+
+def test_slider_drag_coalesces_into_one_step(tmp_path):
+    engine, track_id, _ = make_engine(tmp_path, frames=100)
+    history = History()
+    shown = []
+    for volume in (0.9, 0.8, 0.7):
+        history.execute(SetTrackVolumeCommand(engine, track_id, volume, shown.append))
+    assert len(history.undo_stack) == 1
+    history.undo()
+    assert engine.tracks[track_id].volume == 1.0
+    assert shown[-1] == 1.0
+    history.redo()
+    assert engine.tracks[track_id].volume == 0.7
+
+
+def test_volume_of_a_missing_track_raises(tmp_path):
+    engine, track_id, _ = make_engine(tmp_path, frames=100)
+    shown = []
+    with pytest.raises(KeyError):
+        SetTrackVolumeCommand(engine, -1, 0.5, shown.append).execute()
+    assert shown == []
+    assert engine.tracks[track_id].volume == 1.0
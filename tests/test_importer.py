@@ -0,0 +1,52 @@
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.importer import ClipImporter
+from soundbyte.audio.peaks import PeakCache
+
+
+def make_files(tmp_path, count, frames=1000):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"take_{i}.wav"
+        sf.write(path, np.full((frames, 2), 0.5), 44100, subtype="FLOAT")
+        paths.append(str(path))
+    return paths
+
+
+def test_clips_are_placed_before_their_audio_is_decoded(tmp_path):
+    engine = AudioEngine(open_stream=False)
+    track_id = engine.add_data_track(np.zeros((10, 2), np.float32), 44100, "Drops")
+    progress = []
+    loaded = []
+    importer = ClipImporter(engine, PeakCache(), max_workers=4,
+                            on_progress=lambda *p: progress.append(p),
+                            on_loaded=lambda *clip: loaded.append(clip))
+    paths = make_files(tmp_path, 20)
+    # Same file twice: decoded once, both clips play it
+    clip_ids = importer.submit(track_id, paths + paths[:1], start_frame=500)
+
+    columns = engine.tracks[track_id].clips.columns
+    assert len(clip_ids) == 21
+    assert columns.start.tolist() == list(range(500, 500 + 21 * 1000, 1000))
+    assert columns.length.tolist() == [1000] * 21
+
+    assert importer.wait(timeout=10) == []
+    assert not importer.busy
+    assert sorted(loaded) == sorted((track_id, c) for c in clip_ids)
+    assert progress[-1] == (21, 21) and len(progress) == 21
+    assert len(engine.sources) == 20 and engine.sample_pool.nbytes == 20 * 1000 * 2 * 4
+    spans = engine.tracks[track_id].clips.overlapping(500, 21_500)
+    assert all(np.all(span.data == 0.5) for span in spans)
+    assert importer.peak_cache.get(paths[0]) is not None
+
+
+def test_unreadable_files_are_reported_and_skipped(tmp_path):
+    engine = AudioEngine(open_stream=False)
+    track_id = engine.add_data_track(np.zeros((10, 2), np.float32), 44100, "Drops")
+    importer = ClipImporter(engine)
+    bad = tmp_path / "notes.txt"
+    bad.write_text("not audio")
+    clip_ids = importer.submit(track_id, [str(bad)] + make_files(tmp_path, 1))
+    assert len(clip_ids) == 1
+    assert importer.wait(timeout=10) == [f"Failed to import {bad}"]
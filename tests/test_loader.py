@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import soundfile as sf
+from soundbyte.audio import loader
+from soundbyte.audio.loader import content_hash, load_audio, map_wav
+
+
+def test_pcm16_wav_is_mapped_at_data_chunk(tmp_path):
+    path = tmp_path / "pcm16.wav"
+    data = np.linspace(-0.5, 0.5, 2000).reshape(-1, 2)
+    sf.write(path, data, 48000, subtype="PCM_16")
+
+    loaded = load_audio(str(path), cache_dir=str(tmp_path / "cache"))
+    assert isinstance(loaded.data, np.memmap)
+    assert loaded.data.shape == (1000, 2)
+    assert loaded.sample_rate == 48000
+    assert np.allclose(loaded.data * loaded.scale, data, atol=1e-4)
+    assert not (tmp_path / "cache").exists()
+
+
+def test_compressed_files_are_decoded_once_into_cache(tmp_path):
+    path = tmp_path / "tone.flac"
+    data = np.sin(np.linspace(0, 100, 5000)) * 0.5
+    sf.write(path, data, 44100)
+    cache_dir = tmp_path / "cache"
+
+    assert map_wav(str(path)) is None
+    first = load_audio(str(path), cache_dir=str(cache_dir))
+    assert first.data.shape == (5000, 1)
+    assert first.data.dtype == np.float32
+    assert np.allclose(first.data[:, 0], data, atol=1e-4)
+    assert len(list(cache_dir.glob("*.npy"))) == 1
+
+    second = load_audio(str(path), cache_dir=str(cache_dir))
+    assert second.data.filename == first.data.filename
+
+
+def test_content_hash_is_only_recomputed_when_the_file_changes(tmp_path):
+    path = tmp_path / "take.raw"
+    path.write_bytes(b"a" * 1000)
+    cache_dir = str(tmp_path / "cache")
+    first = content_hash(str(path), cache_dir)
+    stat = os.stat(path)
+
+    # Same size and mtime: the remembered hash is used, the file not read
+    path.write_bytes(b"b" * 1000)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    loader._hashes.clear()
+    assert content_hash(str(path), cache_dir) == first
+
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert content_hash(str(path), cache_dir) != first
+
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path, cache_dir, monkeypatch):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"take{i}.flac"
+        sf.write(path, np.full(1000, (i + 1) / 4), 44100)
+        paths.append(str(path))
+    older = load_audio(paths[0]).data.filename
+    newer = load_audio(paths[1]).data.filename
+    os.utime(older, ns=(0, 0))
+    os.utime(newer, ns=(0, 10 ** 9))
+
+    # Loading the older entry again makes it the most recently used
+    load_audio(paths[0])
+    monkeypatch.setenv(loader.CACHE_BYTES_ENV, str(2 * os.path.getsize(older)))
+    latest = load_audio(paths[2]).data.filename
+    assert sorted(str(p) for p in cache_dir.glob("*.npy")) == sorted([older, latest])
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+# The GUI imports its siblings as top-level packages, as main.py runs it
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "soundbyte"))
+from gui.main_window import MainWindow
+from gui.track_widget import TrackWidget
+
+
+@pytest.fixture
+def window():
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow()
+    yield window
+    window.audio_engine.close()
+    window.deleteLater()
+    app.processEvents()
+
+
+def test_added_tracks_share_their_engine_id(window):
+    added = [window.add_track(), window.add_track()]
+
+    layout = window.tracks_layout
+    widgets = [layout.itemAt(i).widget() for i in range(layout.count())]
+    widget_ids = [w.track_id for w in widgets if isinstance(w, TrackWidget)]
+    assert widget_ids == added
+    assert list(window.audio_engine.tracks) == added
+    assert window.timeline.tracks == added
@@ -0,0 +1,76 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.meter import AudioMeter
+from soundbyte.audio.mixer import TrackState
+from soundbyte.audio.parallel import ParallelMixer
+from soundbyte.audio.session import ClipTable
+
+
+def test_ring_buffer_keeps_latest_callbacks_and_computes_load():
+    meter = AudioMeter(capacity=4)
+    for wall_us in (100, 200, 300, 400, 500, 600):
+        meter.record(wall_us * 1000, 441, 44100)
+    wall, budget = meter.history()
+    assert wall.tolist() == [300_000, 400_000, 500_000, 600_000]
+    assert budget.tolist() == [10_000_000] * 4
+    reading = meter.reading(window=2)
+    assert reading.callbacks == 6
+    assert np.isclose(reading.load_percent, 5.5)
+    assert np.isclose(reading.peak_load_percent, 6.0)
+
+    meter.record_status(SimpleNamespace(output_underflow=True, output_overflow=False))
+    assert meter.reading().underflows == 1
+
+
+def test_engine_callback_records_timing_and_track_cost(tmp_path):
+    for name in ("a", "b"):
+        sf.write(tmp_path / f"{name}.wav", np.full((4096, 2), 0.1), 44100, subtype="FLOAT")
+    engine = AudioEngine(open_stream=False)
+    a = engine.add_track(str(tmp_path / "a.wav"))
+    b = engine.add_track(str(tmp_path / "b.wav"))
+    engine.playing = True
+    out = np.empty((1024, 2), dtype=np.float32)
+    for _ in range(3):
+        engine._audio_callback(out, 1024, None, None)
+
+    reading = engine.meter.reading()
+    assert reading.callbacks == 3 and reading.load_percent > 0
+    assert set(reading.track_percent) == {a, b}
+    assert np.isclose(sum(reading.track_percent.values()), 100.0)
+
+    engine.meter.dump(str(tmp_path / "perf.json"))
+    engine.meter.dump(str(tmp_path / "perf.csv"))
+    assert len(json.loads((tmp_path / "perf.json").read_text())['wall_ns']) == 3
+    assert len((tmp_path / "perf.csv").read_text().splitlines()) == 4
+
+
+def test_track_time_covers_the_same_window_as_the_load():
+    meter = AudioMeter(capacity=4)
+    meter.record(1000, 441, 44100, {1: 900})
+    for _ in range(4):
+        meter.record(1000, 441, 44100, {1: 100, 2: 300})
+    # The first block has left the ring
+    assert meter.track_time() == {1: 400, 2: 1200}
+    assert meter.reading(window=2).track_percent == {1: 25.0, 2: 75.0}
+
+
+def test_parallel_groups_time_their_own_tracks():
+    tracks = tuple(TrackState(np.full((512, 2), 0.01, np.float32), 1.0, ClipTable(),
+                              track_id=i)
+                   for i in range(8))
+    mixer = ParallelMixer(channels=2, max_frames=256, threads=4, min_tracks_per_thread=2)
+    mixer.meter = AudioMeter()
+    out = np.empty((256, 2), dtype=np.float32)
+    try:
+        mixer.render(out, tracks, 0, 256)
+        first = mixer.track_ns
+        mixer.render(out, tracks, 256, 256)
+    finally:
+        mixer.shutdown()
+    assert set(first) == set(mixer.track_ns) == set(range(8))
+    # Each block gets its own timings
+    assert mixer.track_ns is not first
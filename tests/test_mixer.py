@@ -0,0 +1,88 @@
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.session import FADE_LINEAR, ClipTable, fade_shape
+from soundbyte.audio.mixer import Mixer, TrackState
+from soundbyte.audio.parallel import ParallelMixer
+
+
+def test_render_mixes_tracks_with_volume():
+    mixer = Mixer(channels=2, max_frames=4, limit=False)
+    a = np.full((8, 2), 0.25, dtype=np.float32)
+    b = np.full((8, 1), 0.5, dtype=np.float32)
+    out = np.empty((4, 2), dtype=np.float32)
+    mixer.render(out, (TrackState(a, 1.0, ClipTable()), TrackState(b, 0.5, ClipTable())), 0, 4)
+    assert np.allclose(out, 0.5)
+
+
+def test_render_pads_past_end_of_data():
+    mixer = Mixer(channels=2, max_frames=4, limit=False)
+    a = np.full((6, 2), 0.5, dtype=np.float32)
+    out = np.empty((4, 2), dtype=np.float32)
+    mixer.render(out, (TrackState(a, 1.0, ClipTable()),), 4, 4)
+    assert np.allclose(out[:2], 0.5)
+    assert np.allclose(out[2:], 0.0)
+
+
+def test_master_limiter_keeps_output_under_ceiling():
+    mixer = Mixer(channels=2, max_frames=256)
+    a = np.full((4096, 2), 0.75, dtype=np.float32)
+    tracks = (TrackState(a, 1.0, ClipTable()), TrackState(a, 1.0, ClipTable()))
+    out = np.empty((4096, 2), dtype=np.float32)
+    for start in range(0, 4096, 256):
+        mixer.render(out[start:start + 256], tracks, start, 256)
+    assert np.abs(out).max() <= 1.0
+    # Delayed by the look-ahead, then settled at the ceiling
+    assert np.allclose(out[:mixer.latency], 0.0)
+    assert np.allclose(out[2 * mixer.latency:], 1.0, atol=1e-4)
+
+
+def test_render_places_clips_at_start_frame(tmp_path):
+    sf.write(tmp_path / "hit.wav", np.full((3, 2), 0.5), 44100, subtype="FLOAT")
+    mixer = Mixer(channels=2, max_frames=8, limit=False)
+    clips = ClipTable()
+    source, length = clips.sources.acquire(str(tmp_path / "hit.wav"))
+    clips.add(6, length, source)
+    out = np.empty((8, 2), dtype=np.float32)
+    silent = np.zeros((0, 2), dtype=np.float32)
+    mixer.render(out, (TrackState(silent, 1.0, clips),), 0, 8)
+    assert np.allclose(out[:6], 0.0)
+    assert np.allclose(out[6:], 0.5)
+    mixer.render(out, (TrackState(silent, 1.0, clips),), 8, 8)
+    assert np.allclose(out[:1], 0.5)
+    assert np.allclose(out[1:], 0.0)
+
+
+def test_parallel_mixer_matches_serial_mixer():
+    rng = np.random.default_rng(1)
+    tracks = tuple(
+        TrackState(rng.uniform(-0.01, 0.01, (512, 2)).astype(np.float32),
+                   0.5, ClipTable())
+        for _ in range(40)
+    )
+    serial = np.empty((256, 2), dtype=np.float32)
+    parallel = np.empty((256, 2), dtype=np.float32)
+    Mixer(channels=2, max_frames=256).render(serial, tracks, 100, 256)
+    mixer = ParallelMixer(channels=2, max_frames=256, threads=4,
+                          min_tracks_per_thread=4)
+    mixer.render(parallel, tracks, 100, 256, deadline=0.0)
+    mixer.shutdown()
+    assert np.allclose(serial, parallel, atol=1e-6)
+
+
+def test_clips_play_their_source_window_with_fades(tmp_path):
+    ramp = np.arange(100, dtype=np.float32).reshape(-1, 1)
+    sf.write(tmp_path / "ramp.wav", ramp, 44100, subtype="FLOAT")
+    mixer = Mixer(channels=1, max_frames=64, limit=False)
+    clips = ClipTable()
+    source, _ = clips.sources.acquire(str(tmp_path / "ramp.wav"))
+    clip = clips.add(0, 40, source, gain=0.5, offset=30)
+    clips.set_fades(clip, fade_in=4, fade_out=10)
+
+    out = np.empty((64, 1), dtype=np.float32)
+    silent = np.zeros((0, 1), dtype=np.float32)
+    mixer.render(out, (TrackState(silent, 1.0, clips),), 0, 64)
+    expected = 0.5 * ramp[30:70, 0]
+    expected[:4] *= fade_shape(FADE_LINEAR, 4)[:, 0]
+    expected[-10:] *= fade_shape(FADE_LINEAR, 10)[::-1, 0]
+    assert np.allclose(out[:40, 0], expected)
+    assert np.allclose(out[40:], 0.0)
@@ -0,0 +1,63 @@
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.peaks import PeakCache, PeakPyramid, peaks_for_file, sidecar_path
+
+
+def test_pyramid_levels_bound_every_bin():
+    rng = np.random.default_rng(0)
+    data = rng.uniform(-1, 1, (100_000, 2)).astype(np.float32)
+    peaks = PeakPyramid.build(data, 44100)
+
+    assert [PeakPyramid.bin_size(i) for i in range(3)] == [256, 1024, 4096]
+    assert len(peaks.levels[-1][0]) == 1
+    for level, (mins, maxs) in enumerate(peaks.levels):
+        size = PeakPyramid.bin_size(level)
+        assert mins[0] == data[:size].min()
+        assert maxs[0] == data[:size].max()
+    assert peaks.levels[-1][1][0] == data.max()
+
+
+def test_pixels_reads_one_bin_per_pixel():
+    data = np.zeros((4096 * 10, 1), dtype=np.float32)
+    data[4096 * 3 + 5] = 0.75
+    peaks = PeakPyramid.build(data, 44100)
+    mins, maxs = peaks.pixels(0, 4096, 10)
+    assert peaks.level_for(4096) == 2
+    assert maxs.tolist() == [0, 0, 0, 0.75, 0, 0, 0, 0, 0, 0]
+
+
+def test_sidecar_is_reused_until_source_changes(tmp_path):
+    path = tmp_path / "tone.wav"
+    sf.write(path, np.full((3000, 2), 0.5), 44100, subtype="FLOAT")
+    first = peaks_for_file(str(path))
+    assert (tmp_path / "tone.wav.peaks.npz").exists()
+    assert sidecar_path(str(path)).endswith(".peaks.npz")
+
+    second = peaks_for_file(str(path))
+    assert np.array_equal(second.levels[0][1], first.levels[0][1])
+
+    sf.write(path, np.full((3000, 2), 0.25), 44100, subtype="FLOAT")
+    third = peaks_for_file(str(path))
+    assert np.allclose(third.levels[0][1], 0.25)
+
+
+def test_failed_builds_are_retried_once_the_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "late.wav"
+    cache = PeakCache()
+    # Not there yet: the build fails and the file is not left marked as building
+    assert cache.build(str(path)) is None
+
+    submitted = []
+    monkeypatch.setattr(cache._pool, "submit", lambda *args: submitted.append(args))
+    for _ in range(3):
+        assert cache.get(str(path)) is None
+    assert submitted == []
+
+    sf.write(path, np.full((3000, 2), 0.5), 44100, subtype="FLOAT")
+    assert cache.build(str(path)) is not None
+
+
+def test_zero_length_source_has_no_pixels():
+    peaks = PeakPyramid.build(np.zeros((0, 2), dtype=np.float32), 44100)
+    mins, maxs = peaks.pixels(0, 100.0, 50)
+    assert len(mins) == 0 and len(maxs) == 0
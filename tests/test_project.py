@@ -0,0 +1,89 @@
+import json
+import os
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.project import (ProjectLoader, load_project, read_project,
+                                     save_project)
+
+
+def test_unchanged_tracks_reference_their_source(tmp_path):
+    source = tmp_path / "take.wav"
+    sf.write(source, np.zeros((100, 2)), 44100)
+    project_path = tmp_path / "song.sbp"
+
+    engine = AudioEngine(open_stream=False)
+    track_id = engine.add_track(str(source))
+    save_project(engine, str(project_path))
+    engine.set_track_volume(track_id, 0.5)
+    save_project(engine, str(project_path))
+
+    project = json.loads(project_path.read_text())
+    assert project['tracks'][0]['file'] == "take.wav"
+    assert project['tracks'][0]['volume'] == 0.5
+    assert sorted(os.listdir(tmp_path)) == ["song.sbp", "take.wav"]
+
+
+def test_dirty_tracks_are_written_next_to_project(tmp_path):
+    source = tmp_path / "take.wav"
+    sf.write(source, np.zeros((100, 2)), 44100)
+    project_path = tmp_path / "project" / "song.sbp"
+    project_path.parent.mkdir()
+
+    engine = AudioEngine(open_stream=False)
+    track_id = engine.add_track(str(source))
+    engine.tracks[track_id].dirty = True
+    save_project(engine, str(project_path))
+
+    project = json.loads(project_path.read_text())
+    assert project['tracks'][0]['file'] == f"track_{track_id}.wav"
+    assert not engine.tracks[track_id].dirty
+    assert sorted(os.listdir(project_path.parent)) == ["song.sbp", f"track_{track_id}.wav"]
+
+
+def test_written_tracks_never_overwrite_another_tracks_file(tmp_path):
+    project_path = tmp_path / "song.sbp"
+    engine = AudioEngine(open_stream=False)
+    for value in (0.25, 0.5, 0.75):
+        engine.add_data_track(np.full((100, 2), value, dtype=np.float32), 44100, "take")
+    engine.remove_track(0)
+    save_project(engine, str(project_path))
+
+    # Reloading renumbers the tracks: track 0 now plays track_1.wav
+    loaded, errors = load_project(
+        str(project_path), lambda **kwargs: AudioEngine(open_stream=False, **kwargs))
+    assert errors == []
+    second = list(loaded.tracks)[1]
+    loaded.tracks[second].data = np.full((100, 2), 0.375, dtype=np.float32)
+    loaded.tracks[second].dirty = True
+    save_project(loaded, str(project_path))
+
+    project = json.loads(project_path.read_text())
+    files = [track['file'] for track in project['tracks']]
+    assert files[0] == "track_1.wav" and files[1] != files[0]
+    # Written as float, not quantised to 16 bits
+    for file, value in zip(files, (0.5, 0.375)):
+        data, _ = sf.read(tmp_path / file, dtype='float32')
+        assert sf.info(str(tmp_path / file)).subtype == 'FLOAT'
+        assert np.all(data == np.float32(value))
+
+
+def test_project_loader_streams_then_maps_tracks(tmp_path):
+    for name in ("a", "b"):
+        sf.write(tmp_path / f"{name}.wav", np.full((500, 2), 0.25), 44100, subtype="FLOAT")
+    sf.write(tmp_path / "hit.wav", np.full((10, 2), 0.5), 44100, subtype="FLOAT")
+    project_path = tmp_path / "song.sbp"
+    engine = AudioEngine(open_stream=False)
+    engine.add_track(str(tmp_path / "a.wav"))
+    engine.add_clip(engine.add_track(str(tmp_path / "b.wav")), str(tmp_path / "hit.wav"), 600)
+    save_project(engine, str(project_path))
+
+    loaded = AudioEngine(open_stream=False)
+    loader = ProjectLoader(loaded, read_project(str(project_path)), str(tmp_path))
+    track_ids = loader.open()
+    assert [loaded.tracks[t].name for t in track_ids] == ["a.wav", "b.wav"]
+    assert loader.wait(timeout=10) == []
+    assert loader.done
+    assert all(isinstance(loaded.tracks[t].data, np.ndarray) for t in track_ids)
+    assert len(loaded.tracks[track_ids[1]].clips) == 1
+    assert loaded.get_total_frames() == 610
@@ -0,0 +1,69 @@
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.project import save_project
+from soundbyte.audio.render import render_project, render_to_file
+
+
+def test_render_project_bounces_tracks_and_clips(tmp_path):
+    sf.write(tmp_path / "pad.wav", np.full((1000, 2), 0.25), 44100, subtype="FLOAT")
+    sf.write(tmp_path / "hit.wav", np.full((100, 2), 0.5), 44100, subtype="FLOAT")
+    sf.write(tmp_path / "muted.wav", np.full((1000, 2), 0.5), 44100, subtype="FLOAT")
+
+    engine = AudioEngine(open_stream=False)
+    pad = engine.add_track(str(tmp_path / "pad.wav"))
+    engine.add_clip(pad, str(tmp_path / "hit.wav"), 2000)
+    muted = engine.add_track(str(tmp_path / "muted.wav"))
+    engine.set_track_mute(muted, True)
+    project_path = tmp_path / "project" / "song.sbp"
+    project_path.parent.mkdir()
+    save_project(engine, str(project_path))
+
+    out_path = tmp_path / "bounce.wav"
+    stats = render_project(str(project_path), str(out_path),
+                           block_size=256, subtype="FLOAT")
+
+    rendered, sr = sf.read(out_path, dtype="float32")
+    assert sr == 44100
+    assert stats.frames == len(rendered) == 2100
+    assert np.allclose(rendered[:1000], 0.25)
+    assert np.allclose(rendered[1000:2000], 0.0)
+    assert np.allclose(rendered[2000:], 0.5)
+    assert stats.realtime_factor > 1
+
+
+def test_render_project_closes_its_engine_when_loading_fails(tmp_path, monkeypatch):
+    sf.write(tmp_path / "pad.wav", np.full((1000, 2), 0.25), 44100, subtype="FLOAT")
+    sf.write(tmp_path / "hit.wav", np.full((100, 2), 0.5), 44100, subtype="FLOAT")
+    engine = AudioEngine(open_stream=False)
+    engine.add_clip(engine.add_track(str(tmp_path / "pad.wav")), str(tmp_path / "hit.wav"), 0)
+    project_path = tmp_path / "song.sbp"
+    save_project(engine, str(project_path))
+    (tmp_path / "hit.wav").unlink()
+
+    closed = []
+    close = AudioEngine.close
+    monkeypatch.setattr(AudioEngine, "close", lambda self: closed.append(close(self)))
+    with pytest.raises(RuntimeError):
+        render_project(str(project_path), str(tmp_path / "bounce.wav"))
+    assert len(closed) == 1
+
+def test_mixer_threads_stop_when_a_render_fails(tmp_path):
+    sf.write(tmp_path / "pad.wav", np.full((1000, 2), 0.25), 44100, subtype="FLOAT")
+    engine = AudioEngine(open_stream=False, render_threads=2)
+    # Enough tracks to be mixed on both threads
+    for _ in range(16):
+        engine.add_track(str(tmp_path / "pad.wav"))
+    engine.play()
+    engine._audio_callback(np.zeros((256, 2), dtype=np.float32), 256, None, None)
+
+    def cancel(done, total):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        render_to_file(engine, str(tmp_path / "bounce.wav"), threads=2, progress=cancel)
+    engine.close()
+    assert not [t for t in threading.enumerate() if t.name.startswith("soundbyte-mix")]
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import soundfile as sf
+from soundbyte.audio import loader
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.resample import StreamResampler, resample, resample_cached
+from soundbyte.audio.stream import StreamingSource
+
+
+def sine(frequency, rate, frames):
+    t = np.arange(frames) / rate
+    return np.sin(2 * np.pi * frequency * t).astype(np.float32)[:, None]
+
+
+def test_resample_matches_analytic_sine_per_tier():
+    data = sine(1000, 48000, 48000)
+    expected = sine(1000, 44100, 44100)
+    for quality, tolerance in (('fast', 1e-3), ('medium', 2e-4), ('high', 1e-5)):
+        out = resample(data, 48000, 44100, quality)
+        assert out.shape == expected.shape
+        # Skip the filter's ramp-in and ramp-out at the edges
+        error = np.abs(out[200:-200] - expected[200:-200]).max()
+        assert error < tolerance, (quality, error)
+
+
+def test_stream_resampler_is_chunk_invariant():
+    data = np.random.default_rng(0).uniform(-1, 1, (5000, 2)).astype(np.float32)
+    whole = resample(data, 22050, 44100)
+
+    resampler = StreamResampler(22050, 44100, 2)
+    pieces = [resampler.process(data[i:i + 333]) for i in range(0, len(data), 333)]
+    pieces.append(resampler.flush())
+    chunked = np.concatenate(pieces)[:len(whole)]
+    assert np.array_equal(chunked, whole)
+
+
+def test_engine_plays_every_source_at_session_rate(tmp_path):
+    path = tmp_path / "tone48k.wav"
+    sf.write(path, sine(440, 48000, 4800), 48000, subtype="FLOAT")
+
+    engine = AudioEngine(sample_rate=44100, open_stream=False)
+    track_id = engine.add_track(str(path))
+    track = engine.tracks[track_id]
+    assert track.sample_rate == 44100
+    assert len(track.data) == 4410
+
+    assert engine.add_clip(track_id, str(path), 0)
+    assert list(engine.tracks[track_id].clips.columns.length) == [4410]
+
+    source = StreamingSource(str(path), chunk_frames=1000, target_rate=44100)
+    while source.fill():
+        pass
+    out = np.empty((4410, 1), dtype=np.float32)
+    assert source.read_into(out, 0, 4410) == 4410
+    assert np.allclose(out, np.asarray(track.data), atol=1e-6)
+    source.close()
+
+
+def test_resampled_files_are_cached_within_the_budget(tmp_path, cache_dir, monkeypatch):
+    path = tmp_path / "take.wav"
+    sf.write(path, sine(1000, 48000, 4800), 48000, subtype="FLOAT")
+    data = sf.read(path, dtype="float32", always_2d=True)[0]
+    first = resample_cached(str(path), data, 48000, 44100)
+    assert first.filename.startswith(str(cache_dir))
+    assert resample_cached(str(path), data, 48000, 44100).filename == first.filename
+
+    # Over budget, the older rate makes way for the new one
+    monkeypatch.setenv(loader.CACHE_BYTES_ENV, str(os.path.getsize(first.filename)))
+    second = resample_cached(str(path), data, 48000, 22050)
+    assert [str(p) for p in cache_dir.glob("*.npy")] == [second.filename]
@@ -0,0 +1,77 @@
+from threading import Thread
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.mixer import BusState, Mixer
+from soundbyte.audio.project import load_project, save_project
+
+
+def make_engine(tmp_path, count):
+    engine = AudioEngine(open_stream=False)
+    for i in range(count):
+        path = tmp_path / f"take{i}.wav"
+        sf.write(path, np.full((64, 2), 0.1 * (i + 1)), 44100, subtype="FLOAT")
+        engine.add_track(str(path))
+    return engine
+
+
+def render(engine):
+    out = np.empty((64, 2), dtype=np.float32)
+    Mixer(engine.channels, 64, limit=False).render(out, engine.track_states, 0, 64)
+    return out[0, 0]
+
+
+def test_muted_and_unsoloed_tracks_leave_the_snapshot(tmp_path):
+    engine = make_engine(tmp_path, 4)
+    for track_id in (1, 2, 3):
+        engine.set_track_mute(track_id, True)
+    assert engine.audible_tracks == {0}
+    assert len(engine.track_states) == 1
+
+    engine.set_track_mute(2, False)
+    engine.set_track_solo(2, True)
+    assert engine.audible_tracks == {2}
+    assert np.isclose(render(engine), 0.3)
+
+
+def test_bus_sums_its_tracks_once_and_follows_mute_and_solo(tmp_path):
+    engine = make_engine(tmp_path, 3)
+    bus = engine.add_bus("Drums")
+    engine.set_track_output(1, bus)
+    engine.set_track_output(2, bus)
+    engine.set_bus_volume(bus, 0.5)
+    states = engine.track_states
+    assert len(states) == 2 and isinstance(states[1], BusState)
+    assert len(states[1].tracks) == 2
+    assert np.isclose(render(engine), 0.1 + 0.5 * (0.2 + 0.3))
+
+    engine.set_bus_solo(bus, True)
+    assert engine.audible_tracks == {1, 2}
+    engine.set_bus_mute(bus, True)
+    assert engine.audible_tracks == {0}
+
+    project_path = tmp_path / "song.sbp"
+    save_project(engine, str(project_path))
+    loaded, errors = load_project(str(project_path),
+                                  lambda **kw: AudioEngine(open_stream=False, **kw))
+    assert errors == []
+    assert [track.output for track in loaded.tracks.values()] == [None, 0, 0]
+    assert loaded.buses[0].muted and loaded.buses[0].volume == 0.5
+
+    engine.remove_bus(bus)
+    assert engine.audible_tracks == {0, 1, 2}
+
+
+def test_mute_and_solo_publish_under_the_engine_lock(tmp_path):
+    engine = make_engine(tmp_path, 2)
+    changes = [lambda: engine.set_track_mute(0, True), lambda: engine.set_track_solo(1, True),
+               lambda: engine.set_bus_mute(engine.add_bus(), True)]
+    for change in changes:
+        with engine.lock:
+            thread = Thread(target=change)
+            thread.start()
+            thread.join(0.05)
+            # Waits for a publish already in progress, e.g. a loader thread's
+            assert thread.is_alive()
+        thread.join()
+    assert engine.audible_tracks == {1}
@@ -0,0 +1,45 @@
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.track import SamplePool
+
+
+def write_tone(path, frames):
+    sf.write(path, np.zeros((frames, 2)), 44100, subtype="FLOAT")
+    return str(path)
+
+
+def test_identical_files_share_one_read_only_buffer(tmp_path):
+    pool = SamplePool()
+    path = write_tone(tmp_path / "kick.wav", 1000)
+    key_a, a, _ = pool.acquire(path)
+    key_b, b, _ = pool.acquire(path)
+    assert key_a == key_b
+    assert np.shares_memory(a, b)
+    assert not a.flags.writeable
+    assert len(pool) == 1
+    assert pool.nbytes == a.nbytes
+
+
+def test_unused_buffers_are_evicted_lru_over_cap(tmp_path):
+    pool = SamplePool(max_bytes=2 * 1000 * 2 * 4)
+    paths = [write_tone(tmp_path / f"{i}.wav", 1000) for i in range(3)]
+    keys = [pool.acquire(p)[0] for p in paths[:2]]
+    pool.release(keys[0])
+    pool.release(keys[1])
+    # Touch the first so the second becomes least recently used
+    pool.release(pool.acquire(paths[0])[0])
+    pool.acquire(paths[2])
+    assert len(pool) == 2
+    assert pool.nbytes <= pool.max_bytes
+    assert pool.acquire(paths[0])[0] == keys[0]
+    assert keys[1] not in pool._samples
+
+
+def test_each_resampler_quality_gets_its_own_buffer(tmp_path):
+    pool = SamplePool()
+    path = write_tone(tmp_path / "a.wav", 1000)
+    fast = pool.acquire(path, 48000, "fast")[0]
+    best = pool.acquire(path, 48000, "high")[0]
+    assert fast != best and len(pool) == 2
+    # The file's own rate is not resampled, so quality does not matter
+    assert pool.acquire(path, None, "fast")[0] == pool.acquire(path, None, "high")[0]
@@ -0,0 +1,145 @@
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.session import FADE_EQUAL_POWER, ClipTable, fade_shape
+
+
+def test_overlapping_returns_only_intersecting_clips():
+    table = ClipTable()
+    starts = np.arange(0, 1000, 20)
+    ids = table.extend(starts[::-1], np.full(len(starts), 10), np.zeros(len(starts)))
+    assert np.array_equal(table.columns.start, starts)
+    assert list(table.columns.start[table.window(85, 125)]) == [80, 100, 120]
+    assert table.columns.clip_id[0] == ids[-1]
+
+
+def test_move_remove_and_shift_update_columns():
+    table = ClipTable()
+    a = table.add(0, 10, 0)
+    b = table.add(100, 500, 0)
+    table.move(a, 2000)
+    assert list(table.columns.clip_id) == [b, a]
+    assert list(table.window(0, 50)) == []
+    assert list(table.window(2005, 2006)) == [1]
+    table.remove(b)
+    assert table.columns.max_length == 10
+    assert table.end_frame == 2010
+
+    table.extend([0, 500, 1000], [10, 10, 10], [0, 0, 0])
+    table.shift(500, -600)
+    # Shifted clips clamp at zero and stay sorted by start
+    assert list(table.columns.start) == [0, 0, 400, 1400]
+
+
+def test_incremental_edits_keep_rows_sorted_and_snapshots_intact():
+    table = ClipTable()
+    rng = np.random.default_rng(7)
+    clips = {}
+    for step in range(400):
+        # Mostly in-order appends, as imports place clips, with edits between
+        if not clips or step % 3:
+            start = int(table.end_frame if step % 2 else rng.integers(0, 5000))
+            clips[table.add(start, 10, 0)] = start
+        else:
+            clip_id = int(rng.choice(list(clips)))
+            clips[clip_id] = int(rng.integers(0, 5000))
+            table.move(clip_id, clips[clip_id])
+        # Appending writes past the end of the published arrays only
+        before = table.columns
+        expected = before.start.copy()
+        start = table.end_frame
+        clips[table.add(start, 10, 0)] = start
+        assert np.array_equal(before.start, expected)
+
+    columns = table.columns
+    assert np.all(np.diff(columns.start) >= 0)
+    assert dict(zip(columns.clip_id.tolist(), columns.start.tolist())) == clips
+
+
+def test_sources_are_shared_and_released_with_their_clips(tmp_path):
+    path = tmp_path / "hit.wav"
+    sf.write(path, np.full((100, 2), 0.5), 44100, subtype="FLOAT")
+    table = ClipTable()
+    sources = table.sources
+    first, length = sources.acquire(str(path))
+    second, _ = sources.acquire(str(path))
+    assert first == second and length == 100
+    assert len(sources) == 1 and sources.pool.nbytes > 0
+
+    sources.release(table.clear())
+    sources.release([first, second])
+    assert len(sources) == 0 and first not in sources.data
+
+
+def test_reserved_sources_play_silence_until_loaded(tmp_path):
+    path = tmp_path / "hit.wav"
+    sf.write(path, np.full((100, 2), 0.5), 44100, subtype="FLOAT")
+    table = ClipTable()
+    sources = table.sources
+    source, length, pending = sources.reserve(str(path), 100, 2, 44100)
+    clip = table.add(0, length, source)
+    assert pending and sources.pool.nbytes == 0
+    assert not table.overlapping(0, 10)[0].data.any()
+
+    assert sources.load(source)
+    table.refresh()
+    assert np.all(table.overlapping(0, 10)[0].data == 0.5)
+    # Already decoded: the next clip of the same file shares it
+    assert sources.reserve(str(path), 100, 2, 44100) == (source, 100, False)
+
+    # Released before loading: the decode is dropped
+    other, _, _ = sources.reserve(str(path), 100, 2, 48000)
+    sources.release(other)
+    assert not sources.load(other)
+    sources.release(table.remove(clip))
+
+
+def test_split_trim_and_slip_only_rewrite_columns(tmp_path):
+    path = tmp_path / "take.wav"
+    sf.write(path, np.zeros((10_000, 1)), 44100, subtype="FLOAT")
+    table = ClipTable()
+    source, length = table.sources.acquire(str(path))
+    clip = table.add(1000, length, source)
+    table.set_fades(clip, fade_in=50, fade_out=70)
+
+    pieces = table.split(clip, np.arange(2000, 11_000, 1000))
+    columns = table.columns
+    assert len(pieces) == 9
+    assert list(columns.clip_id) == [clip, *pieces]
+    assert list(columns.length) == [1000] * 10
+    assert list(columns.offset) == list(range(0, 10_000, 1000))
+    assert list(columns.fade_in) == [50] + [0] * 9
+    assert list(columns.fade_out) == [0] * 9 + [70]
+    # Every piece holds a reference to the one shared source
+    table.sources.release(table.remove(clip))
+    assert len(table.sources) == 1
+
+    table.trim(pieces[0], start=1500, end=2200)
+    row = table.row(pieces[0])
+    assert (columns := table.columns).start[row] == 1500
+    assert columns.offset[row] == 500 and columns.length[row] == 700
+    # Audio before the first source frame cannot be revealed
+    table.trim(pieces[0], start=0)
+    assert table.columns.start[table.row(pieces[0])] == 1000
+
+    table.slip(pieces[-1], 5000)
+    assert table.columns.offset[table.row(pieces[-1])] == 4000
+    table.slip(pieces[-1], -10_000)
+    assert table.columns.offset[table.row(pieces[-1])] == 9000
+
+
+def test_fades_clamped_by_edits_are_built_before_playback(tmp_path):
+    path = tmp_path / "take.wav"
+    sf.write(path, np.zeros((10_000, 1)), 44100, subtype="FLOAT")
+    table = ClipTable()
+    source, length = table.sources.acquire(str(path))
+    clip = table.add(0, length, source)
+    table.set_fades(clip, fade_in=3000, fade_out=3000, curve=FADE_EQUAL_POWER)
+    fade_shape.cache_clear()
+
+    table.trim(clip, end=2500)
+    table.split(clip, 1000)
+    cached = fade_shape.cache_info().currsize
+    # The clamped lengths are already there for the audio thread
+    for fade in (2500, 1000, 1500):
+        fade_shape(FADE_EQUAL_POWER, fade)
+    assert fade_shape.cache_info().currsize == cached
@@ -0,0 +1,66 @@
+from time import monotonic, sleep
+
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.stream import DiskReader, StreamingSource
+
+
+def test_ring_buffer_streams_and_refills_on_seek(tmp_path):
+    path = tmp_path / "tone.wav"
+    data = np.linspace(-1, 1, 10000, dtype=np.float32).reshape(-1, 2)
+    sf.write(path, data, 44100, subtype="FLOAT")
+
+    source = StreamingSource(str(path), ring_frames=1024, chunk_frames=256)
+    while source.fill():
+        pass
+    out = np.empty((512, 2), dtype=np.float32)
+    assert source.read_into(out, 0, 512) == 512
+    assert np.array_equal(out, data[:512])
+
+    # The consumed region is recycled for read-ahead across the wrap point
+    while source.fill():
+        pass
+    assert source.read_into(out, 512, 512) == 512
+    assert np.array_equal(out, data[512:1024])
+
+    source.seek(4000)
+    assert source.read_into(out, 4000, 512) == 0
+    assert source.underruns == 1
+    while source.fill():
+        pass
+    assert source.read_into(out, 4000, 512) == 512
+    assert np.array_equal(out, data[4000:4512])
+    source.close()
+
+
+def test_disk_reader_refills_when_woken_and_stops(tmp_path):
+    path = tmp_path / "tone.wav"
+    data = np.linspace(-1, 1, 20000, dtype=np.float32).reshape(-1, 2)
+    sf.write(path, data, 44100, subtype="FLOAT")
+
+    reader = DiskReader()
+    source = StreamingSource(str(path), ring_frames=1024, chunk_frames=256)
+    reader.add(source)
+    out = np.empty((512, 2), dtype=np.float32)
+    for start in range(0, 8192, 512):
+        deadline = monotonic() + 5
+        # Played frames wake the reader, which refills without polling
+        while source.read_into(out, start, 512) < 512:
+            assert monotonic() < deadline
+            sleep(0.001)
+        assert np.array_equal(out, data[start:start + 512])
+
+    thread = reader._thread
+    reader.stop()
+    assert not thread.is_alive() and source._closed
+
+
+def test_closing_the_engine_stops_streaming(tmp_path):
+    path = tmp_path / "tone.wav"
+    sf.write(path, np.zeros((1000, 2)), 44100, subtype="FLOAT")
+    engine = AudioEngine(open_stream=False)
+    source = engine.tracks[engine.add_track(str(path), streaming=True)].data
+    thread = engine.disk_reader._thread
+    engine.close()
+    assert not thread.is_alive() and source._closed
@@ -0,0 +1,56 @@
+import json
+import logging
+
+from soundbyte.audio.trace import RealtimeLog, Tracer, traced
+from soundbyte.audio import trace
+
+
+def test_disabled_tracer_hands_out_shared_noop():
+    tracer = Tracer()
+    first = tracer.span("mix")
+    with first:
+        pass
+    assert tracer.span("save") is first
+    assert tracer.events() == []
+
+
+def test_enabled_spans_dump_chrome_trace(tmp_path):
+    tracer = Tracer()
+    tracer.enabled = True
+    with tracer.span("save", path="a.sbp"):
+        with tracer.span("mix", frame=0):
+            pass
+    path = tmp_path / "trace.json"
+    tracer.dump(str(path))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [e["ph"] for e in events] == ["M", "X", "X"]
+    mix, save = events[1], events[2]
+    assert (mix["name"], save["name"]) == ("mix", "save")
+    assert save["args"] == {"path": "a.sbp"}
+    assert save["ts"] <= mix["ts"] and mix["dur"] <= save["dur"]
+
+
+def test_traced_decorator_records_on_global_tracer():
+    @traced("load")
+    def load(x):
+        return x * 2
+
+    assert load(2) == 4 and trace.tracer.events() == []
+    trace.tracer.enabled = True
+    try:
+        assert load(3) == 6
+        assert [e["name"] for e in trace.tracer.events() if e["ph"] == "X"] == ["load"]
+    finally:
+        trace.tracer.enabled = False
+        trace.tracer.clear()
+
+
+def test_realtime_log_is_bounded_and_forwards_on_drain(caplog):
+    log = RealtimeLog("soundbyte.test", max_pending=2)
+    for i in range(3):
+        log.warning("xrun %d", i)
+    with caplog.at_level(logging.WARNING, logger="soundbyte.test"):
+        log.drain()
+    # The oldest entry was dropped instead of blocking the writer
+    assert [r.getMessage() for r in caplog.records] == ["xrun 1", "xrun 2"]
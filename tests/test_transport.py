@@ -0,0 +1,78 @@
+from time import perf_counter
+
+import numpy as np
+import soundfile as sf
+from soundbyte.audio.backend import BlockTime
+from soundbyte.audio.engine import AudioEngine
+from soundbyte.audio.transport import ENDED, PAUSED, PLAYING, SEEKED, STOPPED
+
+
+def make_engine(tmp_path, frames=2048):
+    sf.write(tmp_path / "a.wav", np.full((frames, 2), 0.25), 44100, subtype="FLOAT")
+    engine = AudioEngine(buffer_size=512, open_stream=False)
+    return engine, engine.add_track(str(tmp_path / "a.wav"))
+
+
+def test_position_is_corrected_by_output_latency(tmp_path):
+    engine, _ = make_engine(tmp_path)
+    engine.play()
+    out = np.empty((512, 2), np.float32)
+    # The block reaches the DAC 50 ms after the callback starts, and the
+    # limiter's look-ahead holds its first frame back a little longer
+    lookahead = engine.mixer.latency / 44100
+    assert lookahead > 0
+    before = perf_counter()
+    engine._audio_callback(out, 512, BlockTime(100.0, 100.05), None)
+    after = perf_counter()
+
+    state = engine.transport.state
+    assert state.playing and state.frame == 0 and engine.current_frame == 512
+    assert before + 0.05 + lookahead <= state.dac_time <= after + 0.05 + lookahead
+    assert state.position(state.dac_time - 0.01) == 0
+    assert state.position(state.dac_time) == 0
+    assert state.position(state.dac_time + 0.005) == 220
+    # Never ahead of what has been rendered
+    assert state.position(state.dac_time + 1.0) == 512
+
+    engine.pause()
+    assert engine.transport.state.position() == 512
+
+
+def test_session_length_follows_track_and_clip_edits(tmp_path):
+    engine, track_id = make_engine(tmp_path)
+    sf.write(tmp_path / "hit.wav", np.full((100, 2), 0.5), 44100, subtype="FLOAT")
+    assert engine.get_total_frames() == 2048
+
+    clip_id = engine.add_clip(track_id, str(tmp_path / "hit.wav"), 5000)
+    assert engine.get_total_frames() == 5100
+    engine.move_clip(track_id, clip_id, 3000)
+    assert engine.get_total_frames() == 3100
+    engine.remove_clip(track_id, clip_id)
+    assert engine.get_total_frames() == 2048
+
+    track = engine.detach_track(track_id)
+    assert engine.get_total_frames() == 0
+    engine.attach_track(track)
+    assert engine.get_total_frames() == 2048
+
+
+def test_state_changes_are_pushed_and_the_end_is_posted_once(tmp_path):
+    engine, _ = make_engine(tmp_path, frames=1000)
+    events = []
+    engine.transport.subscribe(lambda event, frame: events.append((event, frame)))
+
+    engine.play()
+    assert events == [(PLAYING, 0)]
+    out = np.empty((512, 2), np.float32)
+    for _ in range(4):
+        engine._audio_callback(out, 512, None, None)
+    # Posted by the audio thread, delivered by the consumer's dispatch
+    assert events == [(PLAYING, 0)]
+    assert engine.transport.dispatch() == 1
+    assert events[-1] == (ENDED, 1000)
+
+    engine.pause()
+    engine.seek(100)
+    assert engine.transport.state.position() == 100
+    engine.stop()
+    assert events[2:] == [(PAUSED, 2048), (SEEKED, 100), (STOPPED, 0)]